@@ -1,6 +1,49 @@
 """Django Admin 설정."""
 from django.contrib import admin
-from .models import ApiModule, Endpoint
+from .models import ApiModule, DataVersion, Endpoint
+
+
+def _dataChanged(modulePks=()):
+    """관리자 수정 반영: 바뀐 모듈만 임포트 해시 비우기 + 엔드포인트 통계 갱신, 데이터 버전 갱신.
+
+    FTS 색인은 DB 트리거(마이그레이션 0006)가 바뀐 행만 맞춘다.
+    """
+    modulePks = {pk for pk in modulePks if pk is not None}
+    if modulePks:
+        # 임포트 해시를 비워 다음 임포트가 DB 값과 직접 비교하게 함
+        ApiModule.objects.filter(pk__in=modulePks).update(contentHash="", endpointsHash="")
+        ApiModule.refreshEndpointStats(modulePks)
+    DataVersion.bump()
+
+
+class DataVersionAdminMixin:
+    """관리자 화면에서 데이터를 바꾸면 바뀐 모듈의 엔드포인트 통계 갱신 + 데이터 버전 갱신 (워커 색인 재생성).
+
+    changedModulePks(form)는 저장한 객체가 속한(속했던) 모듈 pk 목록. 인라인까지 저장된 뒤
+    (save_related) 반영한다.
+    """
+
+    def changedModulePks(self, form):
+        """저장 후 통계를 다시 계산할 모듈 pk (기본: 저장한 객체 자신 = ApiModule)."""
+        return [form.instance.pk]
+
+    def save_related(self, request, form, formsets, change):
+        super().save_related(request, form, formsets, change)
+        _dataChanged(self.changedModulePks(form))
+
+    def delete_model(self, request, obj):
+        modulePks = self.deletedModulePks(type(obj).objects.filter(pk=obj.pk))
+        super().delete_model(request, obj)
+        _dataChanged(modulePks)
+
+    def delete_queryset(self, request, queryset):
+        modulePks = self.deletedModulePks(queryset)
+        super().delete_queryset(request, queryset)
+        _dataChanged(modulePks)
+
+    def deletedModulePks(self, queryset):
+        """삭제 후 통계를 다시 계산할 모듈 pk (모듈 자체를 지우면 없음)."""
+        return ()
 
 
 class EndpointInline(admin.TabularInline):
@@ -10,20 +53,30 @@ class EndpointInline(admin.TabularInline):
 
 
 @admin.register(ApiModule)
-class ApiModuleAdmin(admin.ModelAdmin):
+class ApiModuleAdmin(DataVersionAdminMixin, admin.ModelAdmin):
     list_display = (
         "apiId", "titleKo", "title", "moduleTypeKo",
         "categoryKo", "operationsCount", "deprecatedCount",
     )
     list_filter = ("moduleType", "category")
     search_fields = ("title", "titleKo", "description", "descriptionKo")
-    readonly_fields = ("createdAt", "updatedAt")
+    readonly_fields = (
+        "endpointCount", "methodCounts", "deprecatedEndpointCount", "prefixCounts",
+        "contentHash", "endpointsHash", "createdAt", "updatedAt",
+    )
     inlines = [EndpointInline]
 
 
 @admin.register(Endpoint)
-class EndpointAdmin(admin.ModelAdmin):
+class EndpointAdmin(DataVersionAdminMixin, admin.ModelAdmin):
     list_display = ("method", "uri", "operationId", "deprecated", "apiModule")
     list_filter = ("method", "deprecated")
     search_fields = ("uri", "operationId")
     raw_id_fields = ("apiModule",)
+
+    def changedModulePks(self, form):
+        # 소속 모듈을 바꾸면 이전 모듈 통계도 갱신
+        return [form.instance.apiModule_id, form.initial.get("apiModule")]
+
+    def deletedModulePks(self, queryset):
+        return list(queryset.order_by().values_list("apiModule_id", flat=True).distinct())
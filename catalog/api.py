@@ -0,0 +1,268 @@
+"""카탈로그 JSON API (/api/v1/...).
+
+목록은 OFFSET/COUNT 대신 (정렬 키, pk) keyset 커서로 페이지를 나눈다. 커서는
+마지막 행의 정렬 키 값을 담은 불투명 문자열이다. 엔드포인트 목록은 그 값보다 뒤의
+행만 인덱스 순서로 읽고, 모듈 검색은 결과 캐시의 정렬된 pk 목록을 커서 다음부터
+잘라 페이지 행만 읽는다. fields=로 고른 컬럼만 SELECT 하고, 전체 건수는
+count=1일 때만 계산한다.
+"""
+import base64
+import json
+
+from django.db.models import IntegerField, Q
+from django.http import JsonResponse, StreamingHttpResponse
+from django.utils.cache import patch_cache_control
+
+from .caching import cachedListResult, conditionalPage
+from .export import FORMATS, iterExport
+from .models import ApiModule, Endpoint
+from .search import SORT_FIELDS, listModules, suggest
+
+DEFAULT_LIMIT = 20
+MAX_LIMIT = 200
+
+SUGGEST_LIMIT = 8
+# 자동완성 응답 브라우저 캐시 (같은 접두어 반복 입력)
+SUGGEST_MAX_AGE = 60
+
+MODULE_FIELDS = (
+    "apiId", "title", "titleKo", "description", "descriptionKo",
+    "moduleType", "moduleTypeKo", "category", "categoryKo",
+    "operationsCount", "deprecatedCount", "keywords", "operations",
+    "endpointCount", "methodCounts", "deprecatedEndpointCount",
+)
+DEFAULT_MODULE_FIELDS = (
+    "apiId", "title", "titleKo", "moduleType", "category", "operationsCount", "deprecatedCount",
+)
+ENDPOINT_FIELDS = ("method", "uri", "operationId", "deprecated")
+
+
+class ApiError(Exception):
+    """잘못된 요청 파라미터 (400 응답)."""
+
+
+def _error(message, status=400):
+    return JsonResponse({"error": message}, status=status)
+
+
+def _limit(request):
+    try:
+        limit = int(request.GET.get("limit", DEFAULT_LIMIT))
+    except ValueError:
+        raise ApiError("limit은 정수여야 합니다") from None
+    return max(1, min(limit, MAX_LIMIT))
+
+
+def _fields(request, allowed, default):
+    """fields= 파라미터 (쉼표 구분) → 필드 목록."""
+    raw = request.GET.get("fields", "")
+    if not raw.strip():
+        return list(default)
+    fields = [name.strip() for name in raw.split(",") if name.strip()]
+    unknown = [name for name in fields if name not in allowed]
+    if unknown:
+        raise ApiError(f"알 수 없는 필드: {', '.join(unknown)} (사용 가능: {', '.join(allowed)})")
+    return list(dict.fromkeys(fields))
+
+
+def _wantsCount(request):
+    return request.GET.get("count", "").lower() in ("1", "true", "yes")
+
+
+def encodeCursor(values):
+    """커서 값 목록 → 불투명 커서 문자열."""
+    raw = json.dumps(values, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decodeCursor(cursor):
+    """불투명 커서 문자열 → 커서 값 목록 (잘못된 커서는 ApiError)."""
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        values = json.loads(raw)
+    except ValueError:
+        raise ApiError("잘못된 cursor") from None
+    if not isinstance(values, list):
+        raise ApiError("잘못된 cursor")
+    return values
+
+
+def _isDbInt(value):
+    """DB 정수 컬럼과 비교할 수 있는 정수 (bool 제외, SQLite 64비트 범위)."""
+    return isinstance(value, int) and not isinstance(value, bool) and -(1 << 63) <= value < (1 << 63)
+
+
+def _cursorPosition(cursor, model, sortField, cursorPrefix):
+    """keyset 커서 → (마지막 정렬 키 값, 마지막 pk). 접두어/값 타입이 맞지 않으면 ApiError."""
+    values = decodeCursor(cursor)
+    if len(values) != len(cursorPrefix) + 2 or values[:len(cursorPrefix)] != cursorPrefix:
+        raise ApiError("cursor가 현재 정렬과 맞지 않습니다")
+    lastValue, lastPk = values[len(cursorPrefix):]
+    isInt = sortField == "pk" or isinstance(model._meta.get_field(sortField), IntegerField)
+    if not _isDbInt(lastPk) or not (_isDbInt(lastValue) if isInt else isinstance(lastValue, str)):
+        raise ApiError("잘못된 cursor")
+    return lastValue, lastPk
+
+
+def _keysetPage(queryset, sortField, reverse, fields, cursor, limit, cursorPrefix):
+    """(정렬 키, pk) keyset 페이지 → (행 목록, 다음 커서)."""
+    if cursor:
+        lastValue, lastPk = _cursorPosition(cursor, queryset.model, sortField, cursorPrefix)
+        op = "lt" if reverse else "gt"
+        if sortField == "pk":
+            queryset = queryset.filter(**{f"pk__{op}": lastPk})
+        else:
+            queryset = queryset.filter(
+                Q(**{f"{sortField}__{op}": lastValue}) | Q(**{sortField: lastValue, f"pk__{op}": lastPk})
+            )
+    prefix = "-" if reverse else ""
+    ordering = [f"{prefix}pk"] if sortField == "pk" else [f"{prefix}{sortField}", f"{prefix}pk"]
+    columns = list(dict.fromkeys([*fields, sortField, "pk"]))
+    rows = list(queryset.order_by(*ordering).values(*columns)[:limit + 1])
+    return _pageResult(rows, sortField, fields, limit, cursorPrefix)
+
+
+def _pageResult(rows, sortField, fields, limit, cursorPrefix):
+    """정렬된 행 (최대 limit + 1개) → (요청 필드만 담은 행 목록, 다음 커서)."""
+    nextCursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        last = rows[-1]
+        nextCursor = encodeCursor([*cursorPrefix, last[sortField], last["pk"]])
+    return [{name: row[name] for name in fields} for row in rows], nextCursor
+
+
+def _slicedPage(orderedPks, sortField, reverse, fields, cursor, limit, cursorPrefix):
+    """정렬된 모듈 pk 목록(결과 캐시)을 커서 다음부터 잘라 한 페이지 → (행 목록, 다음 커서).
+
+    DB는 페이지 행(limit + 1개)만 pk로 읽는다. 커서의 pk가 목록에 없으면(페이지 사이에
+    데이터 버전이 바뀜) 정렬 키를 한 번에 읽어 (정렬 키, pk)로 이분 탐색하고 커서 뒤의
+    첫 위치부터 잇는다.
+    """
+    start = 0
+    if cursor:
+        position = _cursorPosition(cursor, ApiModule, sortField, cursorPrefix)
+        try:
+            start = orderedPks.index(position[1]) + 1
+        except ValueError:
+            start = _firstAfter(orderedPks, sortField, reverse, position)
+    pagePks = orderedPks[start:start + limit + 1]
+    columns = list(dict.fromkeys([*fields, sortField, "pk"]))
+    rowsByPk = {row["pk"]: row for row in ApiModule.objects.filter(pk__in=pagePks).values(*columns)}
+    rows = [rowsByPk[pk] for pk in pagePks if pk in rowsByPk]
+    return _pageResult(rows, sortField, fields, limit, cursorPrefix)
+
+
+def _firstAfter(orderedPks, sortField, reverse, position):
+    """(정렬 키, pk) 순서 목록에서 position보다 뒤인 첫 위치 (정렬 키는 쿼리 한 번으로)."""
+    sortKeys = dict(ApiModule.objects.order_by().values_list("pk", sortField))
+    position = tuple(position)
+    lo, hi = 0, len(orderedPks)
+    while lo < hi:
+        mid = (lo + hi) // 2
+        pk = orderedPks[mid]
+        key = (sortKeys.get(pk), pk)
+        if key[0] is not None and (key < position if reverse else key > position):
+            hi = mid
+        else:
+            lo = mid + 1
+    return lo
+
+
+@conditionalPage()
+def searchApiView(request):
+    """모듈 검색 JSON.
+
+    파라미터: q, type(복수), category(복수), deprecated=exclude, sort(name/-name/ops/-ops),
+    fields, limit, cursor, count.
+    """
+    try:
+        query = request.GET.get("q", "").strip()
+        types = request.GET.getlist("type")
+        categories = request.GET.getlist("category")
+        lifecycle = [] if request.GET.get("deprecated") == "exclude" else ["deprecated"]
+        sort = request.GET.get("sort", "name")
+        if sort not in SORT_FIELDS:
+            raise ApiError(f"알 수 없는 sort: {sort} (사용 가능: {', '.join(SORT_FIELDS)})")
+        fields = _fields(request, MODULE_FIELDS, DEFAULT_MODULE_FIELDS)
+        limit = _limit(request)
+
+        # 매칭 모듈 pk는 목록 화면과 같은 공유 결과 캐시/메모리 색인에서
+        modulePks, _ = cachedListResult(
+            request,
+            (query, types, categories, lifecycle, sort),
+            lambda: listModules(query, query, types or None, categories or None, bool(lifecycle), sort),
+        )
+        sortField, reverse = SORT_FIELDS[sort]
+        results, nextCursor = _slicedPage(
+            modulePks, sortField, reverse, fields, request.GET.get("cursor"), limit, [sort],
+        )
+    except ApiError as e:
+        return _error(str(e))
+
+    data = {"results": results, "next": nextCursor}
+    if _wantsCount(request):
+        data["count"] = len(modulePks)
+    return JsonResponse(data, json_dumps_params={"ensure_ascii": False})
+
+
+@conditionalPage()
+def moduleEndpointsApiView(request, apiId):
+    """모듈의 엔드포인트 JSON.
+
+    파라미터: method, deprecated(true/false), fields, limit, cursor, count.
+    """
+    module = ApiModule.objects.filter(apiId=apiId).values("pk", "endpointCount").first()
+    if module is None:
+        return _error("API를 찾을 수 없습니다", status=404)
+    try:
+        fields = _fields(request, ENDPOINT_FIELDS, ENDPOINT_FIELDS)
+        limit = _limit(request)
+        queryset = Endpoint.objects.filter(apiModule_id=module["pk"])
+        filtered = False
+        method = request.GET.get("method", "").strip().upper()
+        if method:
+            queryset = queryset.filter(method=method)
+            filtered = True
+        deprecated = request.GET.get("deprecated", "").lower()
+        if deprecated in ("true", "1", "false", "0"):
+            queryset = queryset.filter(deprecated=deprecated in ("true", "1"))
+            filtered = True
+        results, nextCursor = _keysetPage(
+            queryset, "pk", False, fields, request.GET.get("cursor"), limit, ["endpoints", apiId],
+        )
+    except ApiError as e:
+        return _error(str(e))
+
+    data = {"results": results, "next": nextCursor}
+    if _wantsCount(request):
+        # 필터가 없으면 임포트 시 저장한 엔드포인트 수 (COUNT 쿼리 없음)
+        data["count"] = queryset.count() if filtered else module["endpointCount"]
+    return JsonResponse(data, json_dumps_params={"ensure_ascii": False})
+
+
+def suggestView(request):
+    """검색창 자동완성 JSON (/suggest?q=) - 워커 메모리 접두어 trie."""
+    query = request.GET.get("q", "")
+    try:
+        limit = max(1, min(int(request.GET.get("limit", SUGGEST_LIMIT)), SUGGEST_LIMIT))
+    except ValueError:
+        limit = SUGGEST_LIMIT
+    suggestions = [
+        {"text": item.text, "kind": item.kind} for item in suggest(query, limit)
+    ] if query.strip() else []
+    response = JsonResponse({"q": query, "suggestions": suggestions}, json_dumps_params={"ensure_ascii": False})
+    patch_cache_control(response, private=True, max_age=SUGGEST_MAX_AGE)
+    return response
+
+
+@conditionalPage()
+def exportView(request):
+    """카탈로그 전체 내보내기 스트리밍 (format=ndjson/csv/openapi)."""
+    fmt = request.GET.get("format", "ndjson")
+    if fmt not in FORMATS:
+        return _error(f"지원하지 않는 형식: {fmt} (사용 가능: {', '.join(FORMATS)})")
+    contentType, extension = FORMATS[fmt]
+    response = StreamingHttpResponse(iterExport(fmt), content_type=contentType)
+    response["Content-Disposition"] = f'attachment; filename="ohip-catalog.{extension}"'
+    return response
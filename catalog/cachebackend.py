@@ -0,0 +1,152 @@
+"""SQLite 파일 기반 LRU 캐시 백엔드 (워커 프로세스끼리 공유).
+
+Django FileBasedCache는 항목 수 상한을 넘으면 무작위로 일부(1/CULL_FREQUENCY)를 지우고
+touch()는 만료 시각만 늘린다. 여기서는 항목마다 마지막 조회 시각(accessed)을 두고 조회할
+때마다 갱신하며, 상한을 넘으면 가장 오래 조회되지 않은 항목부터 지운다.
+
+CACHES 설정:
+    "BACKEND": "catalog.cachebackend.SqliteLruCache",
+    "LOCATION": SQLite 파일 경로 (디렉터리는 없으면 만듦),
+    "OPTIONS": {
+        "MAX_ENTRIES": 항목 수 상한 (기본 300),
+        "MAX_BYTES": 저장 값 크기 합 상한 (기본 0 = 제한 없음),
+    }
+"""
+import os
+import pickle
+import sqlite3
+import threading
+import time
+
+from django.core.cache.backends.base import DEFAULT_TIMEOUT, BaseCache
+
+_SCHEMA = (
+    "CREATE TABLE IF NOT EXISTS cache_entry ("
+    "key TEXT PRIMARY KEY, value BLOB NOT NULL, size INTEGER NOT NULL, "
+    "expires REAL, accessed INTEGER NOT NULL)",
+    "CREATE INDEX IF NOT EXISTS cache_entry_accessed ON cache_entry (accessed)",
+)
+
+
+class SqliteLruCache(BaseCache):
+    """크기 제한 LRU 캐시 (SQLite WAL, 스레드/프로세스별 연결)."""
+
+    def __init__(self, location, params):
+        super().__init__(params)
+        self._path = location
+        self._maxBytes = int(params.get("OPTIONS", {}).get("MAX_BYTES", 0))
+        self._local = threading.local()
+
+    def _connection(self):
+        """현재 스레드의 연결 (fork 후 자식 프로세스는 새로 연결)."""
+        local = self._local
+        if getattr(local, "pid", None) != os.getpid():
+            directory = os.path.dirname(self._path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            conn = sqlite3.connect(self._path, timeout=10, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            for statement in _SCHEMA:
+                conn.execute(statement)
+            local.conn = conn
+            local.pid = os.getpid()
+        return local.conn
+
+    def get(self, key, default=None, version=None):
+        key = self.make_and_validate_key(key, version=version)
+        conn = self._connection()
+        row = conn.execute("SELECT value, expires FROM cache_entry WHERE key = ?", (key,)).fetchone()
+        if row is None:
+            return default
+        value, expires = row
+        if expires is not None and expires <= time.time():
+            conn.execute("DELETE FROM cache_entry WHERE key = ?", (key,))
+            return default
+        conn.execute("UPDATE cache_entry SET accessed = ? WHERE key = ?", (time.time_ns(), key))
+        return pickle.loads(value)
+
+    def set(self, key, value, timeout=DEFAULT_TIMEOUT, version=None):
+        key = self.make_and_validate_key(key, version=version)
+        self._store(key, value, timeout, replace=True)
+
+    def add(self, key, value, timeout=DEFAULT_TIMEOUT, version=None):
+        key = self.make_and_validate_key(key, version=version)
+        return self._store(key, value, timeout, replace=False)
+
+    def _store(self, key, value, timeout, replace):
+        expires = self.get_backend_timeout(timeout)
+        now = time.time()
+        conn = self._connection()
+        if expires is not None and expires <= now:
+            conn.execute("DELETE FROM cache_entry WHERE key = ?", (key,))
+            return False
+        blob = pickle.dumps(value, pickle.HIGHEST_PROTOCOL)
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            if not replace:
+                row = conn.execute("SELECT expires FROM cache_entry WHERE key = ?", (key,)).fetchone()
+                if row is not None and (row[0] is None or row[0] > now):
+                    conn.execute("COMMIT")
+                    return False
+            conn.execute(
+                "INSERT OR REPLACE INTO cache_entry (key, value, size, expires, accessed) VALUES (?, ?, ?, ?, ?)",
+                (key, blob, len(blob), expires, time.time_ns()),
+            )
+            self._evict(conn, now)
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        return True
+
+    def _evict(self, conn, now):
+        """만료 항목, 그다음 상한(MAX_ENTRIES/MAX_BYTES)을 넘는 만큼 가장 오래 조회되지 않은 항목 삭제."""
+        conn.execute("DELETE FROM cache_entry WHERE expires IS NOT NULL AND expires <= ?", (now,))
+        count, total = conn.execute("SELECT COUNT(*), COALESCE(SUM(size), 0) FROM cache_entry").fetchone()
+        excess = max(0, count - self._max_entries)
+        if self._maxBytes and total > self._maxBytes:
+            # 크기 합이 상한 이하가 될 때까지 오래된 항목부터
+            freed = 0
+            for rank, (size,) in enumerate(
+                conn.execute("SELECT size FROM cache_entry ORDER BY accessed"), start=1,
+            ):
+                freed += size
+                if total - freed <= self._maxBytes:
+                    excess = max(excess, rank)
+                    break
+        if excess:
+            conn.execute(
+                "DELETE FROM cache_entry WHERE key IN "
+                "(SELECT key FROM cache_entry ORDER BY accessed LIMIT ?)",
+                (excess,),
+            )
+
+    def touch(self, key, timeout=DEFAULT_TIMEOUT, version=None):
+        key = self.make_and_validate_key(key, version=version)
+        cursor = self._connection().execute(
+            "UPDATE cache_entry SET expires = ?, accessed = ? "
+            "WHERE key = ? AND (expires IS NULL OR expires > ?)",
+            (self.get_backend_timeout(timeout), time.time_ns(), key, time.time()),
+        )
+        return cursor.rowcount > 0
+
+    def delete(self, key, version=None):
+        key = self.make_and_validate_key(key, version=version)
+        cursor = self._connection().execute("DELETE FROM cache_entry WHERE key = ?", (key,))
+        return cursor.rowcount > 0
+
+    def has_key(self, key, version=None):
+        key = self.make_and_validate_key(key, version=version)
+        row = self._connection().execute(
+            "SELECT 1 FROM cache_entry WHERE key = ? AND (expires IS NULL OR expires > ?)",
+            (key, time.time()),
+        ).fetchone()
+        return row is not None
+
+    def clear(self):
+        self._connection().execute("DELETE FROM cache_entry")
+
+    def close(self, **kwargs):
+        # 요청마다 닫지 않음 (스레드별 연결 재사용)
+        pass
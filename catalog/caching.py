@@ -0,0 +1,112 @@
+"""카탈로그 페이지 캐시.
+
+- HTTP 조건부 요청: 카탈로그는 import_opera_apis/관리자 수정 때만 바뀌므로 데이터
+  버전(DataVersion), 정규화한 쿼리 파라미터, 로그인 사용자로 ETag를 만든다.
+  If-None-Match/If-Modified-Since가 맞으면 버전 표식 한 행만 읽고 뷰(검색/템플릿)를
+  거치지 않은 채 304로 응답한다.
+- 목록 결과 캐시: 정렬된 모듈 pk 목록 + facet 건수를 워커끼리 공유하는 캐시
+  (CACHES["search"], SQLite 파일 LRU - cachebackend)에 DB 이름과 데이터 버전을 포함한 키로
+  저장한다 (같은 캐시 파일을 다른 DB의 배포가 써도 섞이지 않음).
+"""
+import hashlib
+from functools import wraps
+
+from django.core.cache import caches
+from django.db import connection
+from django.utils.cache import patch_cache_control, patch_vary_headers
+from django.views.decorators.http import condition
+
+from .models import DataVersion
+
+SEARCH_CACHE = "search"
+
+
+def dataStamp(request):
+    """(버전 토큰, 갱신 시각) - 요청당 한 번만 조회."""
+    stamp = getattr(request, "_catalogDataStamp", None)
+    if stamp is None:
+        stamp = request._catalogDataStamp = DataVersion.stamp()
+    return stamp
+
+
+def normalizedParams(request):
+    """쿼리 파라미터를 키/값 순서와 무관한 문자열로 (빈 값 제외)."""
+    items = sorted(
+        (key, value.strip())
+        for key, values in request.GET.lists()
+        for value in values
+        if value.strip()
+    )
+    return "&".join(f"{key}={value}" for key, value in items)
+
+
+def authKey(request):
+    """응답 내용에 영향을 주는 인증 상태 (비로그인/사용자)."""
+    user = request.user
+    if not user.is_authenticated:
+        return "anon"
+    return f"user:{user.pk}:{user.get_username()}"
+
+
+def conditionalPage(varyHeaders=()):
+    """데이터 버전 기반 ETag/Last-Modified/304 + Cache-Control 데코레이터.
+
+    varyHeaders: 응답 내용에 쓰이는 요청 헤더 (ETag에 포함하고 Vary에 추가).
+    """
+    metaKeys = ["HTTP_" + header.upper().replace("-", "_") for header in varyHeaders]
+
+    def pageEtag(request, *args, **kwargs):
+        parts = [dataStamp(request)[0], request.path, normalizedParams(request), authKey(request)]
+        parts.extend(request.META.get(key, "") for key in metaKeys)
+        return hashlib.sha1("\n".join(parts).encode("utf-8")).hexdigest()
+
+    def pageLastModified(request, *args, **kwargs):
+        return dataStamp(request)[1]
+
+    def decorator(view):
+        conditionalView = condition(etag_func=pageEtag, last_modified_func=pageLastModified)(view)
+
+        @wraps(view)
+        def wrapper(request, *args, **kwargs):
+            response = conditionalView(request, *args, **kwargs)
+            if response.status_code not in (200, 304):
+                return response
+            # 매번 재검증 (304는 저렴). 로그인 사용자 페이지는 공유 캐시에 저장하지 않음
+            if request.user.is_authenticated:
+                patch_cache_control(response, private=True, no_cache=True)
+            else:
+                patch_cache_control(response, public=True, max_age=0, must_revalidate=True)
+            patch_vary_headers(response, ("Cookie", *varyHeaders))
+            return response
+
+        return wrapper
+
+    return decorator
+
+
+def listCacheKey(version, query, types, categories, lifecycle, sort):
+    """목록 결과 캐시 키 (DB 이름 + 데이터 버전 + 정규화한 검색 조건, 다중 값은 순서 무관)."""
+    parts = [str(connection.settings_dict["NAME"]), version, query]
+    parts.extend(",".join(sorted(set(values))) for values in (types, categories, lifecycle))
+    parts.append(sort)
+    return "catalog:list:" + hashlib.sha1("\n".join(parts).encode("utf-8")).hexdigest()
+
+
+def cachedListResult(request, params, compute):
+    """(정렬된 모듈 pk, FacetCounts) - 캐시에 있으면 그대로, 없으면 compute() 후 저장.
+
+    params: (q, type 목록, category 목록, lifecycle 목록, sort). 조회된 항목은 만료를
+    연장하고, 백엔드가 상한(MAX_ENTRIES/MAX_BYTES)을 넘으면 가장 오래 조회되지 않은
+    항목부터 지우므로 자주 쓰는 결과가 남는다. 결과가 이전 데이터 버전으로 계산됐으면 저장하지 않는다.
+    """
+    cache = caches[SEARCH_CACHE]
+    version = dataStamp(request)[0]
+    key = listCacheKey(version, *params)
+    result = cache.get(key)
+    if result is not None:
+        cache.touch(key)
+        return result
+    result = compute()
+    if result[1].version == version:
+        cache.set(key, result)
+    return result
@@ -0,0 +1,133 @@
+"""카탈로그 전체 내보내기 (NDJSON / CSV / OpenAPI-lite).
+
+모든 형식이 문자열 조각을 내보내는 제너레이터라 StreamingHttpResponse와 관리 커맨드가
+같은 코드를 쓴다. DB는 .iterator(chunk_size)로 나눠 읽고, 메모리에는 현재 모듈(NDJSON)
+또는 현재 경로(OpenAPI)의 엔드포인트만 둔다.
+"""
+import csv
+import json
+
+from .models import ApiModule, Endpoint
+
+# DB에서 한 번에 가져오는 행 수
+EXPORT_CHUNK_SIZE = 2000
+
+MODULE_FIELDS = (
+    "pk", "apiId", "title", "titleKo", "description", "descriptionKo",
+    "moduleType", "moduleTypeKo", "category", "categoryKo",
+    "operationsCount", "deprecatedCount", "keywords", "operations",
+)
+CSV_COLUMNS = (
+    "apiId", "title", "titleKo", "category", "moduleType",
+    "method", "uri", "operationId", "deprecated",
+)
+
+# 형식 → (Content-Type, 파일 확장자)
+FORMATS = {
+    "ndjson": ("application/x-ndjson; charset=utf-8", "ndjson"),
+    "csv": ("text/csv; charset=utf-8", "csv"),
+    "openapi": ("application/json; charset=utf-8", "json"),
+}
+
+
+def _dumps(value):
+    return json.dumps(value, ensure_ascii=False, separators=(",", ":"))
+
+
+def _modules():
+    return ApiModule.objects.order_by("pk").values(*MODULE_FIELDS).iterator(chunk_size=EXPORT_CHUNK_SIZE)
+
+
+def _endpoints(*ordering, fields=("apiModule_id", "method", "uri", "operationId", "deprecated")):
+    return (
+        Endpoint.objects
+        .order_by(*ordering)
+        .values_list(*fields)
+        .iterator(chunk_size=EXPORT_CHUNK_SIZE)
+    )
+
+
+def iterNdjson():
+    """모듈 한 줄씩 (엔드포인트 포함). 두 커서를 모듈 pk 순서로 맞춰 읽는다."""
+    endpoints = _endpoints("apiModule_id", "pk")
+    pending = next(endpoints, None)
+    for module in _modules():
+        pk = module.pop("pk")
+        moduleEndpoints = []
+        while pending is not None and pending[0] <= pk:
+            if pending[0] == pk:
+                _, method, uri, operationId, deprecated = pending
+                moduleEndpoints.append(
+                    {"method": method, "uri": uri, "operationId": operationId, "deprecated": deprecated}
+                )
+            pending = next(endpoints, None)
+        module["endpoints"] = moduleEndpoints
+        yield _dumps(module) + "\n"
+
+
+class _Echo:
+    """csv.writer가 쓴 줄을 그대로 돌려주는 버퍼."""
+
+    def write(self, value):
+        return value
+
+
+def iterCsv():
+    """엔드포인트 한 행씩 (소속 모듈 정보 포함)."""
+    writer = csv.writer(_Echo())
+    yield writer.writerow(CSV_COLUMNS)
+    rows = _endpoints(
+        "apiModule_id", "pk",
+        fields=(
+            "apiModule__apiId", "apiModule__title", "apiModule__titleKo", "apiModule__category",
+            "apiModule__moduleType", "method", "uri", "operationId", "deprecated",
+        ),
+    )
+    for row in rows:
+        yield writer.writerow(row)
+
+
+def iterOpenApi(title="OHIP API Catalog", version="1"):
+    """OpenAPI 3 paths 문서 (경로별 메서드 → operationId, 소속 API 태그).
+
+    경로 순으로 읽어 한 경로씩 내보낸다. 같은 경로+메서드가 여러 모듈에 있으면 첫 번째만 쓴다.
+    """
+    yield '{"openapi":"3.0.3","info":' + _dumps({"title": title, "version": version}) + ',"paths":{'
+    rows = _endpoints(
+        "uri", "method", "pk",
+        fields=("uri", "method", "operationId", "deprecated", "apiModule__title"),
+    )
+    currentUri = None
+    operations = {}
+    first = True
+    for uri, method, operationId, deprecated, moduleTitle in rows:
+        if uri != currentUri:
+            if currentUri is not None:
+                yield ("" if first else ",") + _dumps(currentUri) + ":" + _dumps(operations)
+                first = False
+            currentUri = uri
+            operations = {}
+        operations.setdefault(method.lower(), {
+            "operationId": operationId,
+            "tags": [moduleTitle],
+            "deprecated": deprecated,
+            "responses": {"default": {"description": "OK"}},
+        })
+    if currentUri is not None:
+        yield ("" if first else ",") + _dumps(currentUri) + ":" + _dumps(operations)
+    yield "}}\n"
+
+
+_WRITERS = {
+    "ndjson": iterNdjson,
+    "csv": iterCsv,
+    "openapi": iterOpenApi,
+}
+
+
+def iterExport(fmt):
+    """형식별 내보내기 문자열 조각 제너레이터 (알 수 없는 형식은 ValueError)."""
+    writer = _WRITERS.get(fmt)
+    if writer is None:
+        raise ValueError(f"지원하지 않는 형식: {fmt} (사용 가능: {', '.join(_WRITERS)})")
+    return writer()
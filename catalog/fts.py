@@ -0,0 +1,136 @@
+"""SQLite FTS5 전문 검색 색인 (모듈/엔드포인트).
+
+trigram 토크나이저라 한글/영문 모두 3글자 이상 부분 문자열로 검색된다.
+가상 테이블은 마이그레이션(0003)이 만들고, 내용은 0006의 트리거가 모듈/엔드포인트 행이
+바뀔 때마다 해당 행만 맞춘다. rebuildSearchIndex()는 전체를 다시 채우는 복구용이다.
+FTS5(trigram)를 쓸 수 없는 DB에서는
+ftsAvailable()이 False이고 뷰는 기존 LIKE 검색을 쓴다.
+"""
+from itertools import islice
+
+from django.db import connection
+
+MODULE_TABLE = "catalog_apimodule_fts"
+ENDPOINT_TABLE = "catalog_endpoint_fts"
+
+# trigram 토크나이저로 매칭 가능한 최소 검색어 길이
+MIN_QUERY_LENGTH = 3
+
+# bm25() 컬럼 가중치: title, titleKo, keywords, operations, description, descriptionKo
+MODULE_WEIGHTS = (3.0, 3.0, 2.0, 1.5, 1.0, 1.0)
+
+# 색인 재생성 시 원본 테이블에서 한 번에 읽는 행 수
+REBUILD_CHUNK_SIZE = 2000
+
+_available = None
+
+
+def ftsAvailable():
+    """FTS 가상 테이블 사용 가능 여부 (프로세스당 한 번 확인)."""
+    global _available
+    if _available is None:
+        if connection.vendor != "sqlite":
+            _available = False
+        else:
+            with connection.cursor() as cursor:
+                cursor.execute(
+                    "SELECT COUNT(*) FROM sqlite_master WHERE type = 'table' AND name IN (%s, %s)",
+                    [MODULE_TABLE, ENDPOINT_TABLE],
+                )
+                _available = cursor.fetchone()[0] == 2
+    return _available
+
+
+def _joinList(values):
+    return " ".join(str(v) for v in values or [])
+
+
+def rebuildSearchIndex():
+    """FTS 색인을 현재 ApiModule/Endpoint 데이터로 다시 채움 (복구용, 호출 측 트랜잭션 안에서).
+
+    원본 행은 나눠 읽으며 바로 넣으므로 전체 행 목록을 메모리에 만들지 않는다.
+    """
+    from .models import ApiModule, Endpoint
+
+    if not ftsAvailable():
+        return
+    modules = ApiModule.objects.order_by().values_list(
+        "pk", "title", "titleKo", "keywords", "operations", "description", "descriptionKo",
+    )
+    endpoints = Endpoint.objects.order_by().values_list("pk", "uri", "operationId", "apiModule_id")
+    moduleRows = (
+        (pk, title, titleKo, _joinList(keywords), _joinList(operations), desc, descKo)
+        for pk, title, titleKo, keywords, operations, desc, descKo in modules.iterator(REBUILD_CHUNK_SIZE)
+    )
+    with connection.cursor() as cursor:
+        cursor.execute(f"DELETE FROM {MODULE_TABLE}")
+        cursor.execute(f"DELETE FROM {ENDPOINT_TABLE}")
+        _insertChunks(
+            cursor,
+            f"INSERT INTO {MODULE_TABLE} "
+            "(rowid, title, titleKo, keywords, operations, description, descriptionKo) "
+            "VALUES (%s, %s, %s, %s, %s, %s, %s)",
+            moduleRows,
+        )
+        _insertChunks(
+            cursor,
+            f"INSERT INTO {ENDPOINT_TABLE} (rowid, uri, operationId, moduleId) VALUES (%s, %s, %s, %s)",
+            endpoints.iterator(REBUILD_CHUNK_SIZE),
+        )
+
+
+def _insertChunks(cursor, sql, rows):
+    """REBUILD_CHUNK_SIZE 행씩 executemany (Django SQLite 래퍼는 제너레이터 전체를 버퍼링함)."""
+    chunk = list(islice(rows, REBUILD_CHUNK_SIZE))
+    while chunk:
+        cursor.executemany(sql, chunk)
+        chunk = list(islice(rows, REBUILD_CHUNK_SIZE))
+
+
+def canSearch(query):
+    """FTS로 처리할 수 있는 검색어인지 여부 (테이블 존재 + trigram 최소 길이)."""
+    return len(query) >= MIN_QUERY_LENGTH and ftsAvailable()
+
+
+def _phrase(query):
+    """검색어 전체를 하나의 FTS5 구문으로 (기존 LIKE '%q%'와 같은 부분 문자열 의미)."""
+    return '"' + query.replace('"', '""') + '"'
+
+
+def searchModules(query):
+    """검색어를 포함하는 ApiModule pk 목록 (bm25 점수순).
+
+    모듈 필드에서 매칭된 모듈을 먼저, 엔드포인트 uri/operationId로만 매칭된 모듈을
+    가장 잘 맞는 엔드포인트 점수순으로 뒤에 둔다.
+    """
+    weights = ", ".join(str(w) for w in MODULE_WEIGHTS)
+    phrase = _phrase(query)
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f"SELECT rowid FROM {MODULE_TABLE} WHERE {MODULE_TABLE} MATCH %s "
+            f"ORDER BY bm25({MODULE_TABLE}, {weights})",
+            [phrase],
+        )
+        pks = [row[0] for row in cursor.fetchall()]
+        cursor.execute(
+            f"SELECT moduleId FROM {ENDPOINT_TABLE} WHERE {ENDPOINT_TABLE} MATCH %s "
+            f"ORDER BY bm25({ENDPOINT_TABLE})",
+            [phrase],
+        )
+        seen = set(pks)
+        for (moduleId,) in cursor.fetchall():
+            if moduleId not in seen:
+                seen.add(moduleId)
+                pks.append(moduleId)
+    return pks
+
+
+def searchEndpoints(query):
+    """검색어를 uri/operationId에 포함하는 Endpoint pk 목록 (bm25 점수순, 동점은 pk순)."""
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f"SELECT rowid FROM {ENDPOINT_TABLE} WHERE {ENDPOINT_TABLE} MATCH %s "
+            f"ORDER BY bm25({ENDPOINT_TABLE}), rowid",
+            [_phrase(query)],
+        )
+        return [row[0] for row in cursor.fetchall()]
@@ -0,0 +1,356 @@
+"""임포트 입력 처리: JSON 배열 스트리밍 읽기 + 모듈 항목 검증/정규화.
+
+파일 전체를 json.load 하지 않고 최상위 배열의 항목을 하나씩 꺼낸다. 검증/정규화는 DB를
+쓰지 않는 순수 함수라 프로세스 풀에서 돌릴 수 있고, DB 쓰기는 호출 측(import_opera_apis)이
+배치 단위로 한다. 메모리에는 읽기 버퍼와 처리 중인 배치만 둔다.
+
+이 모듈은 Django를 import하지 않는다 (spawn/forkserver 방식 워커도 설정 없이 import 가능).
+catalog.models가 여기의 해시 함수와 메서드 목록을 가져다 쓴다.
+"""
+import codecs
+import hashlib
+import json
+import re
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+from typing import NamedTuple
+
+# 파일에서 한 번에 읽는 바이트 수
+READ_SIZE = 1 << 16
+# 배열 항목 하나의 최대 크기 (디코드한 문자 수, 넘으면 잘못된 입력으로 보고 중단)
+MAX_RECORD_SIZE = 64 << 20
+
+# 엔드포인트 HTTP 메서드 (Endpoint.METHOD_CHOICES 순서)
+HTTP_METHODS = ("GET", "POST", "PUT", "DELETE", "HEAD", "PATCH")
+
+_METHODS = frozenset(HTTP_METHODS)
+_WHITESPACE = " \t\r\n"
+# 항목 텍스트 훑기: 문자열 밖의 구조 문자 / 문자열 안의 끝 또는 이스케이프 / 단일 값의 끝
+_STRUCTURE = re.compile(r'[\[\]{}"]')
+_STRING_STOP = re.compile(r'["\\]')
+_SCALAR_STOP = _WHITESPACE + ",]"
+_SCALAR_END = re.compile(r"[\s,\]]")
+_OPENER = {"]": "[", "}": "{"}
+
+# 문자열 필드 → (JSON 키, 최대 길이, 필수 여부)
+_TEXT_FIELDS = {
+    "title": ("title", 200, True),
+    "titleKo": ("titleKo", 200, False),
+    "description": ("description", None, False),
+    "descriptionKo": ("descriptionKo", None, False),
+    "moduleType": ("type", 20, False),
+    "moduleTypeKo": ("typeKo", 20, False),
+    "category": ("category", 50, False),
+    "categoryKo": ("categoryKo", 50, False),
+}
+
+
+class ModuleRecord(NamedTuple):
+    """검증/정규화된 모듈 항목 (DB에 쓸 값 + 변경 감지 해시)."""
+
+    apiId: int
+    fields: dict
+    rows: list
+    hashes: dict
+
+
+class InvalidRecord(ValueError):
+    """모듈 항목 형식 오류."""
+
+
+def contentHashOf(fields):
+    """모듈 필드 값 dict → 내용 해시."""
+    raw = json.dumps(fields, ensure_ascii=False, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha1(raw.encode("utf-8")).hexdigest()
+
+
+def endpointsHashOf(endpoints):
+    """(method, uri, operationId, deprecated) 목록 → 엔드포인트 집합 해시 (순서 무관)."""
+    raw = json.dumps(sorted(list(ep) for ep in endpoints), ensure_ascii=False, separators=(",", ":"))
+    return hashlib.sha1(raw.encode("utf-8")).hexdigest()
+
+
+def iterJsonArray(f, readSize=READ_SIZE, maxRecordSize=MAX_RECORD_SIZE):
+    """바이너리 파일의 최상위 JSON 배열 → 항목을 하나씩 (bytesRead, item)으로.
+
+    읽어 둔 버퍼 안에 끝나는 항목은 바로 디코드하고, 조각 경계에 걸친 항목은 괄호 깊이/문자열
+    상태를 이어 가며 끝을 찾은 뒤 모은 텍스트를 한 번만 디코드한다. 괄호 짝 오류는 읽는 즉시,
+    항목이 maxRecordSize자를 넘으면 그 자리에서 ValueError.
+    bytesRead는 진행률 표시용 (지금까지 파일에서 읽은 바이트 수).
+    """
+    decoder = json.JSONDecoder()
+    reader = codecs.getincrementaldecoder("utf-8-sig")()
+    buffer = ""
+    pos = 0
+    bytesRead = 0
+    eof = False
+
+    def fill():
+        nonlocal buffer, pos, bytesRead, eof
+        chunk = f.read(readSize)
+        bytesRead += len(chunk)
+        eof = not chunk
+        buffer = buffer[pos:] + reader.decode(chunk, final=eof)
+        pos = 0
+
+    def skipSpace():
+        nonlocal pos
+        while True:
+            while pos < len(buffer) and buffer[pos] in _WHITESPACE:
+                pos += 1
+            if pos < len(buffer) or eof:
+                return
+            fill()
+
+    def readSpanning():
+        """버퍼 끝에 걸린 항목: 다음 조각을 읽어 가며 끝을 찾아 한 번 디코드."""
+        nonlocal buffer, pos
+        scanner = _RecordScanner()
+        parts = []
+        size = 0
+        while True:
+            end = scanner.scan(buffer, pos, eof)
+            if end is not None:
+                break
+            parts.append(buffer[pos:])
+            size += len(buffer) - pos
+            if size > maxRecordSize:
+                raise ValueError(f"JSON 항목이 {maxRecordSize}자를 넘습니다")
+            if eof:
+                raise ValueError("JSON 배열이 닫히지 않았습니다")
+            pos = len(buffer)
+            fill()
+        if size + end - pos > maxRecordSize:
+            raise ValueError(f"JSON 항목이 {maxRecordSize}자를 넘습니다")
+        parts.append(buffer[pos:end])
+        pos = end
+        return json.loads("".join(parts))
+
+    skipSpace()
+    if buffer[pos:pos + 1] != "[":
+        raise ValueError("최상위 JSON 배열이 아닙니다")
+    pos += 1
+    skipSpace()
+    if buffer[pos:pos + 1] == "]":
+        return
+    while True:
+        try:
+            item, end = decoder.raw_decode(buffer, pos)
+        except json.JSONDecodeError:
+            # 잘린 항목(또는 형식 오류): 끝을 찾아 디코드 (오류면 거기서 보고)
+            item = readSpanning()
+        else:
+            if eof or buffer[pos] in "[{\"" or (end < len(buffer) and buffer[end] in _SCALAR_STOP):
+                pos = end
+            else:
+                # 숫자/true 같은 단일 값이 버퍼 끝에서 잘렸을 수 있음
+                item = readSpanning()
+        yield bytesRead, item
+        skipSpace()
+        sep = buffer[pos:pos + 1]
+        pos += 1
+        if sep == "]":
+            return
+        if not sep:
+            raise ValueError("JSON 배열이 닫히지 않았습니다")
+        if sep != ",":
+            raise ValueError(f"JSON 배열 구분자 오류: {sep!r}")
+        skipSpace()
+
+
+class _RecordScanner:
+    """조각으로 나뉘어 들어오는 JSON 값 하나의 끝 찾기 (괄호 깊이/문자열 상태 유지)."""
+
+    def __init__(self):
+        self.stack = []
+        self.inString = False
+        self.escape = False
+        self.started = False
+        self.scalar = False
+
+    def scan(self, text, pos, eof):
+        """text[pos:]를 훑어 값이 끝나면 끝 위치, 아직이면 None (괄호 짝 오류는 ValueError)."""
+        length = len(text)
+        if not self.started and pos < length:
+            self.started = True
+            char = text[pos]
+            if char in "[{":
+                self.stack.append(char)
+                pos += 1
+            elif char == '"':
+                self.inString = True
+                pos += 1
+            else:
+                self.scalar = True
+        if self.scalar:
+            match = _SCALAR_END.search(text, pos)
+            if match is not None:
+                return match.start()
+            return length if eof else None
+        while pos < length:
+            if self.escape:
+                self.escape = False
+                pos += 1
+                continue
+            if self.inString:
+                match = _STRING_STOP.search(text, pos)
+                if match is None:
+                    return None
+                pos = match.end()
+                if match.group() == "\\":
+                    self.escape = True
+                    continue
+                self.inString = False
+            else:
+                match = _STRUCTURE.search(text, pos)
+                if match is None:
+                    return None
+                pos = match.end()
+                char = match.group()
+                if char == '"':
+                    self.inString = True
+                    continue
+                if char in "[{":
+                    self.stack.append(char)
+                    continue
+                if self.stack.pop() != _OPENER[char]:
+                    raise ValueError(f"JSON 괄호 짝이 맞지 않습니다: {char!r}")
+            if not self.stack:
+                return pos
+        return None
+
+
+def _text(item, key, maxLength, required):
+    value = item.get(key, "")
+    if value is None:
+        value = ""
+    if not isinstance(value, str):
+        raise InvalidRecord(f"{key}: 문자열이 아닙니다")
+    value = value.strip()
+    if required and not value:
+        raise InvalidRecord(f"{key}: 비어 있습니다")
+    if maxLength is not None and len(value) > maxLength:
+        raise InvalidRecord(f"{key}: {maxLength}자 초과")
+    return value
+
+
+def _count(item, key):
+    value = item.get(key, 0)
+    if isinstance(value, bool) or not isinstance(value, int) or value < 0:
+        raise InvalidRecord(f"{key}: 0 이상의 정수가 아닙니다")
+    return value
+
+
+def _strings(item, key):
+    value = item.get(key) or []
+    if not isinstance(value, list) or not all(isinstance(v, str) for v in value):
+        raise InvalidRecord(f"{key}: 문자열 목록이 아닙니다")
+    return value
+
+
+def _endpoint(ep):
+    if not isinstance(ep, dict):
+        raise InvalidRecord("endpoints: 객체가 아닌 항목")
+    method = _text(ep, "method", 10, True).upper()
+    if method not in _METHODS:
+        raise InvalidRecord(f"endpoints: 알 수 없는 메서드 {method}")
+    uri = _text(ep, "uri", 500, True)
+    if not uri.startswith("/"):
+        raise InvalidRecord(f"endpoints: uri가 /로 시작하지 않습니다 ({uri})")
+    return method, uri, _text(ep, "operationId", 200, False), bool(ep.get("deprecated", False))
+
+
+def _strictValues(item):
+    fields = {name: _text(item, *spec) for name, spec in _TEXT_FIELDS.items()}
+    fields["operationsCount"] = _count(item, "operationsCount")
+    fields["deprecatedCount"] = _count(item, "deprecatedCount")
+    fields["keywords"] = _strings(item, "keywords")
+    fields["operations"] = _strings(item, "operations")
+    endpoints = item.get("endpoints") or []
+    if not isinstance(endpoints, list):
+        raise InvalidRecord("endpoints: 목록이 아닙니다")
+    return fields, [_endpoint(ep) for ep in endpoints]
+
+
+def _plainValues(item):
+    # 기존 임포트와 같은 규칙: 없는 키만 기본값, 값은 그대로
+    fields = {name: item.get(key, "") for name, (key, _, _) in _TEXT_FIELDS.items()}
+    fields["operationsCount"] = item.get("operationsCount", 0)
+    fields["deprecatedCount"] = item.get("deprecatedCount", 0)
+    fields["keywords"] = item.get("keywords", [])
+    fields["operations"] = item.get("operations", [])
+    endpoints = item.get("endpoints", [])
+    if not isinstance(endpoints, list) or not all(isinstance(ep, dict) for ep in endpoints):
+        raise InvalidRecord("endpoints: 객체 목록이 아닙니다")
+    rows = [
+        (ep.get("method", ""), ep.get("uri", ""), ep.get("operationId", ""), ep.get("deprecated", False))
+        for ep in endpoints
+    ]
+    return fields, rows
+
+
+def normalizeRecord(item, strict=False):
+    """JSON 항목 → ModuleRecord (형식 오류는 InvalidRecord).
+
+    기본은 기존 임포트와 같은 규칙으로 값을 그대로 받고, 적재할 수 없는 항목(객체가 아님, id가
+    정수가 아님, 엔드포인트가 객체 목록이 아님)만 거른다. strict면 문자열 앞뒤 공백을 정리하고
+    필수 값/길이/개수/메서드/uri 형식까지 검사한다.
+    """
+    if not isinstance(item, dict):
+        raise InvalidRecord("객체가 아닌 항목")
+    apiId = item.get("id")
+    if isinstance(apiId, bool) or not isinstance(apiId, int):
+        raise InvalidRecord("id: 정수가 아닙니다")
+    try:
+        fields, rows = _strictValues(item) if strict else _plainValues(item)
+    except InvalidRecord as e:
+        raise InvalidRecord(f"[{apiId}] {e}") from None
+    hashes = {
+        "contentHash": contentHashOf(fields),
+        "endpointsHash": endpointsHashOf(rows),
+    }
+    return ModuleRecord(apiId, fields, rows, hashes)
+
+
+def _checkRecord(item, strict=False):
+    """프로세스 풀 작업 단위: (ModuleRecord, None) 또는 (None, 오류 메시지)."""
+    try:
+        return normalizeRecord(item, strict), None
+    except InvalidRecord as e:
+        return None, str(e)
+
+
+def iterRecordBatches(f, batchSize, workers=0, strict=False, mpContext=None):
+    """파일 → (bytesRead, [(ModuleRecord 또는 None, 오류 메시지)]) 배치.
+
+    workers가 1보다 크면 프로세스 풀에서 검증하고, 호출 측이 한 배치를 쓰는 동안 다음
+    배치를 검증한다 (메모리에는 최대 두 배치). mpContext는 풀의 multiprocessing 컨텍스트
+    (None이면 플랫폼 기본값, 어느 시작 방식이든 동작).
+    """
+    def batches():
+        batch = []
+        bytesRead = 0
+        for bytesRead, item in iterJsonArray(f):
+            batch.append(item)
+            if len(batch) >= batchSize:
+                yield bytesRead, batch
+                batch = []
+        if batch:
+            yield bytesRead, batch
+
+    check = partial(_checkRecord, strict=strict)
+    if workers <= 1:
+        for bytesRead, batch in batches():
+            yield bytesRead, [check(item) for item in batch]
+        return
+
+    with ProcessPoolExecutor(max_workers=workers, mp_context=mpContext) as pool:
+        pending = None
+        for bytesRead, batch in batches():
+            chunkSize = max(1, len(batch) // (workers * 4))
+            current = (bytesRead, pool.map(check, batch, chunksize=chunkSize))
+            if pending is not None:
+                yield pending[0], list(pending[1])
+            pending = current
+        if pending is not None:
+            yield pending[0], list(pending[1])
@@ -0,0 +1,30 @@
+"""카탈로그 전체를 NDJSON/CSV/OpenAPI-lite로 내보내는 관리 커맨드.
+
+사용법:
+    python manage.py export_catalog --format ndjson --output catalog.ndjson
+    python manage.py export_catalog --format openapi > openapi.json
+"""
+from django.core.management.base import BaseCommand
+
+from catalog.export import FORMATS, iterExport
+
+
+class Command(BaseCommand):
+    help = "카탈로그(ApiModule + Endpoint)를 스트리밍으로 내보냅니다"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--format", choices=sorted(FORMATS), default="ndjson", help="출력 형식")
+        parser.add_argument("--output", "-o", default="-", help="출력 파일 경로 (기본: 표준 출력)")
+
+    def handle(self, *args, **options):
+        chunks = iterExport(options["format"])
+        if options["output"] == "-":
+            for chunk in chunks:
+                self.stdout.write(chunk, ending="")
+            return
+
+        # csv 모듈이 줄바꿈(\r\n)을 직접 쓰므로 newline 변환 없이 기록
+        with open(options["output"], "w", encoding="utf-8", newline="") as f:
+            for chunk in chunks:
+                f.write(chunk)
+        self.stderr.write(f"  내보내기 완료: {options['output']}")
@@ -2,82 +2,280 @@
 
 사용법:
     python manage.py import_opera_apis data/ohip-apis-ko.json
+
+모듈마다 내용 해시와 엔드포인트 집합 해시를 저장해 두고, 재임포트 시 해시가 같은 모듈은
+건너뛴다. 바뀐 모듈은 필드만 갱신하고 엔드포인트는 추가/삭제/변경분만 반영한다.
+FTS 색인은 DB 트리거가 바뀐 행만 맞추고, 아무것도 바뀌지 않으면 DB에 쓰지 않으므로
+데이터 버전/updatedAt도 그대로다.
+
+파일은 catalog.importing으로 항목을 하나씩 스트리밍해 읽고, 검증/정규화는 프로세스 풀에서,
+DB 쓰기는 --batch-size 단위로 한다. 메모리 사용량은 파일 크기가 아니라 배치 크기에 비례한다.
+값은 기존처럼 그대로 적재하고, --strict를 주면 공백 정리와 형식 검사를 거쳐 어긋난 항목은 건너뛴다.
+
+--bulk는 바뀐 모듈을 apiId 충돌 upsert 한 번으로 쓰고 엔드포인트를 일괄 재작성한다
+(전체 적재 시 SQL 문 수가 모듈 수와 무관).
 """
-import json
 import logging
+import os
+import time
 
 from django.core.management.base import BaseCommand
-from django.db import transaction
+from django.db import connection, transaction
+from django.utils import timezone
 
-from catalog.models import ApiModule, Endpoint
+from catalog.importing import iterRecordBatches
+from catalog.models import ApiModule, DataVersion, Endpoint
 
 logger = logging.getLogger(__name__)
 
+DEFAULT_BATCH_SIZE = 500
+# --workers 미지정 시 이 크기 이상의 파일만 프로세스 풀로 검증 (작은 파일은 풀 기동 비용이 더 큼)
+POOL_MIN_BYTES = 8 << 20
+# 형식 오류 항목을 하나씩 출력하는 최대 수
+MAX_REPORTED_ERRORS = 20
+
+
+def _endpointStats(rows):
+    return ApiModule.endpointStats((method, uri, deprecated) for method, uri, _, deprecated in rows)
+
+
+def syncEndpoints(modulePk, rows):
+    """모듈 엔드포인트를 rows에 맞춤 → (추가, 삭제, 변경) 건수.
+
+    (method, uri)가 같은 기존 행은 남기고 operationId/deprecated만 고친다.
+    """
+    existing = {}
+    for pk, method, uri, operationId, deprecated in (
+        Endpoint.objects.filter(apiModule_id=modulePk)
+        .order_by("pk")
+        .values_list("pk", "method", "uri", "operationId", "deprecated")
+    ):
+        existing.setdefault((method, uri), []).append((pk, operationId, deprecated))
+
+    inserts = []
+    changes = []
+    for method, uri, operationId, deprecated in rows:
+        matches = existing.get((method, uri))
+        if not matches:
+            inserts.append(Endpoint(
+                apiModule_id=modulePk, method=method, uri=uri, operationId=operationId, deprecated=deprecated,
+            ))
+            continue
+        pk, oldOperationId, oldDeprecated = matches.pop(0)
+        if (oldOperationId, oldDeprecated) != (operationId, deprecated):
+            changes.append(Endpoint(pk=pk, operationId=operationId, deprecated=deprecated))
+    removed = [pk for matches in existing.values() for pk, _, _ in matches]
+
+    if removed:
+        Endpoint.objects.filter(pk__in=removed).delete()
+    if changes:
+        Endpoint.objects.bulk_update(changes, ["operationId", "deprecated"])
+    if inserts:
+        Endpoint.objects.bulk_create(inserts)
+    return len(inserts), len(removed), len(changes)
+
+
+SUMMARY_KEYS = ("created", "updated", "unchanged", "added", "removed", "changed")
+
+# --bulk upsert 시 충돌(apiId) 행에서 덮어쓰는 필드 (createdAt 제외)
+BULK_UPDATE_FIELDS = (
+    "title", "titleKo", "description", "descriptionKo", "moduleType", "moduleTypeKo",
+    "category", "categoryKo", "operationsCount", "deprecatedCount", "keywords", "operations",
+    "endpointCount", "methodCounts", "deprecatedEndpointCount", "prefixCounts",
+    "contentHash", "endpointsHash", "updatedAt",
+)
+
 
 class Command(BaseCommand):
-    help = "JSON 파일에서 OHIP API 데이터를 DB에 적재합니다 (upsert)"
+    help = "JSON 파일에서 OHIP API 데이터를 DB에 적재합니다 (변경분만 upsert)"
 
     def add_arguments(self, parser):
         parser.add_argument("json_file", type=str, help="JSON 데이터 파일 경로")
+        parser.add_argument(
+            "--batch-size", type=int, default=DEFAULT_BATCH_SIZE,
+            help=f"한 번에 검증/쓰기 하는 모듈 수 (기본 {DEFAULT_BATCH_SIZE})",
+        )
+        parser.add_argument(
+            "--workers", type=int, default=None,
+            help="검증 프로세스 수 (0/1이면 현재 프로세스, 기본: 큰 파일만 최대 4개)",
+        )
+        parser.add_argument(
+            "--bulk", action="store_true",
+            help="바뀐 모듈을 한 번에 upsert하고 엔드포인트를 일괄 재작성 (모듈 수와 무관한 SQL 문 수)",
+        )
+        parser.add_argument(
+            "--strict", action="store_true",
+            help="문자열 공백 정리 + 필수 값/길이/메서드/uri 형식 검사, 어긋난 항목은 건너뜀",
+        )
 
     def handle(self, *args, **options):
         filePath = options["json_file"]
+        verbosity = options["verbosity"]
+        batchSize = max(1, options["batch_size"])
+        fileSize = os.path.getsize(filePath)
+        workers = options["workers"]
+        if workers is None:
+            workers = min(4, os.cpu_count() or 1) if fileSize >= POOL_MIN_BYTES else 0
+        started = time.perf_counter()
 
-        with open(filePath, "r", encoding="utf-8") as f:
-            data = json.load(f)
-
-        self.stdout.write(f"  {len(data)}개 API 데이터 로드 완료")
-
-        created = 0
-        updated = 0
-        endpointTotal = 0
-
-        with transaction.atomic():
-            for item in data:
-                apiId = item.get("id")
-                defaults = {
-                    "title": item.get("title", ""),
-                    "titleKo": item.get("titleKo", ""),
-                    "description": item.get("description", ""),
-                    "descriptionKo": item.get("descriptionKo", ""),
-                    "moduleType": item.get("type", ""),
-                    "moduleTypeKo": item.get("typeKo", ""),
-                    "category": item.get("category", ""),
-                    "categoryKo": item.get("categoryKo", ""),
-                    "operationsCount": item.get("operationsCount", 0),
-                    "deprecatedCount": item.get("deprecatedCount", 0),
-                    "keywords": item.get("keywords", []),
-                    "operations": item.get("operations", []),
-                }
-
-                obj, isCreated = ApiModule.objects.update_or_create(
-                    apiId=apiId,
-                    defaults=defaults,
-                )
+        # 실행한 SQL 문 수 (executemany도 1회)
+        statements = 0
+
+        def countStatement(execute, sql, params, many, context):
+            nonlocal statements
+            statements += 1
+            return execute(sql, params, many, context)
 
-                if isCreated:
-                    created += 1
-                else:
-                    updated += 1
-
-                # 엔드포인트: 기존 삭제 후 벌크 생성
-                obj.endpoints.all().delete()
-                endpoints = item.get("endpoints", [])
-                if endpoints:
-                    endpointObjs = [
-                        Endpoint(
-                            apiModule=obj,
-                            method=ep.get("method", ""),
-                            uri=ep.get("uri", ""),
-                            operationId=ep.get("operationId", ""),
-                            deprecated=ep.get("deprecated", False),
-                        )
-                        for ep in endpoints
-                    ]
-                    Endpoint.objects.bulk_create(endpointObjs)
-                    endpointTotal += len(endpointObjs)
+        importBatch = self._importBulk if options["bulk"] else self._importIncremental
+        summary = dict.fromkeys(SUMMARY_KEYS, 0)
+        processed = 0
+        errors = 0
+        with open(filePath, "rb") as f, connection.execute_wrapper(countStatement), transaction.atomic():
+            for bytesRead, results in iterRecordBatches(f, batchSize, workers, options["strict"]):
+                records = []
+                for record, error in results:
+                    if error is None:
+                        records.append(record)
+                        continue
+                    errors += 1
+                    if errors <= MAX_REPORTED_ERRORS:
+                        self.stderr.write(f"  건너뜀: {error}")
+                for key, value in importBatch(records, verbosity).items():
+                    summary[key] += value
+                processed += len(results)
+                if verbosity >= 1:
+                    elapsed = time.perf_counter() - started
+                    self.stdout.write(
+                        f"  진행: {processed}개 ({bytesRead * 100 // max(fileSize, 1)}%, "
+                        f"{processed / max(elapsed, 1e-6):,.0f}개/초)"
+                    )
 
+            # 바뀐 것이 있을 때만 워커 메모리 색인 갱신 신호 (같은 트랜잭션에서 커밋)
+            if summary["created"] or summary["updated"]:
+                DataVersion.bump()
+
+        elapsed = time.perf_counter() - started
+        if errors:
+            self.stderr.write(self.style.WARNING(f"  형식 오류로 건너뛴 항목 {errors}개"))
         self.stdout.write(self.style.SUCCESS(
-            f"  완료: 생성 {created}개, 수정 {updated}개, "
-            f"엔드포인트 {endpointTotal}개"
+            f"  완료: 생성 {summary['created']}개, 수정 {summary['updated']}개, "
+            f"변경 없음 {summary['unchanged']}개, 엔드포인트 추가 {summary['added']}개 / "
+            f"삭제 {summary['removed']}개 / 변경 {summary['changed']}개 "
+            f"(SQL {statements}회, {elapsed:.3f}초)"
         ))
+
+    @staticmethod
+    def _knownModules(records):
+        """배치의 apiId → (pk, contentHash, endpointsHash) (DB에 있는 모듈만)."""
+        return {
+            apiId: (pk, contentHash, endpointsHash)
+            for apiId, pk, contentHash, endpointsHash in ApiModule.objects.order_by()
+            .filter(apiId__in={record.apiId for record in records})
+            .values_list("apiId", "pk", "contentHash", "endpointsHash")
+        }
+
+    def _importIncremental(self, records, verbosity):
+        """모듈별 비교 후 바뀐 필드/엔드포인트만 반영."""
+        summary = dict.fromkeys(SUMMARY_KEYS, 0)
+        known = self._knownModules(records)
+        for apiId, fields, rows, hashes in records:
+            current = known.get(apiId)
+            if current is None:
+                obj = ApiModule.objects.create(apiId=apiId, **fields, **_endpointStats(rows), **hashes)
+                Endpoint.objects.bulk_create([
+                    Endpoint(apiModule=obj, method=method, uri=uri, operationId=operationId, deprecated=deprecated)
+                    for method, uri, operationId, deprecated in rows
+                ])
+                known[apiId] = (obj.pk, hashes["contentHash"], hashes["endpointsHash"])
+                summary["created"] += 1
+                summary["added"] += len(rows)
+                if verbosity >= 2:
+                    self.stdout.write(f"  + [{apiId}] {fields['title']}: 엔드포인트 {len(rows)}개")
+                continue
+
+            pk, contentHash, endpointsHash = current
+            if (contentHash, endpointsHash) == (hashes["contentHash"], hashes["endpointsHash"]):
+                summary["unchanged"] += 1
+                continue
+
+            # 해시가 다르거나 비어 있으면 (관리자 수정 후) DB 값과 직접 비교
+            updates = dict(hashes)
+            diffFields = []
+            if contentHash != hashes["contentHash"]:
+                stored = ApiModule.objects.filter(pk=pk).values(*fields).get()
+                diffFields = [name for name, value in fields.items() if stored[name] != value]
+                updates.update((name, fields[name]) for name in diffFields)
+            diffEndpoints = (0, 0, 0)
+            if endpointsHash != hashes["endpointsHash"]:
+                diffEndpoints = syncEndpoints(pk, rows)
+                if any(diffEndpoints):
+                    updates.update(_endpointStats(rows))
+
+            known[apiId] = (pk, hashes["contentHash"], hashes["endpointsHash"])
+            if diffFields or any(diffEndpoints):
+                updates["updatedAt"] = timezone.now()
+                summary["updated"] += 1
+                summary["added"] += diffEndpoints[0]
+                summary["removed"] += diffEndpoints[1]
+                summary["changed"] += diffEndpoints[2]
+                if verbosity >= 2:
+                    self.stdout.write(
+                        f"  ~ [{apiId}] {fields['title']}: 필드 {', '.join(diffFields) or '-'}, "
+                        f"엔드포인트 +{diffEndpoints[0]} -{diffEndpoints[1]} ~{diffEndpoints[2]}"
+                    )
+            else:
+                summary["unchanged"] += 1
+            ApiModule.objects.filter(pk=pk).update(**updates)
+        return summary
+
+    def _importBulk(self, records, verbosity):
+        """해시가 바뀐 모듈을 bulk upsert 한 번으로 쓰고, 엔드포인트는 모듈 단위로 지우고 일괄 삽입.
+
+        SQL 문 수는 모듈 수가 아니라 배치 수에 비례한다. 필드별/엔드포인트별 비교는 하지
+        않으므로 해시가 다르면 (관리자 수정 후 빈 해시 포함) 그 모듈 전체를 다시 쓴다.
+        """
+        summary = dict.fromkeys(SUMMARY_KEYS, 0)
+        known = self._knownModules(records)
+        modules = {}
+        endpointRows = {}
+        for apiId, fields, rows, hashes in records:
+            current = known.get(apiId)
+            if current is not None and current[1:] == (hashes["contentHash"], hashes["endpointsHash"]):
+                modules.pop(apiId, None)
+                endpointRows.pop(apiId, None)
+                continue
+            # 같은 apiId가 파일에 여러 번 있으면 마지막 항목 (한 INSERT 안의 중복 충돌 방지)
+            modules[apiId] = ApiModule(apiId=apiId, **fields, **_endpointStats(rows), **hashes)
+            if current is None or current[2] != hashes["endpointsHash"]:
+                endpointRows[apiId] = rows
+            else:
+                endpointRows.pop(apiId, None)
+
+        summary["created"] = sum(1 for apiId in modules if apiId not in known)
+        summary["updated"] = len(modules) - summary["created"]
+        summary["unchanged"] = len({record.apiId for record in records} - modules.keys())
+        if not modules:
+            return summary
+
+        ApiModule.objects.bulk_create(
+            list(modules.values()),
+            update_conflicts=True,
+            unique_fields=["apiId"],
+            update_fields=BULK_UPDATE_FIELDS,
+        )
+        if endpointRows:
+            pks = dict(
+                ApiModule.objects.order_by().filter(apiId__in=list(endpointRows)).values_list("apiId", "pk")
+            )
+            stale = [pks[apiId] for apiId in endpointRows if apiId in known]
+            if stale:
+                summary["removed"], _ = Endpoint.objects.filter(apiModule_id__in=stale).delete()
+            created = Endpoint.objects.bulk_create([
+                Endpoint(
+                    apiModule_id=pks[apiId], method=method, uri=uri, operationId=operationId, deprecated=deprecated,
+                )
+                for apiId, rows in endpointRows.items()
+                for method, uri, operationId, deprecated in rows
+            ])
+            summary["added"] = len(created)
+        return summary
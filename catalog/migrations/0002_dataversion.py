@@ -0,0 +1,25 @@
+# Generated by Django 5.1.15 on 2026-10-17 00:52
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('catalog', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DataVersion',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('token', models.CharField(max_length=32, verbose_name='버전 토큰')),
+                ('updatedAt', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'verbose_name': '데이터 버전',
+                'verbose_name_plural': '데이터 버전',
+            },
+        ),
+    ]
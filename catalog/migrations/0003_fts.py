@@ -0,0 +1,67 @@
+"""SQLite FTS5(trigram) 전문 검색 가상 테이블.
+
+SQLite가 아니거나 FTS5/trigram을 지원하지 않으면 건너뛴다 (뷰는 LIKE 검색 유지).
+"""
+from django.db import migrations
+from django.db.utils import OperationalError
+
+CREATE_STATEMENTS = (
+    "CREATE VIRTUAL TABLE IF NOT EXISTS catalog_apimodule_fts USING fts5("
+    "title, titleKo, keywords, operations, description, descriptionKo, tokenize='trigram')",
+    "CREATE VIRTUAL TABLE IF NOT EXISTS catalog_endpoint_fts USING fts5("
+    "uri, operationId, moduleId UNINDEXED, tokenize='trigram')",
+)
+DROP_STATEMENTS = (
+    "DROP TABLE IF EXISTS catalog_apimodule_fts",
+    "DROP TABLE IF EXISTS catalog_endpoint_fts",
+)
+
+
+def createFtsTables(apps, schema_editor):
+    if schema_editor.connection.vendor != "sqlite":
+        return
+    with schema_editor.connection.cursor() as cursor:
+        try:
+            for statement in CREATE_STATEMENTS:
+                cursor.execute(statement)
+        except OperationalError:
+            for statement in DROP_STATEMENTS:
+                cursor.execute(statement)
+            return
+    # 기존 데이터 색인 (마이그레이션 시점 모델 사용)
+    ApiModule = apps.get_model("catalog", "ApiModule")
+    Endpoint = apps.get_model("catalog", "Endpoint")
+    with schema_editor.connection.cursor() as cursor:
+        cursor.executemany(
+            "INSERT INTO catalog_apimodule_fts "
+            "(rowid, title, titleKo, keywords, operations, description, descriptionKo) "
+            "VALUES (%s, %s, %s, %s, %s, %s, %s)",
+            [
+                (m.pk, m.title, m.titleKo, " ".join(m.keywords or []), " ".join(m.operations or []),
+                 m.description, m.descriptionKo)
+                for m in ApiModule.objects.all()
+            ],
+        )
+        cursor.executemany(
+            "INSERT INTO catalog_endpoint_fts (rowid, uri, operationId, moduleId) VALUES (%s, %s, %s, %s)",
+            list(Endpoint.objects.values_list("pk", "uri", "operationId", "apiModule_id")),
+        )
+
+
+def dropFtsTables(apps, schema_editor):
+    if schema_editor.connection.vendor != "sqlite":
+        return
+    with schema_editor.connection.cursor() as cursor:
+        for statement in DROP_STATEMENTS:
+            cursor.execute(statement)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("catalog", "0002_dataversion"),
+    ]
+
+    operations = [
+        migrations.RunPython(createFtsTables, dropFtsTables),
+    ]
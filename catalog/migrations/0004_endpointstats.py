@@ -0,0 +1,50 @@
+# Generated by Django 5.1.15 on 2026-10-17 01:01
+
+from django.db import migrations, models
+
+
+def fillEndpointStats(apps, schema_editor):
+    """기존 모듈의 엔드포인트 통계 채우기 (메서드별 수, deprecated 수)."""
+    ApiModule = apps.get_model("catalog", "ApiModule")
+    Endpoint = apps.get_model("catalog", "Endpoint")
+    stats = {}
+    for moduleId, method, deprecated in Endpoint.objects.order_by().values_list(
+        "apiModule_id", "method", "deprecated",
+    ):
+        entry = stats.setdefault(
+            moduleId, {"endpointCount": 0, "methodCounts": {}, "deprecatedEndpointCount": 0},
+        )
+        entry["endpointCount"] += 1
+        entry["methodCounts"][method] = entry["methodCounts"].get(method, 0) + 1
+        entry["deprecatedEndpointCount"] += bool(deprecated)
+    modules = list(ApiModule.objects.filter(pk__in=stats))
+    for module in modules:
+        for field, value in stats[module.pk].items():
+            setattr(module, field, value)
+    ApiModule.objects.bulk_update(modules, ["endpointCount", "methodCounts", "deprecatedEndpointCount"])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('catalog', '0003_fts'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='apimodule',
+            name='deprecatedEndpointCount',
+            field=models.IntegerField(default=0, verbose_name='Deprecated 엔드포인트 수'),
+        ),
+        migrations.AddField(
+            model_name='apimodule',
+            name='endpointCount',
+            field=models.IntegerField(default=0, verbose_name='엔드포인트 수'),
+        ),
+        migrations.AddField(
+            model_name='apimodule',
+            name='methodCounts',
+            field=models.JSONField(blank=True, default=dict, verbose_name='메서드별 엔드포인트 수'),
+        ),
+        migrations.RunPython(fillEndpointStats, migrations.RunPython.noop),
+    ]
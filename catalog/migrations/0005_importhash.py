@@ -0,0 +1,23 @@
+# Generated by Django 5.1.15 on 2026-10-17 01:12
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('catalog', '0004_endpointstats'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='apimodule',
+            name='contentHash',
+            field=models.CharField(blank=True, default='', max_length=40, verbose_name='모듈 내용 해시'),
+        ),
+        migrations.AddField(
+            model_name='apimodule',
+            name='endpointsHash',
+            field=models.CharField(blank=True, default='', max_length=40, verbose_name='엔드포인트 해시'),
+        ),
+    ]
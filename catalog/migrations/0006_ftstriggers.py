@@ -0,0 +1,83 @@
+"""FTS 색인을 행 단위로 맞추는 SQLite 트리거.
+
+모듈/엔드포인트 행이 추가/수정/삭제되면 같은 문장 안에서 해당 FTS 행만 고친다
+(임포트/관리자 수정 후 전체 색인 재작성 불필요). FTS 테이블이 없는 DB(0003에서 건너뜀)는 건너뛴다.
+"""
+from django.db import migrations
+
+# keywords/operations(JSON 목록) → 공백으로 이은 문자열 (fts._joinList와 같은 값)
+_JOIN_KEYWORDS = "coalesce((SELECT group_concat(value, ' ') FROM json_each(new.keywords)), '')"
+_JOIN_OPERATIONS = "coalesce((SELECT group_concat(value, ' ') FROM json_each(new.operations)), '')"
+
+CREATE_STATEMENTS = (
+    "CREATE TRIGGER IF NOT EXISTS catalog_apimodule_fts_insert AFTER INSERT ON catalog_apimodule BEGIN "
+    "INSERT INTO catalog_apimodule_fts "
+    "(rowid, title, titleKo, keywords, operations, description, descriptionKo) VALUES "
+    f"(new.id, new.title, new.titleKo, {_JOIN_KEYWORDS}, {_JOIN_OPERATIONS}, new.description, new.descriptionKo); "
+    "END",
+    "CREATE TRIGGER IF NOT EXISTS catalog_apimodule_fts_update AFTER UPDATE OF "
+    "title, titleKo, keywords, operations, description, descriptionKo ON catalog_apimodule BEGIN "
+    "UPDATE catalog_apimodule_fts SET "
+    f"title = new.title, titleKo = new.titleKo, keywords = {_JOIN_KEYWORDS}, operations = {_JOIN_OPERATIONS}, "
+    "description = new.description, descriptionKo = new.descriptionKo WHERE rowid = new.id; "
+    "END",
+    "CREATE TRIGGER IF NOT EXISTS catalog_apimodule_fts_delete AFTER DELETE ON catalog_apimodule BEGIN "
+    "DELETE FROM catalog_apimodule_fts WHERE rowid = old.id; "
+    "END",
+    "CREATE TRIGGER IF NOT EXISTS catalog_endpoint_fts_insert AFTER INSERT ON catalog_endpoint BEGIN "
+    "INSERT INTO catalog_endpoint_fts (rowid, uri, operationId, moduleId) "
+    "VALUES (new.id, new.uri, new.operationId, new.apiModule_id); "
+    "END",
+    "CREATE TRIGGER IF NOT EXISTS catalog_endpoint_fts_update AFTER UPDATE OF "
+    "uri, operationId, apiModule_id ON catalog_endpoint BEGIN "
+    "UPDATE catalog_endpoint_fts SET uri = new.uri, operationId = new.operationId, moduleId = new.apiModule_id "
+    "WHERE rowid = new.id; "
+    "END",
+    "CREATE TRIGGER IF NOT EXISTS catalog_endpoint_fts_delete AFTER DELETE ON catalog_endpoint BEGIN "
+    "DELETE FROM catalog_endpoint_fts WHERE rowid = old.id; "
+    "END",
+)
+DROP_STATEMENTS = tuple(
+    f"DROP TRIGGER IF EXISTS {name}"
+    for name in (
+        "catalog_apimodule_fts_insert", "catalog_apimodule_fts_update", "catalog_apimodule_fts_delete",
+        "catalog_endpoint_fts_insert", "catalog_endpoint_fts_update", "catalog_endpoint_fts_delete",
+    )
+)
+
+
+def _hasFtsTables(cursor):
+    cursor.execute(
+        "SELECT COUNT(*) FROM sqlite_master WHERE type = 'table' "
+        "AND name IN ('catalog_apimodule_fts', 'catalog_endpoint_fts')"
+    )
+    return cursor.fetchone()[0] == 2
+
+
+def createFtsTriggers(apps, schema_editor):
+    if schema_editor.connection.vendor != "sqlite":
+        return
+    with schema_editor.connection.cursor() as cursor:
+        if not _hasFtsTables(cursor):
+            return
+        for statement in CREATE_STATEMENTS:
+            cursor.execute(statement)
+
+
+def dropFtsTriggers(apps, schema_editor):
+    if schema_editor.connection.vendor != "sqlite":
+        return
+    with schema_editor.connection.cursor() as cursor:
+        for statement in DROP_STATEMENTS:
+            cursor.execute(statement)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("catalog", "0005_importhash"),
+    ]
+
+    operations = [
+        migrations.RunPython(createFtsTriggers, dropFtsTriggers),
+    ]
@@ -0,0 +1,56 @@
+# Generated by Django 5.1.15 on 2026-10-17 01:37
+
+import importlib
+
+from django.db import migrations, models
+
+# SQLite는 컬럼 추가/삭제 시 테이블을 새로 만들어 0006의 FTS 트리거가 사라지므로 다시 만든다
+createFtsTriggers = importlib.import_module("catalog.migrations.0006_ftstriggers").createFtsTriggers
+
+
+def _uriPrefix(uri, depth=3):
+    # catalog.models.uriPrefix (마이그레이션 시점 복사본)
+    segments = []
+    for seg in uri.split("?", 1)[0].split("/"):
+        if not seg:
+            continue
+        if seg.startswith("{") or len(segments) == depth:
+            break
+        segments.append(seg)
+    return "/" + "/".join(segments)
+
+
+def fillPrefixCounts(apps, schema_editor):
+    """기존 모듈의 경로 prefix별 엔드포인트 수 채우기."""
+    ApiModule = apps.get_model("catalog", "ApiModule")
+    Endpoint = apps.get_model("catalog", "Endpoint")
+    stats = {}
+    for moduleId, method, uri, deprecated in Endpoint.objects.order_by().values_list(
+        "apiModule_id", "method", "uri", "deprecated",
+    ):
+        counts = stats.setdefault(moduleId, {}).setdefault(_uriPrefix(uri), {}).setdefault(method, [0, 0])
+        counts[0] += 1
+        counts[1] += bool(deprecated)
+    modules = list(ApiModule.objects.filter(pk__in=stats))
+    for module in modules:
+        module.prefixCounts = stats[module.pk]
+    ApiModule.objects.bulk_update(modules, ["prefixCounts"])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('catalog', '0006_ftstriggers'),
+    ]
+
+    operations = [
+        # 되돌릴 때 RemoveField 다음에 실행
+        migrations.RunPython(migrations.RunPython.noop, createFtsTriggers),
+        migrations.AddField(
+            model_name='apimodule',
+            name='prefixCounts',
+            field=models.JSONField(blank=True, default=dict, verbose_name='경로 prefix별 엔드포인트 수'),
+        ),
+        migrations.RunPython(createFtsTriggers, migrations.RunPython.noop),
+        migrations.RunPython(fillPrefixCounts, migrations.RunPython.noop),
+    ]
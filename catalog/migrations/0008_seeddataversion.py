@@ -0,0 +1,25 @@
+"""데이터 버전 표식 행 만들기.
+
+표식이 없으면 버전 토큰이 빈 문자열이라, 첫 임포트/관리자 수정 전에는 서로 다른 DB도 같은
+버전으로 보인다 (목록 결과 캐시 키/ETag가 겹침). 마이그레이션 때 DB마다 고유한 토큰을 발급한다.
+"""
+import uuid
+
+from django.db import migrations
+
+
+def seedDataVersion(apps, schema_editor):
+    DataVersion = apps.get_model("catalog", "DataVersion")
+    # catalog.models.DataVersion.SINGLETON_PK
+    DataVersion.objects.get_or_create(pk=1, defaults={"token": uuid.uuid4().hex})
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("catalog", "0007_prefixcounts"),
+    ]
+
+    operations = [
+        migrations.RunPython(seedDataVersion, migrations.RunPython.noop),
+    ]
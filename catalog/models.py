@@ -1,6 +1,28 @@
 """OHIP API 카탈로그 모델."""
+import uuid
+
 from django.db import models
 
+from .importing import HTTP_METHODS, contentHashOf, endpointsHashOf
+
+# 상세 페이지 엔드포인트 섹션 묶음 기준 경로 세그먼트 수
+URI_PREFIX_DEPTH = 3
+
+
+def uriPrefix(uri, depth=URI_PREFIX_DEPTH):
+    """엔드포인트 묶음 기준 경로 ("/rsv/v1/reservations/{id}" → "/rsv/v1/reservations").
+
+    앞 depth개 세그먼트까지, {param} 세그먼트를 만나면 그 앞까지.
+    """
+    segments = []
+    for seg in uri.split("?", 1)[0].split("/"):
+        if not seg:
+            continue
+        if seg.startswith("{") or len(segments) == depth:
+            break
+        segments.append(seg)
+    return "/" + "/".join(segments)
+
 
 class ApiModule(models.Model):
     """API 모듈/워크플로우 단위."""
@@ -18,6 +40,15 @@ class ApiModule(models.Model):
     deprecatedCount = models.IntegerField(default=0, verbose_name="Deprecated 수")
     keywords = models.JSONField(default=list, blank=True, verbose_name="검색 키워드")
     operations = models.JSONField(default=list, blank=True, verbose_name="Operation 목록")
+    # 엔드포인트 통계 (임포트 시 계산, 상세 페이지 COUNT 쿼리 대신 사용)
+    endpointCount = models.IntegerField(default=0, verbose_name="엔드포인트 수")
+    methodCounts = models.JSONField(default=dict, blank=True, verbose_name="메서드별 엔드포인트 수")
+    deprecatedEndpointCount = models.IntegerField(default=0, verbose_name="Deprecated 엔드포인트 수")
+    # {경로 prefix: {메서드: [엔드포인트 수, deprecated 수]}} - 상세 페이지 섹션 건수
+    prefixCounts = models.JSONField(default=dict, blank=True, verbose_name="경로 prefix별 엔드포인트 수")
+    # 마지막 임포트 원본의 내용 해시 (재임포트 시 변경 감지, 관리자 수정 시 비움)
+    contentHash = models.CharField(max_length=40, blank=True, default="", verbose_name="모듈 내용 해시")
+    endpointsHash = models.CharField(max_length=40, blank=True, default="", verbose_name="엔드포인트 해시")
     createdAt = models.DateTimeField(auto_now_add=True)
     updatedAt = models.DateTimeField(auto_now=True)
 
@@ -46,18 +77,63 @@ class ApiModule(models.Model):
     def activeCount(self):
         return self.operationsCount - self.deprecatedCount
 
+    @property
+    def methodSummary(self):
+        """[(메서드, 엔드포인트 수)] - METHOD_CHOICES 순서, 0건 제외."""
+        counts = self.methodCounts or {}
+        return [(m, counts[m]) for m, _ in Endpoint.METHOD_CHOICES if counts.get(m)]
+
+    @staticmethod
+    def endpointStats(endpoints):
+        """(method, uri, deprecated) 목록 → 엔드포인트 통계 필드 값 dict."""
+        methodCounts = {}
+        prefixCounts = {}
+        deprecated = 0
+        total = 0
+        for method, uri, isDeprecated in endpoints:
+            methodCounts[method] = methodCounts.get(method, 0) + 1
+            counts = prefixCounts.setdefault(uriPrefix(uri), {}).setdefault(method, [0, 0])
+            counts[0] += 1
+            counts[1] += bool(isDeprecated)
+            deprecated += bool(isDeprecated)
+            total += 1
+        return {
+            "endpointCount": total,
+            "methodCounts": methodCounts,
+            "deprecatedEndpointCount": deprecated,
+            "prefixCounts": prefixCounts,
+        }
+
+    # 임포트 검증 프로세스에서도 쓰므로 Django 없는 catalog.importing에 구현
+    contentHashOf = staticmethod(contentHashOf)
+    endpointsHashOf = staticmethod(endpointsHashOf)
+
+    @classmethod
+    def refreshEndpointStats(cls, modulePks=None):
+        """모듈(modulePks, None이면 전체)의 엔드포인트 통계를 DB 엔드포인트로 다시 계산 (관리자 수정 후)."""
+        endpoints = Endpoint.objects.order_by()
+        modules = cls.objects.only("pk")
+        if modulePks is not None:
+            endpoints = endpoints.filter(apiModule_id__in=modulePks)
+            modules = modules.filter(pk__in=modulePks)
+        triples = {}
+        for moduleId, method, uri, isDeprecated in (
+            endpoints.values_list("apiModule_id", "method", "uri", "deprecated").iterator()
+        ):
+            triples.setdefault(moduleId, []).append((method, uri, isDeprecated))
+        modules = list(modules)
+        for module in modules:
+            for field, value in cls.endpointStats(triples.get(module.pk, ())).items():
+                setattr(module, field, value)
+        cls.objects.bulk_update(
+            modules, ["endpointCount", "methodCounts", "deprecatedEndpointCount", "prefixCounts"],
+        )
+
 
 class Endpoint(models.Model):
     """개별 REST 엔드포인트."""
 
-    METHOD_CHOICES = [
-        ("GET", "GET"),
-        ("POST", "POST"),
-        ("PUT", "PUT"),
-        ("DELETE", "DELETE"),
-        ("HEAD", "HEAD"),
-        ("PATCH", "PATCH"),
-    ]
+    METHOD_CHOICES = [(method, method) for method in HTTP_METHODS]
 
     apiModule = models.ForeignKey(
         ApiModule,
@@ -82,3 +158,41 @@ class Endpoint(models.Model):
 
     def __str__(self):
         return f"{self.method} {self.uri}"
+
+
+class DataVersion(models.Model):
+    """카탈로그 데이터 버전 표식 (단일 행).
+
+    임포트/관리자 수정 시 토큰을 새로 발급하고, 워커의 메모리 색인은 토큰이 바뀌면 다시 만든다.
+    """
+
+    SINGLETON_PK = 1
+
+    token = models.CharField(max_length=32, verbose_name="버전 토큰")
+    updatedAt = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        verbose_name = "데이터 버전"
+        verbose_name_plural = "데이터 버전"
+
+    def __str__(self):
+        return self.token
+
+    @classmethod
+    def current(cls):
+        """현재 버전 토큰 (표식이 없으면 빈 문자열)."""
+        token = cls.objects.filter(pk=cls.SINGLETON_PK).values_list("token", flat=True).first()
+        return token or ""
+
+    @classmethod
+    def stamp(cls):
+        """(버전 토큰, 갱신 시각) - 표식이 없으면 ("", None)."""
+        row = cls.objects.filter(pk=cls.SINGLETON_PK).values_list("token", "updatedAt").first()
+        return row or ("", None)
+
+    @classmethod
+    def bump(cls):
+        """새 버전 토큰 발급."""
+        token = uuid.uuid4().hex
+        cls.objects.update_or_create(pk=cls.SINGLETON_PK, defaults={"token": token})
+        return token
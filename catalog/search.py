@@ -0,0 +1,398 @@
+"""카탈로그 검색 색인 (워커 프로세스별 메모리 캐시).
+
+데이터 버전 표식(DataVersion)이 바뀌면 색인을 백그라운드 스레드에서 다시 만들고
+참조를 통째로 교체한다. 교체 전까지 조회는 이전 색인을 그대로 쓰므로 조회 경로에
+잠금이나 재생성 지연이 없다. 목록 필터/facet은 이전 색인이 모르는 모듈을 빠뜨리지 않도록
+교체 전까지 DB 질의로 계산한다.
+
+색인이 아직 없을 때(워커 첫 조회), 트랜잭션 안(다른 연결의 스레드는 커밋 전 데이터를 못 봄,
+테스트 포함), SEARCH_INDEX_SYNC_REBUILD 설정이 켜져 있을 때는 동기로 만든다.
+"""
+import logging
+import threading
+from typing import NamedTuple
+
+from django.conf import settings
+from django.db import connection
+from django.db.models import Count, Q
+
+from lib.ohip_search import (
+    Bm25Index, EndpointStore, KoreanIndex, PrefixTrie, QueryIndex, hasHangul, normalizeText, parseQuery,
+    tokenize,
+)
+
+from . import fts
+from .models import ApiModule, DataVersion, Endpoint
+
+logger = logging.getLogger(__name__)
+
+INDEX_FIELDS = (
+    "pk", "apiId", "title", "titleKo", "description", "descriptionKo",
+    "category", "categoryKo", "moduleType", "moduleTypeKo", "operationsCount", "deprecatedCount",
+    "keywords", "operations",
+)
+ENDPOINT_FIELDS = ("apiModule_id", "method", "uri", "operationId", "deprecated")
+
+# 목록 정렬 키 (sort 파라미터 → (모듈 필드, 역순 여부))
+SORT_FIELDS = {
+    "name": ("titleKo", False),
+    "-name": ("titleKo", True),
+    "ops": ("operationsCount", False),
+    "-ops": ("operationsCount", True),
+}
+
+# 자동완성 후보 종류별 우선순위 (작을수록 앞)
+SUGGEST_PRIORITY = {"title": 0, "keyword": 1, "operationId": 2}
+
+# (데이터 버전, 위치 → ApiModule pk, KoreanIndex, Bm25Index, QueryIndex, FacetIndex, PrefixTrie)
+# - 통째로 교체
+_indexState = (None, [], None, None, None, None, None)
+_rebuildLock = threading.Lock()
+_rebuildThread = None
+
+
+def dataVersion():
+    """현재 카탈로그 데이터 버전 토큰."""
+    return DataVersion.current()
+
+
+def _buildIndexState(version):
+    rows = list(ApiModule.objects.order_by("pk").values(*INDEX_FIELDS))
+    positions = {}
+    for pos, row in enumerate(rows):
+        # lib 색인과 같은 키 이름 (id/type/typeKo/endpoints)
+        row.update(id=row["apiId"], type=row["moduleType"], typeKo=row["moduleTypeKo"], endpoints=[])
+        positions[row["pk"]] = pos
+    for ep in Endpoint.objects.order_by("apiModule_id", "pk").values(*ENDPOINT_FIELDS).iterator():
+        rows[positions[ep.pop("apiModule_id")]]["endpoints"].append(ep)
+
+    koreanIndex = KoreanIndex(rows)
+    rankIndex = Bm25Index(rows)
+    store = EndpointStore(rows)
+    suggestTrie = PrefixTrie(_suggestEntries(rows))
+    for row in rows:
+        del row["endpoints"]
+    return (
+        version,
+        [row["pk"] for row in rows],
+        koreanIndex,
+        rankIndex,
+        QueryIndex(rows, store, lambda text: _matchText(koreanIndex, rankIndex, text)),
+        FacetIndex(rows),
+        suggestTrie,
+    )
+
+
+def _suggestEntries(rows):
+    """자동완성 후보 (제목 → 키워드 → operationId)."""
+    for row in rows:
+        yield row["titleKo"], "title", SUGGEST_PRIORITY["title"]
+        yield row["title"], "title", SUGGEST_PRIORITY["title"]
+    for row in rows:
+        for keyword in row["keywords"] or []:
+            yield keyword, "keyword", SUGGEST_PRIORITY["keyword"]
+    for row in rows:
+        for ep in row["endpoints"]:
+            yield ep["operationId"], "operationId", SUGGEST_PRIORITY["operationId"]
+
+
+def _matchText(koreanIndex, rankIndex, text):
+    """키워드의 모든 토큰을 포함하는 모듈 위치 (한글은 n-gram/초성, 그 외는 term 부분 일치)."""
+    result = None
+    for token in set(tokenize(text)):
+        posting = koreanIndex.matchToken(token) if hasHangul(token) else rankIndex.terms.containing(token)
+        result = posting if result is None else result & posting
+        if not result:
+            break
+    return result or frozenset()
+
+
+class FacetCounts(NamedTuple):
+    """목록 필터 결과와 선택지별 건수."""
+
+    pks: list
+    types: dict
+    categories: dict
+    deprecated: int
+    categoryChoices: list
+    # 계산에 쓴 메모리 색인의 데이터 버전
+    version: str
+
+
+class FacetIndex:
+    """목록 필터(타입/카테고리/lifecycle) 모듈 비트맵과 정렬 키.
+
+    검색 결과 비트맵에 필터 비트맵을 AND 해서 결과와 facet 건수를 한 번에 구한다.
+    각 facet 건수는 자기 facet 선택을 뺀 나머지 필터만 적용한 값이라 체크박스를
+    바꿨을 때의 결과 수와 같다. 데이터 버전마다 새로 만들어지므로 건수 캐시도
+    버전과 함께 버려진다.
+    """
+
+    CACHE_SIZE = 512
+
+    def __init__(self, rows):
+        self.all = (1 << len(rows)) - 1
+        self.types = {}
+        self.categories = {}
+        self.deprecated = 0
+        labels = {}
+        for pos, row in enumerate(rows):
+            bit = 1 << pos
+            self.types[row["moduleType"]] = self.types.get(row["moduleType"], 0) | bit
+            self.categories[row["category"]] = self.categories.get(row["category"], 0) | bit
+            labels.setdefault(row["category"], row["categoryKo"])
+            if row["deprecatedCount"] > 0:
+                self.deprecated |= bit
+        # (카테고리, 한글 이름) 선택지 (한글 이름순)
+        self.categoryChoices = sorted(labels.items(), key=lambda item: (item[1], item[0]))
+        self.sortKeys = {
+            field: [row[field] for row in rows] for field in ("titleKo", "operationsCount")
+        }
+        self._cache = {}
+
+    def _union(self, masks, values):
+        if values is None:
+            return self.all
+        result = 0
+        for value in values:
+            result |= masks.get(value, 0)
+        return result
+
+    def count(self, searchMask, types=None, categories=None, includeDeprecated=True):
+        """(결과 비트맵, 타입별/카테고리별 건수, deprecated 모듈 수). types/categories None은 전체."""
+        base = self.all if searchMask is None else searchMask & self.all
+        typeMask = self._union(self.types, types)
+        categoryMask = self._union(self.categories, categories)
+        lifecycleMask = self.all if includeDeprecated else self.all & ~self.deprecated
+        key = (base, typeMask, categoryMask, lifecycleMask)
+        cached = self._cache.get(key)
+        if cached is None:
+            others = base & categoryMask & lifecycleMask
+            typeCounts = {value: (others & mask).bit_count() for value, mask in self.types.items()}
+            others = base & typeMask & lifecycleMask
+            categoryCounts = {value: (others & mask).bit_count() for value, mask in self.categories.items()}
+            deprecated = (base & typeMask & categoryMask & self.deprecated).bit_count()
+            if len(self._cache) >= self.CACHE_SIZE:
+                self._cache.clear()
+            cached = self._cache[key] = (
+                base & typeMask & categoryMask & lifecycleMask, typeCounts, categoryCounts, deprecated,
+            )
+        return cached
+
+
+def _rebuildInBackground(version):
+    global _indexState, _rebuildThread
+    try:
+        _indexState = _buildIndexState(version)
+    except Exception:
+        logger.exception("검색 색인 재생성 실패 (이전 색인 유지)")
+    finally:
+        connection.close()
+        with _rebuildLock:
+            _rebuildThread = None
+
+
+def _startRebuild(version):
+    global _rebuildThread
+    with _rebuildLock:
+        if _rebuildThread is not None:
+            return
+        _rebuildThread = threading.Thread(
+            target=_rebuildInBackground, args=(version,), name="catalog-index-rebuild", daemon=True,
+        )
+        _rebuildThread.start()
+
+
+def _indexStateAndVersion():
+    """(메모리 색인 상태, 현재 데이터 버전). 재생성 중이면 상태는 이전 버전일 수 있음."""
+    global _indexState
+    state = _indexState
+    version = dataVersion()
+    if state[0] == version:
+        return state, version
+    if state[2] is None or connection.in_atomic_block or settings.SEARCH_INDEX_SYNC_REBUILD:
+        state = _indexState = _buildIndexState(version)
+        return state, version
+    _startRebuild(version)
+    return state, version
+
+
+def _getIndexState():
+    return _indexStateAndVersion()[0]
+
+
+def resetIndex():
+    """메모리 색인 폐기 (다음 조회에서 동기로 다시 생성). 테스트/관리 작업용."""
+    global _indexState
+    _indexState = (None, [], None, None, None, None, None)
+
+
+def isKoreanQuery(query):
+    """모든 단어가 한글(음절/자모)을 포함하는 검색어인지 여부."""
+    words = normalizeText(query).split()
+    return bool(words) and all(hasHangul(word) for word in words)
+
+
+def matchKoreanModules(query):
+    """한글 검색어에 매칭되는 ApiModule pk 목록 (n-gram/초성 색인 교집합)."""
+    _, pks, koreanIndex, _, _, _, _ = _getIndexState()
+    return [pks[pos] for pos in koreanIndex.match(query)]
+
+
+def rankModules(query, modulePks):
+    """modulePks를 BM25 관련도순으로 정렬한 pk 목록 (동점은 입력 순서 유지)."""
+    _, pks, _, rankIndex, _, _, _ = _getIndexState()
+    positions = {pk: pos for pos, pk in enumerate(pks)}
+    scores = rankIndex.scores(query, frozenset(positions[pk] for pk in modulePks if pk in positions))
+    return sorted(modulePks, key=lambda pk: -scores.get(positions.get(pk), 0.0))
+
+
+def isStructuredQuery(query):
+    """필드 조건(method:, category: 등), 부정(-), deprecated 플래그, OR을 쓰는 구조화 질의인지 여부."""
+    try:
+        plan = parseQuery(query)
+    except ValueError:
+        return False
+    return len(plan) > 1 or any(term.field != "text" or term.negated for term in plan[0])
+
+
+def queryText(query):
+    """구조화 질의의 키워드 부분 (관련도 정렬용, 부정 키워드 제외)."""
+    try:
+        plan = parseQuery(query)
+    except ValueError:
+        return query
+    return " ".join(
+        term.values[0] for group in plan for term in group if term.field == "text" and not term.negated
+    )
+
+
+def queryModules(query):
+    """구조화 질의에 매칭되는 ApiModule pk 목록 (속성별 비트맵 연산)."""
+    _, pks, _, _, queryIndex, _, _ = _getIndexState()
+    modules, _ = queryIndex.execute(parseQuery(query))
+    return [pks[pos] for pos in range(len(pks)) if modules >> pos & 1]
+
+
+def filterModules(modulePks=None, types=None, categories=None, includeDeprecated=True, sort=None):
+    """검색 결과(modulePks, None이면 전체)에 목록 필터를 적용한 결과와 facet 건수.
+
+    types/categories가 None이면 해당 필터를 적용하지 않는다. 결과 pk는 sort(SORT_FIELDS
+    키, 모르는 값은 "name", 동점은 pk순)로 정렬하고, sort가 None이면 pk순이다.
+    """
+    (indexVersion, pks, _, _, _, facets, _), version = _indexStateAndVersion()
+    if indexVersion != version:
+        return _filterModulesDb(modulePks, types, categories, includeDeprecated, sort, version)
+    searchMask = None
+    if modulePks is not None:
+        positions = {pk: pos for pos, pk in enumerate(pks)}
+        searchMask = 0
+        for pk in modulePks:
+            pos = positions.get(pk)
+            if pos is not None:
+                searchMask |= 1 << pos
+    result, typeCounts, categoryCounts, deprecated = facets.count(
+        searchMask, types, categories, includeDeprecated,
+    )
+    resultPositions = [pos for pos in range(len(pks)) if result >> pos & 1]
+    if sort is not None:
+        field, reverse = SORT_FIELDS.get(sort, SORT_FIELDS["name"])
+        keys = facets.sortKeys[field]
+        resultPositions.sort(key=lambda pos: (keys[pos], pks[pos]), reverse=reverse)
+    return FacetCounts(
+        [pks[pos] for pos in resultPositions], typeCounts, categoryCounts, deprecated,
+        facets.categoryChoices, version,
+    )
+
+
+def _filterModulesDb(modulePks, types, categories, includeDeprecated, sort, version):
+    """filterModules와 같은 결과를 DB 질의로 계산 (메모리 색인을 다시 만드는 동안)."""
+    base = ApiModule.objects.order_by()
+    if modulePks is not None:
+        base = base.filter(pk__in=modulePks)
+    typeQ = Q() if types is None else Q(moduleType__in=types)
+    categoryQ = Q() if categories is None else Q(category__in=categories)
+    lifecycleQ = Q() if includeDeprecated else Q(deprecatedCount=0)
+
+    def grouped(field, queryset):
+        return dict(queryset.values_list(field).annotate(n=Count("pk")).order_by())
+
+    # 선택지는 메모리 색인처럼 전체 모듈 기준 (건수 0 포함, pk순 첫 등장 순서)
+    typeCounts = {}
+    labels = {}
+    for moduleType, category, categoryKo in ApiModule.objects.order_by("pk").values_list(
+        "moduleType", "category", "categoryKo",
+    ):
+        typeCounts.setdefault(moduleType, 0)
+        labels.setdefault(category, categoryKo)
+    typeCounts.update(grouped("moduleType", base.filter(categoryQ, lifecycleQ)))
+    categoryCounts = dict.fromkeys(labels, 0)
+    categoryCounts.update(grouped("category", base.filter(typeQ, lifecycleQ)))
+    deprecated = base.filter(typeQ, categoryQ, deprecatedCount__gt=0).count()
+
+    result = base.filter(typeQ, categoryQ, lifecycleQ)
+    if sort is None:
+        result = result.order_by("pk")
+    else:
+        field, reverse = SORT_FIELDS.get(sort, SORT_FIELDS["name"])
+        result = result.order_by(f"-{field}", "-pk") if reverse else result.order_by(field, "pk")
+    return FacetCounts(
+        list(result.values_list("pk", flat=True)), typeCounts, categoryCounts, deprecated,
+        sorted(labels.items(), key=lambda item: (item[1], item[0])), version,
+    )
+
+
+def suggest(prefix, limit=8):
+    """검색어 자동완성 후보 Completion 목록 (접두어 trie, 워커 메모리)."""
+    return _getIndexState()[6].complete(prefix, limit)
+
+
+def searchModulePks(query):
+    """검색어에 매칭되는 모듈 pk (검색어가 없으면 None = 전체)와 FTS bm25 순서 pk (FTS일 때만)."""
+    if not query:
+        return None, None
+    if isStructuredQuery(query):
+        # 구조화 질의 (method:POST category:distribution -deprecated "체크인" op:post*)
+        return queryModules(query), None
+    if isKoreanQuery(query):
+        # 한글 검색어는 n-gram/초성 색인으로 조회 (부분 입력, "ㅊㅋㅇ" 등)
+        return matchKoreanModules(query), None
+    if fts.canSearch(query):
+        # FTS5 trigram 색인 (모듈 필드 + 엔드포인트 uri/operationId)
+        ftsRankedPks = fts.searchModules(query)
+        return ftsRankedPks, ftsRankedPks
+    # 2글자 이하(또는 FTS 미지원 DB): 엔드포인트에서 매칭되는 API ID 수집
+    epModuleIds = (
+        Endpoint.objects
+        .filter(Q(uri__icontains=query) | Q(operationId__icontains=query))
+        .values_list("apiModule_id", flat=True)
+        .distinct()
+    )
+    searchPks = list(
+        ApiModule.objects.filter(
+            Q(title__icontains=query)
+            | Q(titleKo__icontains=query)
+            | Q(description__icontains=query)
+            | Q(descriptionKo__icontains=query)
+            | Q(keywords__icontains=query)
+            | Q(operations__icontains=query)
+            | Q(pk__in=epModuleIds)
+        ).values_list("pk", flat=True)
+    )
+    return searchPks, None
+
+
+def listModules(query, rankQuery, typeFilter, categoryFilter, includeDeprecated, sort):
+    """(정렬된 모듈 pk, FacetCounts) - 검색 결과 × 필터를 메모리 비트맵으로 한 번에 계산."""
+    searchPks, ftsRankedPks = searchModulePks(query)
+    relevance = sort == "relevance" and rankQuery
+    facets = filterModules(
+        searchPks, typeFilter, categoryFilter, includeDeprecated, sort=None if relevance else sort,
+    )
+    if not relevance:
+        return facets.pks, facets
+    # BM25 점수순 pk 목록
+    if ftsRankedPks is not None:
+        allowed = set(facets.pks)
+        return [pk for pk in ftsRankedPks if pk in allowed], facets
+    return rankModules(rankQuery, facets.pks), facets
@@ -1,5 +1,9 @@
 """카탈로그 템플릿 태그/필터."""
+import re
+
 from django import template
+from django.utils.html import escape
+from django.utils.safestring import mark_safe
 
 register = template.Library()
 
@@ -30,3 +34,15 @@ def queryString(context, **kwargs):
         else:
             params[key] = value
     return f"?{params.urlencode()}" if params else ""
+
+
+@register.filter
+def highlight(text, query):
+    """text에서 query(대소문자 무시 부분 문자열)를 <mark>로 감싼 HTML."""
+    text = str(text)
+    if not query:
+        return escape(text)
+    parts = re.split(f"({re.escape(query)})", text, flags=re.IGNORECASE)
+    return mark_safe("".join(
+        f"<mark>{escape(part)}</mark>" if i % 2 else escape(part) for i, part in enumerate(parts)
+    ))
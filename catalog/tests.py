@@ -1,10 +1,33 @@
 """OHIP API 카탈로그 테스트."""
+import contextlib
+import importlib
+import io
 import json
+import multiprocessing
+import os
+import shutil
 import tempfile
+from unittest import mock
 
+from django.apps import apps
+from django.conf import settings
+from django.contrib import admin
 from django.core.management import call_command
-from django.test import TestCase, Client, override_settings
-from .models import ApiModule, Endpoint
+from django.db import connection
+from django.test import SimpleTestCase, TestCase, Client, override_settings
+from lib.ohip_search import (
+    Bm25Index, ConsolePrinter, EndpointHit, EndpointStore, KoreanIndex, OhipApiSearch, PrefixTrie, ReloadingSearch,
+    boundedLevenshtein, main, parseQuery, queryRecord, runBatch, serveStream,
+)
+from . import fts, views
+from .admin import EndpointAdmin
+from .api import encodeCursor
+from .cachebackend import SqliteLruCache
+from .caching import listCacheKey
+from .importing import InvalidRecord, iterJsonArray, iterRecordBatches, normalizeRecord
+from .models import ApiModule, DataVersion, Endpoint
+from .search import filterModules, resetIndex
+from .views import uriPrefix
 
 
 SAMPLE_DATA = [
@@ -49,15 +72,39 @@ SAMPLE_DATA = [
 ]
 
 
-def _loadSampleData():
+# 목록 결과 캐시는 실행마다 새 임시 디렉터리에 (실행 간/저장소 밖 공유 파일을 쓰지 않도록)
+TEST_CACHES = {
+    **settings.CACHES,
+    "search": {
+        **settings.CACHES["search"],
+        "LOCATION": os.path.join(tempfile.mkdtemp(), "search-cache.sqlite3"),
+    },
+}
+
+
+def _loadSampleData(data=None):
     """테스트용 샘플 데이터 JSON 파일 생성 후 임포트."""
     tmp = tempfile.NamedTemporaryFile(mode="w", suffix=".json", delete=False, encoding="utf-8")
-    json.dump(SAMPLE_DATA, tmp)
+    json.dump(SAMPLE_DATA if data is None else data, tmp)
     tmp.close()
     call_command("import_opera_apis", tmp.name, verbosity=0)
+    resetIndex()
     return tmp.name
 
 
+def _writeSampleDir(data=None, dataDir=None):
+    """샘플 데이터 JSON을 담은 데이터 디렉터리 생성."""
+    dataDir = dataDir or tempfile.mkdtemp()
+    with open(os.path.join(dataDir, "ohip-apis-ko.json"), "w", encoding="utf-8") as f:
+        json.dump(SAMPLE_DATA if data is None else data, f)
+    return dataDir
+
+
+def _sampleSearch():
+    """샘플 데이터 디렉터리로 OhipApiSearch 생성."""
+    return OhipApiSearch(_writeSampleDir())
+
+
 class ModelTest(TestCase):
     """모델 생성 및 관계 테스트."""
 
@@ -94,8 +141,148 @@ class ImportCommandTest(TestCase):
         self.assertEqual(ApiModule.objects.count(), 2)
         self.assertEqual(Endpoint.objects.count(), 4)
 
+    def test_importBumpsDataVersion(self):
+        """변경이 있을 때만 데이터 버전 갱신 (같은 파일 재임포트는 쓰기 없음)."""
+        _loadSampleData()
+        first = DataVersion.current()
+        updatedAt = ApiModule.objects.get(apiId=1).updatedAt
+        _loadSampleData()
+        self.assertTrue(first)
+        self.assertEqual(DataVersion.current(), first)
+        self.assertEqual(ApiModule.objects.get(apiId=1).updatedAt, updatedAt)
+
+    def test_incrementalImport(self):
+        """바뀐 모듈만 갱신, 엔드포인트는 추가/삭제/변경분만 반영."""
+        _loadSampleData()
+        first = DataVersion.current()
+        keptPk = Endpoint.objects.get(operationId="postReservation").pk
+        cashiering = ApiModule.objects.get(apiId=2).updatedAt
+        data = json.loads(json.dumps(SAMPLE_DATA))
+        data[0]["titleKo"] = "예약"
+        data[0]["endpoints"] = [
+            {"method": "POST", "uri": "/rsv/v1/reservations", "operationId": "postReservation", "deprecated": False},
+            {"method": "PUT", "uri": "/rsv/v1/reservations/{id}", "operationId": "putReservation", "deprecated": False},
+            {"method": "DELETE", "uri": "/rsv/v1/reservations/{id}", "operationId": "deleteReservation",
+             "deprecated": False},
+        ]
+        tmp = tempfile.NamedTemporaryFile(mode="w", suffix=".json", delete=False, encoding="utf-8")
+        json.dump(data, tmp)
+        tmp.close()
+        path = tmp.name
+        out = io.StringIO()
+        call_command("import_opera_apis", path, stdout=out)
+        self.assertIn("생성 0개, 수정 1개, 변경 없음 1개", out.getvalue())
+        self.assertIn("엔드포인트 추가 1개 / 삭제 1개 / 변경 1개", out.getvalue())
+        api = ApiModule.objects.get(apiId=1)
+        self.assertEqual((api.titleKo, api.endpointCount, api.deprecatedEndpointCount), ("예약", 3, 0))
+        self.assertTrue(Endpoint.objects.filter(pk=keptPk).exists())
+        self.assertEqual(ApiModule.objects.get(apiId=2).updatedAt, cashiering)
+        self.assertNotEqual(DataVersion.current(), first)
+        # 같은 파일 재임포트: 트랜잭션 안의 해시 조회 한 번뿐 (쓰기 없음)
+        with self.assertNumQueries(3):
+            call_command("import_opera_apis", path, stdout=io.StringIO())
+
+    def test_bulkImport(self):
+        """--bulk: 바뀐 모듈만 한 번에 upsert, 엔드포인트 재작성 (createdAt 유지)."""
+        path = _loadSampleData()
+        createdAt = ApiModule.objects.get(apiId=1).createdAt
+        data = json.loads(json.dumps(SAMPLE_DATA))
+        data[0]["titleKo"] = "예약"
+        data[0]["endpoints"] = data[0]["endpoints"][:1]
+        data.append({**SAMPLE_DATA[1], "id": 3, "title": "Profile"})
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(data, f)
+        out = io.StringIO()
+        call_command("import_opera_apis", path, "--bulk", stdout=out)
+        self.assertIn("생성 1개, 수정 1개, 변경 없음 1개, 엔드포인트 추가 2개 / 삭제 3개", out.getvalue())
+        self.assertIn("SQL ", out.getvalue())
+        api = ApiModule.objects.get(apiId=1)
+        self.assertEqual((api.titleKo, api.endpointCount, api.createdAt), ("예약", 1, createdAt))
+        self.assertEqual(Endpoint.objects.count(), 3)
+        self.assertEqual(ApiModule.objects.get(apiId=3).endpoints.get().operationId, "postBilling")
+        out = io.StringIO()
+        call_command("import_opera_apis", path, "--bulk", stdout=out)
+        self.assertIn("변경 없음 3개", out.getvalue())
+
+    def test_streamingReader(self):
+        """JSON 배열을 작은 읽기 단위로 나눠도 항목 단위로 그대로 읽음."""
+        raw = json.dumps(SAMPLE_DATA, ensure_ascii=False, indent=2).encode("utf-8")
+        items = [item for _, item in iterJsonArray(io.BytesIO(raw), readSize=7)]
+        self.assertEqual(items, SAMPLE_DATA)
+        self.assertEqual(list(iterJsonArray(io.BytesIO(b" [ ] "))), [])
+        with self.assertRaises(ValueError):
+            list(iterJsonArray(io.BytesIO(b'{"id": 1}')))
+        with self.assertRaises(ValueError):
+            list(iterJsonArray(io.BytesIO(b'[{"id": 1} {"id": 2}]')))
+        # 조각 경계에 걸친 단일 값/이스케이프
+        raw = json.dumps([-1.5e3, 'a"]}\\', {"x": ["}"]}, 12345]).encode("utf-8")
+        for readSize in (1, 2, 5):
+            self.assertEqual([item for _, item in iterJsonArray(io.BytesIO(raw), readSize=readSize)],
+                             [-1.5e3, 'a"]}\\', {"x": ["}"]}, 12345])
+
+    def test_streamingReaderRejectsEarly(self):
+        """괄호 짝 오류/너무 큰 항목은 배열 끝까지 읽지 않고 바로 ValueError."""
+        f = io.BytesIO(b'[{"id": [1}' + b" " * 100000 + b"]")
+        with self.assertRaisesMessage(ValueError, "괄호 짝"):
+            list(iterJsonArray(f, readSize=4))
+        self.assertLess(f.tell(), 100)
+        f = io.BytesIO(b'[{"title": "' + b"x" * 100000 + b'"}]')
+        with self.assertRaisesMessage(ValueError, "50자를 넘습니다"):
+            list(iterJsonArray(f, readSize=16, maxRecordSize=50))
+        self.assertLess(f.tell(), 100)
+        with self.assertRaisesMessage(ValueError, "닫히지 않았습니다"):
+            list(iterJsonArray(io.BytesIO(b'[{"id": 1}, {"id"'), readSize=4))
+
+    def test_batchedImportSkipsInvalid(self):
+        """배치/프로세스 풀 검증: 형식 오류 항목만 건너뛰고 나머지는 적재."""
+        data = [*SAMPLE_DATA, {"id": "x", "title": "Broken"}, {**SAMPLE_DATA[1], "id": 3, "endpoints": [
+            {"method": "FETCH", "uri": "/x", "operationId": "x"},
+        ]}]
+        tmp = tempfile.NamedTemporaryFile(mode="w", suffix=".json", delete=False, encoding="utf-8")
+        json.dump(data, tmp)
+        tmp.close()
+        out, err = io.StringIO(), io.StringIO()
+        call_command(
+            "import_opera_apis", tmp.name, "--batch-size", "1", "--workers", "2", "--strict", stdout=out, stderr=err,
+        )
+        self.assertEqual(ApiModule.objects.count(), 2)
+        self.assertEqual(Endpoint.objects.count(), 4)
+        self.assertIn("진행: 4개 (100%", out.getvalue())
+        self.assertIn("id: 정수가 아닙니다", err.getvalue())
+        self.assertIn("[3] endpoints: 알 수 없는 메서드 FETCH", err.getvalue())
+        self.assertIn("건너뛴 항목 2개", err.getvalue())
+
+    def test_spawnWorkersValidate(self):
+        """검증 모듈은 Django 없이 import되므로 spawn 방식 프로세스 풀에서도 동작."""
+        raw = json.dumps([*SAMPLE_DATA, {"id": "x"}]).encode("utf-8")
+        batches = list(iterRecordBatches(
+            io.BytesIO(raw), batchSize=2, workers=2, mpContext=multiprocessing.get_context("spawn"),
+        ))
+        results = [result for _, batch in batches for result in batch]
+        self.assertEqual([record.apiId for record, _ in results[:2]], [1, 2])
+        self.assertEqual(results[0][0], normalizeRecord(SAMPLE_DATA[0]))
+        self.assertEqual(results[2], (None, "id: 정수가 아닙니다"))
+
+    def test_lenientImportKeepsValues(self):
+        """--strict 없이는 기존 규칙대로 값을 그대로 적재 (적재할 수 없는 항목만 건너뜀)."""
+        data = [
+            {**SAMPLE_DATA[1], "title": " Cashiering ", "endpoints": [{"method": "fetch", "uri": "x"}]},
+            {"id": "x", "title": "Broken"},
+        ]
+        tmp = tempfile.NamedTemporaryFile(mode="w", suffix=".json", delete=False, encoding="utf-8")
+        json.dump(data, tmp)
+        tmp.close()
+        err = io.StringIO()
+        call_command("import_opera_apis", tmp.name, "--workers", "0", stdout=io.StringIO(), stderr=err)
+        api = ApiModule.objects.get(apiId=2)
+        self.assertEqual(api.title, " Cashiering ")
+        self.assertEqual(list(api.endpoints.values_list("method", "uri", "operationId")), [("fetch", "x", "")])
+        self.assertIn("건너뛴 항목 1개", err.getvalue())
+        with self.assertRaises(InvalidRecord):
+            normalizeRecord(data[0], strict=True)
+
 
-@override_settings(REQUIRE_LOGIN=True)
+@override_settings(REQUIRE_LOGIN=True, CACHES=TEST_CACHES)
 class LoginRequiredTest(TestCase):
     """REQUIRE_LOGIN=True 시 비인증 사용자 차단 테스트."""
 
@@ -130,7 +317,7 @@ class LoginRequiredTest(TestCase):
         self.assertEqual(resp.status_code, 200)
 
 
-@override_settings(REQUIRE_LOGIN=False)
+@override_settings(REQUIRE_LOGIN=False, CACHES=TEST_CACHES)
 class ListViewTest(TestCase):
     """목록 뷰 테스트."""
 
@@ -150,6 +337,172 @@ class ListViewTest(TestCase):
         self.assertEqual(resp.status_code, 200)
         self.assertContains(resp, "정산")
 
+    def test_searchChoseong(self):
+        """초성 검색어는 한글 색인으로 매칭."""
+        resp = self.client.get("/?q=ㅋㅅ")
+        self.assertEqual(resp.status_code, 200)
+        self.assertContains(resp, "정산")
+        self.assertNotContains(resp, "예약 관리")
+
+    def test_searchKoreanSkipsCategory(self):
+        """한글 색인은 titleKo/descriptionKo/keywords만 (카테고리 이름만 맞는 모듈은 제외)."""
+        resp = self.client.get("/", {"q": "자산"})
+        self.assertEqual(resp.context["page_obj"].paginator.count, 0)
+        self.assertEqual(KoreanIndex(SAMPLE_DATA).match("자산"), frozenset())
+
+    def test_searchPartialSyllable(self):
+        """입력 중인 음절(자모 분해)도 매칭."""
+        resp = self.client.get("/?q=예야")
+        self.assertContains(resp, "예약 관리")
+        self.assertNotContains(resp, "정산 관련")
+
+    def test_relevanceSortOptIn(self):
+        """기본 정렬은 검색어가 있어도 이름순, 관련도순은 sort=relevance로."""
+        resp = self.client.get("/?q=api")
+        self.assertEqual(resp.context["currentSort"], "name")
+        named = self.client.get("/?q=api&sort=name")
+        self.assertEqual([api.apiId for api in resp.context["page_obj"]], [api.apiId for api in named.context["page_obj"]])
+        resp = self.client.get("/?q=api&sort=relevance")
+        self.assertEqual(resp.context["currentSort"], "relevance")
+        self.assertEqual(resp.context["page_obj"].paginator.count, 2)
+        resp = self.client.get("/?q=api&sort=-ops")
+        self.assertEqual([api.apiId for api in resp.context["page_obj"]], [1, 2])
+
+    def test_searchFts(self):
+        """3글자 이상 검색어는 FTS5 trigram 색인 (모듈 필드 + 엔드포인트)."""
+        self.assertTrue(fts.ftsAvailable())
+        self.assertEqual(fts.searchModules("cashier"), [ApiModule.objects.get(apiId=2).pk])
+        resp = self.client.get("/", {"q": "billing"})
+        self.assertEqual([api.apiId for api in resp.context["page_obj"]], [2])
+        resp = self.client.get("/", {"q": "servation"})
+        self.assertEqual([api.apiId for api in resp.context["page_obj"]], [1])
+        resp = self.client.get("/", {"q": "Cloud 예약"})
+        self.assertEqual([api.apiId for api in resp.context["page_obj"]], [1])
+
+    def test_ftsTriggersFollowRows(self):
+        """FTS 색인은 트리거로 행 단위 동기화 (전체 재작성과 같은 내용)."""
+        def ftsRows():
+            with connection.cursor() as cursor:
+                cursor.execute(f"SELECT rowid, * FROM {fts.MODULE_TABLE} ORDER BY rowid")
+                modules = cursor.fetchall()
+                cursor.execute(f"SELECT rowid, * FROM {fts.ENDPOINT_TABLE} ORDER BY rowid")
+                return modules, cursor.fetchall()
+
+        synced = ftsRows()
+        fts.rebuildSearchIndex()
+        self.assertEqual(ftsRows(), synced)
+
+        cashiering = ApiModule.objects.get(apiId=2)
+        ep = Endpoint.objects.create(apiModule=cashiering, method="GET", uri="/csh/v1/folios", operationId="getFolio")
+        self.assertEqual(fts.searchEndpoints("folio"), [ep.pk])
+        self.assertEqual(fts.searchModules("folio"), [cashiering.pk])
+        ApiModule.objects.filter(apiId=1).update(keywords=["walkin"])
+        self.assertEqual(fts.searchModules("walkin"), [ApiModule.objects.get(apiId=1).pk])
+        ep.delete()
+        self.assertEqual(fts.searchEndpoints("folio"), [])
+
+    def test_adminDeleteRefreshesOnlyAffectedModule(self):
+        """관리자 수정은 바뀐 모듈의 통계/해시만 갱신."""
+        EndpointAdmin(Endpoint, admin.site).delete_queryset(
+            None, Endpoint.objects.filter(operationId="getReservation"),
+        )
+        reservation = ApiModule.objects.get(apiId=1)
+        cashiering = ApiModule.objects.get(apiId=2)
+        self.assertEqual((reservation.endpointCount, reservation.contentHash), (2, ""))
+        self.assertEqual(cashiering.endpointCount, 1)
+        self.assertNotEqual(cashiering.contentHash, "")
+        self.assertEqual(fts.searchEndpoints("getReservation"), [])
+
+    def test_structuredQuery(self):
+        """구조화 질의 (필드 조건 + 키워드)."""
+        resp = self.client.get("/", {"q": "method:PUT 예약"})
+        self.assertEqual([api.apiId for api in resp.context["page_obj"]], [1])
+        resp = self.client.get("/", {"q": "method:POST -deprecated"})
+        self.assertEqual([api.apiId for api in resp.context["page_obj"]], [2])
+        self.assertEqual(resp.context["currentSort"], "name")
+
+    def test_facetCounts(self):
+        """필터 선택지 건수는 현재 검색과 다른 facet 선택 기준."""
+        resp = self.client.get("/")
+        self.assertEqual(resp.context["typeChoices"], [("Operation", "API 모듈", 1), ("Step", "워크플로우", 1)])
+        self.assertEqual(resp.context["categoryChoices"], [("property", "호텔 (자산)", 2)])
+        self.assertEqual(resp.context["deprecatedModuleCount"], 1)
+        resp = self.client.get("/", {"type": "Operation", "category": "property"})
+        self.assertEqual(resp.context["page_obj"].paginator.count, 0)
+        self.assertEqual(resp.context["typeChoices"], [("Operation", "API 모듈", 0), ("Step", "워크플로우", 1)])
+        self.assertEqual(resp.context["deprecatedModuleCount"], 1)
+        resp = self.client.get("/", {"q": "ㅋㅅ"})
+        self.assertEqual(resp.context["categoryChoices"], [("property", "호텔 (자산)", 1)])
+        self.assertContains(resp, "워크플로우 <span class=\"text-muted small\">(1)</span>")
+
+    def _addModule(self):
+        module = ApiModule.objects.create(
+            apiId=3, title="Profile", titleKo="고객 프로필", moduleType="Operation",
+            moduleTypeKo="API 모듈", category="crm", categoryKo="고객",
+        )
+        DataVersion.bump()
+        return module
+
+    def test_rebuildSynchronousInTransaction(self):
+        """트랜잭션 안(테스트 포함)에서는 백그라운드 스레드 없이 바로 다시 만듦."""
+        self.client.get("/")
+        self._addModule()
+        with mock.patch("catalog.search._startRebuild") as startRebuild:
+            resp = self.client.get("/")
+        startRebuild.assert_not_called()
+        self.assertEqual(resp.context["page_obj"].paginator.count, 3)
+
+    def test_staleIndexFiltersFromDb(self):
+        """재생성 중(이전 버전 색인)에는 목록 필터/facet을 DB로 계산해 새 모듈도 포함."""
+        self.client.get("/")
+        fresh = filterModules(types=["Operation", "Step"], sort="-name")
+        module = self._addModule()
+        with mock.patch("catalog.search._startRebuild") as startRebuild, \
+                mock.patch.object(connection, "in_atomic_block", False):
+            stale = filterModules(types=["Operation", "Step"], sort="-name")
+            everything = filterModules(categories=["crm"], includeDeprecated=False)
+        startRebuild.assert_called()
+        self.assertEqual(stale.pks, fresh.pks + [module.pk])
+        self.assertEqual(stale.types, {"Operation": 2, "Step": 1})
+        self.assertEqual(stale.categories, {"property": 2, "crm": 1})
+        self.assertEqual(stale.deprecated, fresh.deprecated)
+        self.assertEqual(stale.categoryChoices, [("crm", "고객"), ("property", "호텔 (자산)")])
+        self.assertEqual(everything.pks, [module.pk])
+        self.assertEqual(everything.types, {"Operation": 1, "Step": 0})
+        resetIndex()
+        self.assertEqual(filterModules(types=["Operation", "Step"], sort="-name"), stale)
+
+    def test_listQueryCount(self):
+        """목록은 데이터 버전 확인(조건부 요청, 색인) + 현재 페이지 조회만 (필터/건수는 메모리 색인)."""
+        self.client.get("/")
+        with self.assertNumQueries(3):
+            self.client.get("/", {"type": "Step", "lifecycle": "deprecated", "sort": "-ops"})
+
+    def test_resultCacheSharedByKey(self):
+        """같은 검색 조건(파라미터 순서 무관)은 결과 캐시에서, 데이터 버전이 바뀌면 다시 계산."""
+        params = {"q": "ca", "type": ["Step", "Operation"], "lifecycle": "deprecated"}
+        first = self.client.get("/", params)
+        self.assertEqual([api.apiId for api in first.context["page_obj"]], [2])
+        # 버전 표식 + 현재 페이지 조회만 (LIKE 검색 쿼리 없음)
+        with self.assertNumQueries(2):
+            resp = self.client.get("/?lifecycle=deprecated&type=Operation&type=Step&q=ca")
+        self.assertEqual([api.apiId for api in resp.context["page_obj"]], [2])
+        self.assertEqual(resp.context["typeChoices"], first.context["typeChoices"])
+        ApiModule.objects.filter(apiId=1).update(title="Cashier Reservation")
+        DataVersion.bump()
+        resp = self.client.get("/", params)
+        self.assertEqual(sorted(api.apiId for api in resp.context["page_obj"]), [1, 2])
+
+    def test_resultCacheKeyIsolatesDatabases(self):
+        """마이그레이션이 DB마다 버전 토큰을 발급하고, 캐시 키에 DB 이름이 들어감 (다른 배포와 안 섞임)."""
+        DataVersion.objects.all().delete()
+        importlib.import_module("catalog.migrations.0008_seeddataversion").seedDataVersion(apps, None)
+        self.assertEqual(len(DataVersion.current()), 32)
+        params = (DataVersion.current(), "ca", [], [], [], "name")
+        key = listCacheKey(*params)
+        with mock.patch.dict(connection.settings_dict, NAME="/srv/other/db.sqlite3"):
+            self.assertNotEqual(listCacheKey(*params), key)
+
     def test_filterByType(self):
         resp = self.client.get("/?type=Step&lifecycle=deprecated")
         self.assertEqual(resp.status_code, 200)
@@ -162,6 +515,103 @@ class ListViewTest(TestCase):
         self.assertNotContains(resp, "예약 관리")
 
 
+@override_settings(REQUIRE_LOGIN=False)
+class EndpointSearchViewTest(TestCase):
+    """엔드포인트 단위 검색."""
+
+    def setUp(self):
+        _loadSampleData()
+        self.client = Client()
+
+    def test_searchEndpointsFts(self):
+        self.assertEqual(
+            fts.searchEndpoints("reservations/{"),
+            list(Endpoint.objects.filter(operationId="putReservation").values_list("pk", flat=True)),
+        )
+        resp = self.client.get("/endpoints/", {"q": "Reservation"})
+        self.assertEqual(resp.context["page_obj"].paginator.count, 3)
+        self.assertContains(resp, "get<mark>Reservation</mark>")
+        self.assertContains(resp, "/rsv/v1/<mark>reservation</mark>s")
+
+    def test_shortQueryAndEscaping(self):
+        resp = self.client.get("/endpoints/", {"q": "bi"})
+        self.assertEqual([ep.operationId for ep in resp.context["page_obj"]], ["postBilling"])
+        self.assertContains(resp, "/csh/v1/<mark>bi</mark>lling")
+        self.assertContains(resp, "정산")
+        Endpoint.objects.filter(operationId="postBilling").update(uri="/csh/v1/<b>billing")
+        resp = self.client.get("/endpoints/", {"q": "bi"})
+        self.assertContains(resp, "/csh/v1/&lt;b&gt;<mark>bi</mark>lling")
+
+
+@override_settings(REQUIRE_LOGIN=False)
+class ExportTest(TestCase):
+    """카탈로그 스트리밍 내보내기."""
+
+    def setUp(self):
+        _loadSampleData()
+        self.client = Client()
+
+    def _get(self, fmt):
+        resp = self.client.get("/api/v1/export", {"format": fmt})
+        self.assertTrue(resp.streaming)
+        return b"".join(resp.streaming_content).decode("utf-8")
+
+    def test_ndjson(self):
+        lines = [json.loads(line) for line in self._get("ndjson").splitlines()]
+        self.assertEqual([m["apiId"] for m in lines], [1, 2])
+        self.assertEqual([ep["operationId"] for ep in lines[1]["endpoints"]], ["postBilling"])
+        self.assertEqual(len(lines[0]["endpoints"]), 3)
+
+    def test_csvAndOpenApi(self):
+        rows = self._get("csv").splitlines()
+        self.assertEqual(len(rows), 5)
+        self.assertEqual(rows[-1], "2,Cashiering,정산,property,Step,POST,/csh/v1/billing,postBilling,False")
+        doc = json.loads(self._get("openapi"))
+        self.assertEqual(sorted(doc["paths"]["/rsv/v1/reservations"]), ["get", "post"])
+        self.assertTrue(doc["paths"]["/rsv/v1/reservations/{id}"]["put"]["deprecated"])
+        self.assertEqual(self.client.get("/api/v1/export", {"format": "xml"}).status_code, 400)
+
+    def test_exportCommand(self):
+        out = io.StringIO()
+        call_command("export_catalog", "--format", "ndjson", stdout=out)
+        self.assertEqual(len(out.getvalue().splitlines()), 2)
+
+
+@override_settings(REQUIRE_LOGIN=False, CACHES=TEST_CACHES)
+class ConditionalRequestTest(TestCase):
+    """데이터 버전 기반 ETag/Last-Modified/304."""
+
+    def setUp(self):
+        _loadSampleData()
+        self.client = Client()
+
+    def test_notModifiedUntilImport(self):
+        resp = self.client.get("/", {"q": "예약", "type": "Step"})
+        etag = resp["ETag"]
+        self.assertIn("public", resp["Cache-Control"])
+        self.assertTrue(resp.has_header("Last-Modified"))
+        # 파라미터 순서가 달라도 같은 ETag, 304는 버전 표식 한 행만 조회
+        with self.assertNumQueries(1):
+            resp = self.client.get("/?type=Step&q=예약", HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(resp.status_code, 304)
+        _loadSampleData([{**SAMPLE_DATA[0], "titleKo": "예약 변경"}, *SAMPLE_DATA[1:]])
+        resp = self.client.get("/?type=Step&q=예약", HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(resp.status_code, 200)
+        self.assertNotEqual(resp["ETag"], etag)
+
+    def test_etagDependsOnUserAndReferer(self):
+        etag = self.client.get("/api/1/")["ETag"]
+        self.assertEqual(self.client.get("/api/1/", HTTP_IF_NONE_MATCH=etag).status_code, 304)
+        resp = self.client.get("/api/1/", HTTP_IF_NONE_MATCH=etag, HTTP_REFERER="http://testserver/?q=x")
+        self.assertEqual(resp.status_code, 200)
+        from django.contrib.auth import get_user_model
+        get_user_model().objects.create_user(username="tester", password="testpass123")
+        self.client.login(username="tester", password="testpass123")
+        resp = self.client.get("/api/1/", HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(resp.status_code, 200)
+        self.assertIn("private", resp["Cache-Control"])
+
+
 @override_settings(REQUIRE_LOGIN=False)
 class DetailViewTest(TestCase):
     """상세 뷰 테스트."""
@@ -176,8 +626,539 @@ class DetailViewTest(TestCase):
         self.assertContains(resp, "예약 관리")
         self.assertContains(resp, "getReservation")
 
+    def test_endpointStatsMaterialized(self):
+        """임포트 시 메서드별/deprecated 엔드포인트 통계 저장, 상세는 버전 표식 + 모듈 1행 + 엔드포인트 1쿼리."""
+        api = ApiModule.objects.get(apiId=1)
+        self.assertEqual(api.endpointCount, 3)
+        self.assertEqual(api.methodCounts, {"GET": 1, "POST": 1, "PUT": 1})
+        self.assertEqual(api.deprecatedEndpointCount, 1)
+        self.assertEqual(api.methodSummary, [("GET", 1), ("POST", 1), ("PUT", 1)])
+        self.assertEqual(
+            api.prefixCounts, {"/rsv/v1/reservations": {"GET": [1, 0], "POST": [1, 0], "PUT": [1, 1]}},
+        )
+        with self.assertNumQueries(3):
+            resp = self.client.get("/api/1/")
+        self.assertContains(resp, "Deprecated (1)")
+        Endpoint.objects.filter(operationId="getReservation").delete()
+        ApiModule.refreshEndpointStats()
+        api.refresh_from_db()
+        self.assertEqual((api.endpointCount, api.methodSummary), (2, [("POST", 1), ("PUT", 1)]))
+        self.assertEqual(api.prefixCounts, {"/rsv/v1/reservations": {"POST": [1, 0], "PUT": [1, 1]}})
+
     def test_methodFilter(self):
         resp = self.client.get("/api/1/?method=GET")
         self.assertEqual(resp.status_code, 200)
         self.assertContains(resp, "getReservation")
         self.assertNotContains(resp, "postReservation")
+
+    def test_uriPrefixSections(self):
+        """경로 prefix 섹션: {param} 앞/세 세그먼트까지 묶고 섹션별 건수."""
+        self.assertEqual(uriPrefix("/rsv/v1/reservations/{id}"), "/rsv/v1/reservations")
+        self.assertEqual(uriPrefix("/rsv/v1/hotels/{hotelId}/rooms"), "/rsv/v1/hotels")
+        self.assertEqual(uriPrefix("/a/{x}"), "/a")
+        resp = self.client.get("/api/1/")
+        groups = resp.context["endpointGroups"]
+        self.assertEqual([g["prefix"] for g in groups], ["/rsv/v1/reservations"])
+        self.assertEqual(groups[0]["counts"], {"all": 3, "deprecated": 1, "GET": 1, "POST": 1, "PUT": 1})
+
+    def test_lazySections(self):
+        """INLINE_ENDPOINTS 초과 시 섹션 머리만 그리고 (엔드포인트 조회 없음) 행은 조각 URL로."""
+        with mock.patch.object(views, "INLINE_ENDPOINTS", 1):
+            with self.assertNumQueries(2):
+                resp = self.client.get("/api/1/")
+            self.assertNotContains(resp, "getReservation")
+            # 저장된 건수로 만든 섹션 = 행으로 만든 섹션 (method 필터별)
+            for methodFilter in ("all", "deprecated", "get", "PUT", "PATCH"):
+                lazy = self.client.get("/api/1/", {"method": methodFilter}).context["endpointGroups"]
+                with mock.patch.object(views, "INLINE_ENDPOINTS", 100):
+                    inline = self.client.get("/api/1/", {"method": methodFilter}).context["endpointGroups"]
+                self.assertEqual(
+                    [(g["prefix"], g["counts"]) for g in lazy], [(g["prefix"], g["counts"]) for g in inline],
+                )
+        self.assertContains(resp, "/api/1/endpoints/?prefix=/rsv/v1/reservations")
+        self.assertContains(resp, "/api/1/endpoints/?prefix=/rsv/v1/reservations")
+        resp = self.client.get("/api/1/endpoints/", {"prefix": "/rsv/v1/reservations", "method": "deprecated"})
+        self.assertContains(resp, "putReservation")
+        self.assertNotContains(resp, "getReservation")
+        self.assertEqual(self.client.get("/api/999/endpoints/").status_code, 404)
+
+
+@override_settings(REQUIRE_LOGIN=False, CACHES=TEST_CACHES)
+class JsonApiTest(TestCase):
+    """/api/v1 JSON API (keyset 커서, 필드 선택)."""
+
+    def setUp(self):
+        _loadSampleData()
+        self.client = Client()
+
+    def test_searchKeysetPages(self):
+        resp = self.client.get("/api/v1/search", {"limit": 1, "fields": "apiId,titleKo"})
+        data = resp.json()
+        self.assertEqual(data["results"], [{"apiId": 1, "titleKo": "예약 관리"}])
+        self.assertNotIn("count", data)
+        data = self.client.get("/api/v1/search", {"limit": 1, "fields": "apiId", "cursor": data["next"]}).json()
+        self.assertEqual((data["results"], data["next"]), ([{"apiId": 2}], None))
+        data = self.client.get("/api/v1/search", {"q": "정산", "sort": "-ops", "count": 1}).json()
+        self.assertEqual(([row["apiId"] for row in data["results"]], data["count"]), ([2], 1))
+
+    def test_searchPagesSliceCachedResult(self):
+        """검색 페이지는 캐시된 정렬 pk 목록을 잘라 페이지 행만 조회."""
+        for apiId, titleKo, ops in ((3, "가용 객실", 5), (4, "객실 배정", 1), (5, "하우스키핑", 3)):
+            ApiModule.objects.create(apiId=apiId, title=f"Module {apiId}", titleKo=titleKo, operationsCount=ops)
+        DataVersion.bump()
+        for sort in ("name", "-ops"):
+            full = [row["apiId"] for row in self.client.get("/api/v1/search", {"sort": sort}).json()["results"]]
+            paged = []
+            params = {"sort": sort, "limit": 2, "fields": "apiId"}
+            data = self.client.get("/api/v1/search", params).json()
+            paged += [row["apiId"] for row in data["results"]]
+            while data["next"]:
+                with self.assertNumQueries(2):
+                    data = self.client.get("/api/v1/search", {**params, "cursor": data["next"]}).json()
+                paged += [row["apiId"] for row in data["results"]]
+            self.assertEqual(paged, full)
+        self.assertEqual(full, [3, 5, 1, 4, 2])
+
+        # 목록에 없는 pk의 커서 (페이지 사이 데이터 변경)는 정렬 키 위치부터
+        cursor = encodeCursor(["name", "예약 관리", 10**6])
+        # 버전 표식 + 정렬 키 한 번 + 페이지 행 (탐색 단계마다 조회하지 않음)
+        with self.assertNumQueries(3):
+            data = self.client.get("/api/v1/search", {"cursor": cursor, "fields": "apiId"}).json()
+        self.assertEqual(data["results"], [{"apiId": 2}, {"apiId": 5}])
+        cursor = encodeCursor(["-ops", 3, 10**6])
+        data = self.client.get("/api/v1/search", {"sort": "-ops", "cursor": cursor, "fields": "apiId"}).json()
+        self.assertEqual(data["results"], [{"apiId": 5}, {"apiId": 1}, {"apiId": 4}, {"apiId": 2}])
+
+    def test_suggest(self):
+        """접두어 자동완성 (제목 → 키워드 → operationId, camelCase 단어/입력 중 음절)."""
+        data = self.client.get("/suggest", {"q": "res"}).json()
+        self.assertEqual(data["suggestions"][0], {"text": "Reservation", "kind": "title"})
+        self.assertIn({"text": "getReservation", "kind": "operationId"}, data["suggestions"])
+        texts = [s["text"] for s in self.client.get("/suggest", {"q": "예야"}).json()["suggestions"]]
+        self.assertEqual(texts, ["예약 관리", "예약"])
+        texts = [s["text"] for s in self.client.get("/suggest", {"q": "billi"}).json()["suggestions"]]
+        self.assertEqual(texts, ["postBilling"])
+        self.assertEqual(self.client.get("/suggest", {"q": " "}).json()["suggestions"], [])
+
+    def test_searchRejectsBadParams(self):
+        self.assertEqual(self.client.get("/api/v1/search", {"fields": "secret"}).status_code, 400)
+        self.assertEqual(self.client.get("/api/v1/search", {"cursor": "!!"}).status_code, 400)
+        cursor = self.client.get("/api/v1/search", {"limit": 1}).json()["next"]
+        resp = self.client.get("/api/v1/search", {"sort": "ops", "cursor": cursor})
+        self.assertEqual(resp.status_code, 400)
+
+    def test_tamperedCursorRejected(self):
+        """커서 값 타입이 정렬 필드와 맞지 않으면 400 (500 아님)."""
+        for values in (["name", 5, 1], ["name", "a", "1"], ["ops", "3", 1], ["ops", 3, True],
+                       ["ops", 3, 1 << 70], ["name", None, 1], ["name", ["a"], 1]):
+            with self.subTest(values=values):
+                resp = self.client.get("/api/v1/search", {"sort": values[0], "cursor": encodeCursor(values)})
+                self.assertEqual(resp.status_code, 400)
+        for values in (["endpoints", 1, "x", "x"], ["endpoints", 1, 1.5, 1.5]):
+            resp = self.client.get("/api/v1/modules/1/endpoints", {"cursor": encodeCursor(values)})
+            self.assertEqual(resp.status_code, 400)
+
+    def test_moduleEndpoints(self):
+        data = self.client.get("/api/v1/modules/1/endpoints", {"limit": 2, "count": 1}).json()
+        self.assertEqual([row["operationId"] for row in data["results"]], ["getReservation", "postReservation"])
+        self.assertEqual(data["count"], 3)
+        data = self.client.get("/api/v1/modules/1/endpoints", {"cursor": data["next"], "fields": "uri"}).json()
+        self.assertEqual(data, {"results": [{"uri": "/rsv/v1/reservations/{id}"}], "next": None})
+        data = self.client.get("/api/v1/modules/1/endpoints", {"deprecated": "true", "count": 1}).json()
+        self.assertEqual(data["count"], 1)
+        self.assertEqual(self.client.get("/api/v1/modules/99/endpoints").status_code, 404)
+
+
+class SqliteLruCacheTest(SimpleTestCase):
+    """SQLite LRU 캐시 백엔드 테스트."""
+
+    def _cache(self, **options):
+        location = os.path.join(tempfile.mkdtemp(), "cache.sqlite3")
+        return SqliteLruCache(location, {"OPTIONS": options})
+
+    def test_evictsLeastRecentlyUsed(self):
+        cache = self._cache(MAX_ENTRIES=2)
+        cache.set("a", 1)
+        cache.set("b", 2)
+        self.assertEqual(cache.get("a"), 1)
+        cache.set("c", 3)
+        self.assertEqual((cache.get("a"), cache.get("b"), cache.get("c")), (1, None, 3))
+        self.assertTrue(cache.touch("a"))
+        cache.set("d", 4)
+        self.assertEqual((cache.get("a"), cache.get("c"), cache.get("d")), (1, None, 4))
+
+    def test_sizeLimitAndExpiry(self):
+        cache = self._cache(MAX_ENTRIES=100, MAX_BYTES=2500)
+        for key in "abc":
+            cache.set(key, "x" * 1000)
+        self.assertEqual([cache.has_key(key) for key in "abc"], [False, True, True])
+        cache.set("gone", 1, timeout=0)
+        self.assertIsNone(cache.get("gone"))
+        self.assertFalse(cache.add("c", "y"))
+        self.assertTrue(cache.delete("c"))
+        self.assertTrue(cache.add("c", "y"))
+        self.assertEqual(cache.get("c"), "y")
+
+
+class OhipSearchIndexTest(SimpleTestCase):
+    """lib.ohip_search 역색인 검색 테스트."""
+
+    def setUp(self):
+        self.search = _sampleSearch()
+
+    def _ids(self, results):
+        return [api["id"] for api in results]
+
+    def test_findSubstring(self):
+        """토큰 일부(부분 문자열)로도 검색."""
+        self.assertEqual(self._ids(self.search.find("reserv")), [1])
+        self.assertEqual(self._ids(self.search.find("Billing")), [2])
+        self.assertEqual(self._ids(self.search.find("정산")), [2])
+
+    def test_findIntersectsTokens(self):
+        """부분 문자열 매칭이 없는 한글 검색어는 모든 단어를 포함하는 API만."""
+        self.assertEqual(self._ids(self.search.find("예약 booking")), [1])
+        self.assertEqual(self._ids(self.search.find("예약 cashier")), [])
+
+    def test_findBaselineParity(self):
+        """실제 데이터에서 기존 find(소문자 부분 문자열)와 같은 결과."""
+        dataDir = tempfile.mkdtemp()
+        shutil.copy(os.path.join(settings.BASE_DIR, "data", "ohip-apis-ko.json"), dataDir)
+        search = OhipApiSearch(dataDir, useSnapshot=False)
+        with open(os.path.join(dataDir, "ohip-apis-ko.json"), encoding="utf-8") as f:
+            apis = json.load(f)
+
+        def baselineFind(keyword):
+            keyword = keyword.lower()
+            fields = ("title", "titleKo", "description", "descriptionKo", "category", "categoryKo")
+            return [
+                api["id"] for api in apis
+                if any(keyword in value for value in
+                       [api.get(name, "").lower() for name in fields]
+                       + [k.lower() for k in api.get("keywords", [])]
+                       + [op.lower() for op in api.get("operations", [])])
+            ]
+
+        for keyword in ("guest profile", "check-in", "/", "예약", "체크인", "reservation",
+                        "RESERVATION", "getReservation", "rsv", "", ".", "api "):
+            with self.subTest(keyword=keyword):
+                self.assertEqual(self._ids(search.find(keyword)), baselineFind(keyword))
+
+    def test_findKoreanPartial(self):
+        """한글 bigram/초성/자모 색인 매칭."""
+        self.assertEqual(self._ids(self.search.find("약 관")), [1])
+        self.assertEqual(self._ids(self.search.find("ㅇㅇ")), [1])
+        self.assertEqual(self._ids(self.search.find("ㅋㅅ")), [2])
+        # 정산만 (카테고리 "호텔 (자산)"은 한글 색인 대상 아님)
+        self.assertEqual(self._ids(self.search.find("ㅈㅅ")), [2])
+        self.assertEqual(self._ids(self.search.find("캐셔")), [2])
+        self.assertEqual(self._ids(self.search.find("정사")), [2])
+
+    def test_byCategoryAndType(self):
+        self.assertEqual(self._ids(self.search.byCategory("호텔")), [1, 2])
+        self.assertEqual(self._ids(self.search.byType("워크플로우")), [2])
+        self.assertEqual(self._ids(self.search.byType("api")), [1])
+
+    def test_findOperation(self):
+        self.assertEqual(self._ids(self.search.findOperation("putres")), [1])
+
+    def test_resolvePath(self):
+        """실제 경로 → endpoint 템플릿 + path params."""
+        r = self.search.resolve("put", "/rsv/v1/reservations/R-100?fetch=1")
+        self.assertEqual(r["operationId"], "putReservation")
+        self.assertEqual(r["uri"], "/rsv/v1/reservations/{id}")
+        self.assertEqual(r["params"], {"id": "R-100"})
+        self.assertEqual(r["apiId"], 1)
+
+    def test_resolvePrefersStaticSegment(self):
+        self.assertEqual(self.search.resolve("GET", "/rsv/v1/reservations")["params"], {})
+        self.assertIsNone(self.search.resolve("DELETE", "/rsv/v1/reservations/1"))
+        self.assertIsNone(self.search.resolve("GET", "/rsv/v1/unknown/1"))
+
+    def test_bm25FieldWeights(self):
+        """title > description, 정확 일치 > 중간 일치."""
+        index = Bm25Index([
+            {"title": "Generate Block", "description": "block setup"},
+            {"title": "Report", "description": "rate report"},
+            {"title": "Rate Plan"},
+        ])
+        self.assertEqual([pos for _, pos in index.topK("rate")], [2, 1, 0])
+        self.assertEqual([pos for _, pos in index.topK("rate", k=1)], [2])
+
+    def test_rankReturnsScores(self):
+        results = self.search.rank("reservation")
+        self.assertEqual([api["id"] for _, api in results], [1])
+        self.assertGreater(results[0][0], 0)
+
+    def test_prefixTrieBeyondDepth(self):
+        """trie 깊이보다 긴 접두어는 깊이 노드 후보를 키로 걸러 반환."""
+        trie = PrefixTrie([("getReservation", "operationId", 1), ("getRates", "operationId", 1)], depth=4)
+        self.assertEqual([c.text for c in trie.complete("getR")], ["getRates", "getReservation"])
+        self.assertEqual([c.text for c in trie.complete("getRes")], ["getReservation"])
+        self.assertEqual([c.text for c in trie.complete("rat")], ["getRates"])
+
+    def test_parseQuery(self):
+        plan = parseQuery('method:GET,put -deprecated "예약 관리" OR op:post*')
+        self.assertEqual(len(plan), 2)
+        method, deprecated, text = plan[0]
+        self.assertEqual((method.field, method.values), ("method", ("GET", "put")))
+        self.assertEqual((deprecated.field, deprecated.negated), ("deprecated", True))
+        self.assertEqual(text.values, ("예약 관리",))
+        with self.assertRaises(ValueError):
+            parseQuery("foo:bar")
+
+    def test_structuredQuery(self):
+        """모듈/endpoint 조건 조합, 부정, OR."""
+        result = self.search.query("method:POST")
+        self.assertEqual([h.apiId for h in result.modules], [1, 2])
+        self.assertEqual([h.operationId for h in result.endpoints], ["postReservation", "postBilling"])
+        result = self.search.query("method:POST -deprecated")
+        self.assertEqual([h.apiId for h in result.modules], [2])
+
+        result = self.search.query("type:워크플로우 OR op:put*")
+        self.assertEqual([h.apiId for h in result.modules], [1, 2])
+        self.assertEqual([h.operationId for h in result.endpoints], ["putReservation", "postBilling"])
+
+        self.assertEqual(self.search.query("예약 -method:GET").endpoints[0].method, "POST")
+        self.assertEqual(self.search.query("-deprecated").modules[0].apiId, 2)
+        self.assertEqual(self.search.query("method:DELETE"), ([], []))
+
+    def test_didYouMean(self):
+        """오타 → operationId/제목 교정 후보."""
+        suggestions = self.search.didYouMean("getReservaton")
+        self.assertEqual(suggestions[0].text, "getReservation")
+        self.assertEqual(suggestions[0].distance, 1)
+        self.assertEqual(self.search.didYouMean("cashering")[0].kind, "title")
+        self.assertEqual(self.search.didYouMean("zzzzzzz"), [])
+
+    def test_boundedLevenshtein(self):
+        self.assertEqual(boundedLevenshtein("kitten", "sitting", 3), 3)
+        self.assertEqual(boundedLevenshtein("kitten", "sitting", 2), 3)
+        self.assertEqual(boundedLevenshtein("abc", "abcdef", 1), 2)
+
+
+class OhipSearchQueryApiTest(SimpleTestCase):
+    """출력 없는 generator 조회 API + 출력 계층 테스트."""
+
+    def setUp(self):
+        self.search = _sampleSearch()
+
+    def test_queriesDoNotPrint(self):
+        out = io.StringIO()
+        with contextlib.redirect_stdout(out):
+            self.search.find("예약")
+            self.search.findEndpoint("billing")
+            self.search.findByMethod("GET")
+            self.search.byCategory("property")
+            self.search.detail(1)
+        self.assertEqual(out.getvalue(), "")
+
+    def test_iterEndpointsYieldsRecords(self):
+        hits = self.search.iterByMethod("post")
+        first = next(hits)
+        self.assertIsInstance(first, EndpointHit)
+        self.assertEqual(first.operationId, "postReservation")
+        with self.assertRaises(AttributeError):
+            first.uri = "/changed"
+        self.assertEqual([h.apiId for h in hits], [2])
+
+    def test_listApiKeepsDictResults(self):
+        results = self.search.findEndpoint("billing")
+        self.assertEqual(results[0]["apiTitleKo"], "정산")
+        self.assertEqual(results[0]["method"], "POST")
+
+    def test_printerRendersHits(self):
+        out = io.StringIO()
+        ConsolePrinter(out).modules(self.search.iterFind("정산"), "정산")
+        self.assertIn("'정산' 검색 결과: 1건", out.getvalue())
+        self.assertIn("[  2] 정산 (Cashiering)", out.getvalue())
+
+
+class EndpointStoreTest(SimpleTestCase):
+    """endpoint 열 저장소 필터/통계 테스트."""
+
+    def setUp(self):
+        self.store = EndpointStore(SAMPLE_DATA)
+
+    def test_maskFilters(self):
+        self.assertEqual(list(self.store.select(method="post")), [1, 3])
+        self.assertEqual(list(self.store.select(deprecated=False, pos=0)), [0, 1])
+        self.assertEqual(list(self.store.select(method="PUT", deprecated=True)), [2])
+
+    def test_precomputedStats(self):
+        self.assertEqual(self.store.methodCounts, {"GET": 1, "POST": 2, "PUT": 1})
+        self.assertEqual(self.store.deprecatedCount, 1)
+        self.assertEqual(self.store.moduleStats[0], {
+            "endpoints": 3, "methodCounts": {"GET": 1, "POST": 1, "PUT": 1}, "deprecated": 1,
+        })
+
+    def test_stateRoundTrip(self):
+        restored = EndpointStore.fromState(self.store.toState())
+        self.assertEqual(restored.moduleEndpoints(0), SAMPLE_DATA[0]["endpoints"])
+        self.assertEqual(restored.moduleStats, self.store.moduleStats)
+
+    def test_manyModules(self):
+        """모듈 65536개 이상 + 대량 비트맵."""
+        apis = [
+            {"endpoints": [{"method": "GET", "uri": f"/m/{pos}", "deprecated": pos % 3 == 0}]}
+            for pos in range(70000)
+        ]
+        store = EndpointStore.fromState(EndpointStore(apis).toState())
+        self.assertEqual(store.moduleOf[69999], 69999)
+        self.assertEqual(store.deprecatedCount, 23334)
+        self.assertEqual(list(store.select(deprecated=True))[-2:], [69996, 69999])
+        self.assertEqual(store.methodCounts, {"GET": 70000})
+
+    def test_searchDetailAndStats(self):
+        search = _sampleSearch()
+        self.assertEqual(search.find("예약")[0]["endpoints"], SAMPLE_DATA[0]["endpoints"])
+        self.assertEqual(search.byCategory("호텔")[1]["endpoints"], SAMPLE_DATA[1]["endpoints"])
+        self.assertEqual(search.rank("정산")[0][1]["endpoints"], SAMPLE_DATA[1]["endpoints"])
+        detail = search.detail(1)
+        self.assertEqual(detail["endpoints"], SAMPLE_DATA[0]["endpoints"])
+        self.assertEqual(detail["endpointStats"]["deprecated"], 1)
+        stats = search.stats()
+        self.assertEqual((stats["endpoints"], stats["deprecatedEndpoints"]), (4, 1))
+
+
+class OhipSearchSnapshotTest(SimpleTestCase):
+    """색인 스냅샷 저장/검증/재생성 테스트."""
+
+    def setUp(self):
+        self.dataDir = _writeSampleDir()
+        self.dataPath = os.path.join(self.dataDir, "ohip-apis-ko.json")
+
+    def test_snapshotReused(self):
+        first = OhipApiSearch(self.dataDir)
+        self.assertFalse(first.fromSnapshot)
+        self.assertTrue(os.path.exists(os.path.join(self.dataDir, "ohip-apis-ko.snapshot")))
+
+        second = OhipApiSearch(self.dataDir)
+        self.assertTrue(second.fromSnapshot)
+        self.assertEqual(second.find("ㅋㅅ"), first.find("ㅋㅅ"))
+        self.assertEqual(second.rank("reservation"), first.rank("reservation"))
+        self.assertEqual(second.resolve("PUT", "/rsv/v1/reservations/7"), first.resolve("PUT", "/rsv/v1/reservations/7"))
+
+    def test_touchedButUnchangedSourceStillValid(self):
+        """mtime만 바뀌고 내용이 같으면 해시로 확인 후 재사용."""
+        OhipApiSearch(self.dataDir)
+        st = os.stat(self.dataPath)
+        os.utime(self.dataPath, ns=(st.st_atime_ns, st.st_mtime_ns + 10**9))
+        self.assertTrue(OhipApiSearch(self.dataDir).fromSnapshot)
+        # 헤더에 새 mtime을 기록해 두므로 다음부터는 해시하지 않음
+        with mock.patch("lib.ohip_search._fileDigest") as digest:
+            self.assertTrue(OhipApiSearch(self.dataDir).fromSnapshot)
+        digest.assert_not_called()
+
+    def test_staleSnapshotRebuilt(self):
+        OhipApiSearch(self.dataDir)
+        changed = [dict(SAMPLE_DATA[1], titleKo="캐셔링")]
+        _writeSampleDir(changed, self.dataDir)
+        search = OhipApiSearch(self.dataDir)
+        self.assertFalse(search.fromSnapshot)
+        self.assertEqual([api["titleKo"] for api in search.find("캐셔링")], ["캐셔링"])
+        self.assertTrue(OhipApiSearch(self.dataDir).fromSnapshot)
+
+    def test_lazyEndpointsLoadedOnDemand(self):
+        eager = OhipApiSearch(self.dataDir)
+        lazy = OhipApiSearch(self.dataDir, lazyEndpoints=True)
+        self.addCleanup(lazy.close)
+        self.assertEqual(lazy.find("예약"), eager.find("예약"))
+        self.assertEqual(lazy.detail(1), eager.detail(1))
+        self.assertEqual(lazy.stats(), eager.stats())
+        self.assertIsNone(lazy._endpointStore)
+
+        self.assertEqual(lazy.findEndpoint("reservations"), eager.findEndpoint("reservations"))
+        self.assertIsNotNone(lazy._endpointStore)
+        self.assertEqual(lazy.detail(2), eager.detail(2))
+
+    def test_reloadSwapsInstance(self):
+        """데이터 파일이 바뀌면 새 인스턴스로 교체, 이전 인스턴스는 그대로."""
+        holder = ReloadingSearch(self.dataDir)
+        old = holder.current
+        self.assertFalse(holder.reload())
+
+        _writeSampleDir([dict(SAMPLE_DATA[1], titleKo="캐셔링")], self.dataDir)
+        st = os.stat(self.dataPath)
+        os.utime(self.dataPath, ns=(st.st_atime_ns, st.st_mtime_ns + 10**9))
+        self.assertTrue(holder.reload())
+        self.assertIsNot(holder.current, old)
+        self.assertEqual(len(holder.find("캐셔링")), 1)
+        self.assertEqual(old.find("캐셔링"), [])
+
+    def test_reloadClosesRetiredSnapshot(self):
+        """교체된 lazy 인스턴스의 스냅샷 파일은 다음 확인 때 닫음."""
+        OhipApiSearch(self.dataDir)
+        holder = ReloadingSearch(self.dataDir, lazyEndpoints=True)
+        old = holder.current
+        self.assertIsNotNone(old._snapshot)
+
+        _writeSampleDir([dict(SAMPLE_DATA[1], titleKo="캐셔링")], self.dataDir)
+        st = os.stat(self.dataPath)
+        os.utime(self.dataPath, ns=(st.st_atime_ns, st.st_mtime_ns + 10**9))
+        self.assertTrue(holder.reload())
+        self.assertIsNotNone(old._snapshot)
+        self.assertFalse(holder.reload())
+        self.assertIsNone(old._snapshot)
+        holder.stop()
+        holder.close()
+
+    def test_lazyWithoutSnapshot(self):
+        """스냅샷이 없으면 만든 뒤 lazy 모드로 전환."""
+        lazy = OhipApiSearch(self.dataDir, lazyEndpoints=True)
+        self.addCleanup(lazy.close)
+        self.assertFalse(lazy.fromSnapshot)
+        self.assertIsNone(lazy._endpointStore)
+        eager = OhipApiSearch(self.dataDir)
+        self.assertEqual(lazy.detail(1), eager.detail(1))
+        self.assertEqual(lazy.resolve("PUT", "/rsv/v1/reservations/7"), eager.resolve("PUT", "/rsv/v1/reservations/7"))
+
+    def test_corruptSnapshotIgnored(self):
+        OhipApiSearch(self.dataDir)
+        with open(os.path.join(self.dataDir, "ohip-apis-ko.snapshot"), "r+b") as f:
+            f.truncate(40)
+        search = OhipApiSearch(self.dataDir)
+        self.assertFalse(search.fromSnapshot)
+        self.assertEqual(len(search.apis), 2)
+
+
+class OhipSearchBatchTest(SimpleTestCase):
+    """배치(NDJSON) / 상주 모드 테스트."""
+
+    def setUp(self):
+        self.search = _sampleSearch()
+
+    def test_queryRecord(self):
+        record = queryRecord(self.search, "--endpoint billing")
+        self.assertEqual(record["command"], "endpoint")
+        self.assertEqual(record["count"], 1)
+        self.assertEqual(record["results"][0]["operationId"], "postBilling")
+        self.assertIn("error", queryRecord(self.search, "--resolve GET"))
+
+        record = queryRecord(self.search, "--endpoint postBiling")
+        self.assertEqual(record["count"], 0)
+        self.assertEqual(record["suggestions"], ["postBilling"])
+
+    def test_runBatchWritesNdjson(self):
+        batch = tempfile.NamedTemporaryFile("w", suffix=".txt", delete=False, encoding="utf-8")
+        batch.write("정산\n# 주석\n\n--resolve PUT /rsv/v1/reservations/3\n")
+        batch.close()
+        out = io.StringIO()
+        self.assertEqual(runBatch(batch.name, out, search=self.search), 2)
+        lines = [json.loads(line) for line in out.getvalue().splitlines()]
+        self.assertEqual([r["apiId"] for r in lines[0]["results"]], [2])
+        self.assertEqual(lines[1]["result"]["params"], {"id": "3"})
+
+    def test_batchRejectsBadWorkers(self):
+        for value in ("x", "0"):
+            err = io.StringIO()
+            with contextlib.redirect_stderr(err):
+                self.assertEqual(main(["--batch", "-", "--workers", value]), 2)
+            self.assertIn("--workers", err.getvalue())
+
+    def test_serveStream(self):
+        out = io.StringIO()
+        serveStream(self.search, io.StringIO("ㅋㅅ\n--method GET\n"), out)
+        first, second = (json.loads(line) for line in out.getvalue().splitlines())
+        self.assertEqual(first["results"][0]["titleKo"], "정산")
+        self.assertEqual(second["count"], 1)
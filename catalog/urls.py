@@ -1,8 +1,14 @@
 """catalog URL configuration."""
 from django.urls import path
-from . import views
+from . import api, views
 
 urlpatterns = [
     path("", views.apiListView, name="api-list"),
     path("api/<int:apiId>/", views.apiDetailView, name="api-detail"),
+    path("api/<int:apiId>/endpoints/", views.apiEndpointFragmentView, name="api-endpoint-fragment"),
+    path("endpoints/", views.endpointSearchView, name="endpoint-search"),
+    path("suggest", api.suggestView, name="api-suggest"),
+    path("api/v1/search", api.searchApiView, name="api-v1-search"),
+    path("api/v1/export", api.exportView, name="api-v1-export"),
+    path("api/v1/modules/<int:apiId>/endpoints", api.moduleEndpointsApiView, name="api-v1-module-endpoints"),
 ]
@@ -1,34 +1,28 @@
 """OHIP API 카탈로그 뷰."""
+import json
+
 from django.core.paginator import Paginator
 from django.db.models import Q
 from django.shortcuts import get_object_or_404, render
 
-from .models import ApiModule, Endpoint
+from . import fts
+from .caching import cachedListResult, conditionalPage
+from .models import ApiModule, Endpoint, uriPrefix
+from .search import isStructuredQuery, listModules, queryText
+
+# 엔드포인트 검색 페이지당 행 수
+ENDPOINT_PAGE_SIZE = 50
+
+# 상세 페이지: 이 수 이하면 모든 섹션을 바로 그림 (초과 시 섹션을 펼칠 때 조각 로드)
+INLINE_ENDPOINTS = 100
 
 
+@conditionalPage()
 def apiListView(request):
     """API 목록 + 검색 + 필터."""
-    qs = ApiModule.objects.all()
-
-    # --- 검색 ---
     query = request.GET.get("q", "").strip()
-    if query:
-        # 엔드포인트에서 매칭되는 API ID 수집
-        epModuleIds = (
-            Endpoint.objects
-            .filter(Q(uri__icontains=query) | Q(operationId__icontains=query))
-            .values_list("apiModule_id", flat=True)
-            .distinct()
-        )
-        qs = qs.filter(
-            Q(title__icontains=query)
-            | Q(titleKo__icontains=query)
-            | Q(description__icontains=query)
-            | Q(descriptionKo__icontains=query)
-            | Q(keywords__icontains=query)
-            | Q(operations__icontains=query)
-            | Q(pk__in=epModuleIds)
-        )
+    # 관련도 정렬용 키워드 (구조화 질의는 키워드 부분만)
+    rankQuery = queryText(query) if query and isStructuredQuery(query) else query
 
     # 필터 파라미터가 하나라도 있으면 "사용자가 필터를 조작한 상태"
     hasFilterParams = any(
@@ -38,60 +32,56 @@ def apiListView(request):
     # --- 필터: Content Type ---
     allTypes = ["Operation", "Step"]
     selectedTypes = request.GET.getlist("type") if hasFilterParams else allTypes
+    typeFilter = None
     if selectedTypes and set(selectedTypes) != set(allTypes):
-        qs = qs.filter(moduleType__in=selectedTypes)
+        typeFilter = selectedTypes
 
-    # --- 필터: Category ---
-    allCategories = list(
-        ApiModule.objects.values_list("category", flat=True).distinct()
-    )
-    selectedCategories = request.GET.getlist("category") if hasFilterParams else allCategories
-    if selectedCategories and set(selectedCategories) != set(allCategories):
-        qs = qs.filter(category__in=selectedCategories)
+    # --- 필터: Category (전체 선택은 필터 없음과 같음) ---
+    selectedCategories = request.GET.getlist("category") if hasFilterParams else []
 
     # --- 필터: Lifecycle (deprecated 포함 여부) ---
     selectedLifecycle = request.GET.getlist("lifecycle") if hasFilterParams else ["deprecated"]
-    if "deprecated" not in selectedLifecycle:
-        qs = qs.filter(deprecatedCount=0)
 
-    # --- 정렬 ---
+    # --- 정렬 (관련도순은 sort=relevance를 고를 때만, 검색어가 없으면 이름순) ---
     currentSort = request.GET.get("sort", "name")
-    sortMap = {
-        "name": "titleKo",
-        "-name": "-titleKo",
-        "-ops": "-operationsCount",
-        "ops": "operationsCount",
-    }
-    orderBy = sortMap.get(currentSort, "titleKo")
-    qs = qs.order_by(orderBy)
 
-    # --- 페이지네이션 ---
-    paginator = Paginator(qs, 20)
-    page = request.GET.get("page")
-    pageObj = paginator.get_page(page)
+    # 같은 조건의 결과는 워커 공유 캐시에서 (데이터 버전이 바뀌면 키가 달라짐)
+    orderedPks, facets = cachedListResult(
+        request,
+        (query, selectedTypes, selectedCategories, selectedLifecycle, currentSort),
+        lambda: listModules(
+            query, rankQuery, typeFilter, selectedCategories or None,
+            "deprecated" in selectedLifecycle, currentSort,
+        ),
+    )
+    if not hasFilterParams:
+        selectedCategories = [val for val, _ in facets.categoryChoices]
+
+    # --- 페이지네이션 (정렬된 pk 목록을 나눈 뒤 현재 페이지만 조회) ---
+    paginator = Paginator(orderedPks, 20)
+    pageObj = paginator.get_page(request.GET.get("page"))
+    pageModules = ApiModule.objects.in_bulk(pageObj.object_list)
+    pageObj.object_list = [pageModules[pk] for pk in pageObj.object_list if pk in pageModules]
 
     # operation 미리보기 추가
     for api in pageObj:
         ops = api.operations or []
         api.previewOps = ops[:5]
 
-    # --- 필터 선택지 ---
+    # --- 필터 선택지 (현재 검색/다른 필터 기준 건수) ---
     typeChoices = [
-        ("Operation", "API 모듈"),
-        ("Step", "워크플로우"),
+        (val, label, facets.types.get(val, 0))
+        for val, label in (("Operation", "API 모듈"), ("Step", "워크플로우"))
     ]
-    categoryChoices = (
-        ApiModule.objects
-        .values_list("category", "categoryKo")
-        .distinct()
-        .order_by("categoryKo")
-    )
 
     context = {
         "page_obj": pageObj,
         "query": query,
         "typeChoices": typeChoices,
-        "categoryChoices": categoryChoices,
+        "categoryChoices": [
+            (val, label, facets.categories.get(val, 0)) for val, label in facets.categoryChoices
+        ],
+        "deprecatedModuleCount": facets.deprecated,
         "selectedTypes": selectedTypes,
         "selectedCategories": selectedCategories,
         "selectedLifecycle": selectedLifecycle,
@@ -100,41 +90,148 @@ def apiListView(request):
     return render(request, "catalog/list.html", context)
 
 
-def apiDetailView(request, apiId):
-    """API 상세 페이지."""
-    api = get_object_or_404(ApiModule, apiId=apiId)
-    endpoints = api.endpoints.all()
-
-    # 메서드 필터
-    methodFilter = request.GET.get("method", "all")
-    if methodFilter == "deprecated":
-        filteredEndpoints = endpoints.filter(deprecated=True)
-    elif methodFilter != "all":
-        filteredEndpoints = endpoints.filter(method=methodFilter.upper())
+@conditionalPage()
+def endpointSearchView(request):
+    """엔드포인트 단위 검색 (uri/operationId 매칭 행 + 하이라이트)."""
+    query = request.GET.get("q", "").strip()
+    if query and fts.canSearch(query):
+        # FTS5 trigram 색인 (bm25 점수순)
+        endpointPks = fts.searchEndpoints(query)
+    elif query:
+        # 2글자 이하(또는 FTS 미지원 DB)
+        endpointPks = list(
+            Endpoint.objects
+            .filter(Q(uri__icontains=query) | Q(operationId__icontains=query))
+            .order_by("pk")
+            .values_list("pk", flat=True)
+        )
     else:
-        filteredEndpoints = endpoints
+        endpointPks = []
+
+    # pk 목록으로 페이지를 나눈 뒤 현재 페이지 행만 소속 모듈과 함께 조회
+    paginator = Paginator(endpointPks, ENDPOINT_PAGE_SIZE)
+    pageObj = paginator.get_page(request.GET.get("page"))
+    pageEndpoints = (
+        Endpoint.objects
+        .select_related("apiModule")
+        .only(
+            "method", "uri", "operationId", "deprecated",
+            "apiModule", "apiModule__apiId", "apiModule__title", "apiModule__titleKo",
+        )
+        .in_bulk(pageObj.object_list)
+    )
+    pageObj.object_list = [pageEndpoints[pk] for pk in pageObj.object_list if pk in pageEndpoints]
+
+    context = {
+        "page_obj": pageObj,
+        "query": query,
+    }
+    return render(request, "catalog/endpoints.html", context)
+
 
-    # 메서드별 통계
-    methodSummary = []
-    for m in ["GET", "POST", "PUT", "DELETE", "HEAD", "PATCH"]:
-        cnt = endpoints.filter(method=m).count()
-        if cnt > 0:
-            methodSummary.append((m, cnt))
+@conditionalPage(varyHeaders=("Referer",))
+def apiDetailView(request, apiId):
+    """API 상세 페이지.
 
-    deprecatedEndpointCount = endpoints.filter(deprecated=True).count()
+    엔드포인트는 경로 prefix별 섹션으로 묶는다. 섹션 건수는 임포트 시 저장한 prefixCounts로
+    계산하고, 필터 결과가 INLINE_ENDPOINTS개 이하면 행을 읽어 모든 섹션을 바로 그린다.
+    그보다 많으면 엔드포인트 행을 읽지 않고 섹션 머리(건수)만 그린 뒤 펼칠 때
+    apiEndpointFragmentView로 행을 가져온다. method 파라미터는 JS 없이 쓰는 서버 필터다.
+    """
+    api = get_object_or_404(ApiModule, apiId=apiId)
+    methodFilter = request.GET.get("method", "all")
+    groups = _groupCounts(api.prefixCounts or {}, methodFilter)
+    if sum(group["count"] for group in groups) <= INLINE_ENDPOINTS:
+        rows = (
+            _filterEndpoints(api.endpoints.all(), methodFilter)
+            .order_by("uri", "method", "pk")
+            .values("method", "uri", "operationId", "deprecated")
+        )
+        groups = _groupEndpoints(rows, keepRows=True)
 
     # 뒤로가기 URL (검색/필터 상태 유지)
     backUrl = request.META.get("HTTP_REFERER", "/")
     if "/api/" in backUrl:
         backUrl = "/"
 
+    # 메서드별/deprecated 통계는 임포트 시 계산해 둔 값 (COUNT 쿼리 없음)
     context = {
         "api": api,
-        "endpoints": filteredEndpoints,
-        "endpointCount": endpoints.count(),
-        "methodSummary": methodSummary,
+        "endpointGroups": groups,
+        "endpointCount": api.endpointCount,
+        "methodSummary": api.methodSummary,
         "methodFilter": methodFilter,
-        "deprecatedEndpointCount": deprecatedEndpointCount,
+        "deprecatedEndpointCount": api.deprecatedEndpointCount,
         "backUrl": backUrl,
     }
     return render(request, "catalog/detail.html", context)
+
+
+@conditionalPage()
+def apiEndpointFragmentView(request, apiId):
+    """상세 페이지 섹션 본문 (prefix 경로의 엔드포인트 행 HTML 조각)."""
+    api = get_object_or_404(ApiModule.objects.only("pk"), apiId=apiId)
+    prefix = request.GET.get("prefix", "")
+    endpoints = _filterEndpoints(api.endpoints.all(), request.GET.get("method", "all"))
+    if prefix:
+        endpoints = endpoints.filter(Q(uri=prefix) | Q(uri__startswith=prefix.rstrip("/") + "/"))
+    rows = [
+        row
+        for row in endpoints.order_by("uri", "method", "pk").values("method", "uri", "operationId", "deprecated")
+        if not prefix or uriPrefix(row["uri"]) == prefix
+    ]
+    return render(request, "catalog/endpoint_rows.html", {"endpoints": rows})
+
+
+def _filterEndpoints(endpoints, methodFilter):
+    """method 파라미터 (all / deprecated / HTTP 메서드) 적용."""
+    if methodFilter == "deprecated":
+        return endpoints.filter(deprecated=True)
+    if methodFilter != "all":
+        return endpoints.filter(method=methodFilter.upper())
+    return endpoints
+
+
+def _groupEndpoints(rows, keepRows):
+    """uri순 엔드포인트 행 → prefix별 섹션 목록 (건수: 전체/메서드별/deprecated)."""
+    groups = {}
+    for row in rows:
+        prefix = uriPrefix(row["uri"])
+        group = groups.get(prefix)
+        if group is None:
+            group = groups[prefix] = {"prefix": prefix, "counts": {"all": 0, "deprecated": 0}, "rows": []}
+        counts = group["counts"]
+        counts["all"] += 1
+        counts[row["method"]] = counts.get(row["method"], 0) + 1
+        counts["deprecated"] += bool(row["deprecated"])
+        if keepRows:
+            group["rows"].append(row)
+    return _finishGroups(groups.values(), keepRows)
+
+
+def _groupCounts(prefixCounts, methodFilter):
+    """저장된 prefixCounts → method 필터를 적용한 섹션 목록 (행 없음, _groupEndpoints와 같은 건수)."""
+    method = None if methodFilter in ("all", "deprecated") else methodFilter.upper()
+    groups = []
+    for prefix, methods in prefixCounts.items():
+        counts = {"all": 0, "deprecated": 0}
+        for name, (total, deprecated) in methods.items():
+            if method is not None and name != method:
+                continue
+            count = deprecated if methodFilter == "deprecated" else total
+            if count:
+                counts["all"] += count
+                counts["deprecated"] += deprecated
+                counts[name] = count
+        if counts["all"]:
+            groups.append({"prefix": prefix, "counts": counts})
+    return _finishGroups(groups, keepRows=False)
+
+
+def _finishGroups(groups, keepRows):
+    for group in groups:
+        group["count"] = group["counts"]["all"]
+        group["countsJson"] = json.dumps(group["counts"])
+        if not keepRows:
+            group["rows"] = None
+    return sorted(groups, key=lambda group: group["prefix"])
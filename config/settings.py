@@ -18,6 +18,9 @@ ALLOWED_HOSTS = [
 # 사내용 로그인 필수 여부
 REQUIRE_LOGIN = os.environ.get("REQUIRE_LOGIN", "True").lower() in ("true", "1", "yes")
 
+# 데이터 변경 후 검색 색인을 요청 처리 중 동기로 재생성 (기본: 백그라운드 스레드)
+SEARCH_INDEX_SYNC_REBUILD = os.environ.get("SEARCH_INDEX_SYNC_REBUILD", "False").lower() in ("true", "1", "yes")
+
 INSTALLED_APPS = [
     "django.contrib.admin",
     "django.contrib.auth",
@@ -67,6 +70,26 @@ DATABASES = {
     }
 }
 
+# 목록 검색 결과 캐시: gunicorn 워커끼리 공유하는 SQLite 파일 LRU 캐시 (키에 DB 이름/데이터 버전 포함)
+# 기본 위치는 배포(체크아웃)마다 따로 두도록 BASE_DIR 아래
+CACHES = {
+    "default": {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+    },
+    "search": {
+        "BACKEND": "catalog.cachebackend.SqliteLruCache",
+        "LOCATION": os.path.join(
+            os.environ.get("SEARCH_CACHE_DIR", BASE_DIR / ".search-cache"),
+            "search-cache.sqlite3",
+        ),
+        "TIMEOUT": int(os.environ.get("SEARCH_CACHE_TIMEOUT", "3600")),
+        "OPTIONS": {
+            "MAX_ENTRIES": int(os.environ.get("SEARCH_CACHE_MAX_ENTRIES", "2000")),
+            "MAX_BYTES": int(os.environ.get("SEARCH_CACHE_MAX_BYTES", str(64 << 20))),
+        },
+    },
+}
+
 AUTH_PASSWORD_VALIDATORS = [
     {"NAME": "django.contrib.auth.password_validation.UserAttributeSimilarityValidator"},
     {"NAME": "django.contrib.auth.password_validation.MinimumLengthValidator"},
@@ -7,34 +7,1461 @@ Oracle Hospitality Integration Platform API를 한글로 검색할 수 있는 
 
     search = OhipApiSearch()
 
+    # 모듈 메타데이터만 먼저 읽고 endpoint는 필요할 때 로드
+    search = OhipApiSearch(lazyEndpoints=True)
+
     # 한글 키워드로 검색
     results = search.find("예약")
     results = search.find("체크인")
     results = search.find("정산")
 
+    # 초성 검색 / 입력 중인 음절
+    results = search.find("ㅊㅋㅇ")     # 체크인
+    results = search.find("체크이")     # 체크인
+
+    # 관련도순 상위 5개 (점수, API)
+    results = search.rank("체크인", k=5)
+
     # 카테고리별 조회
     results = search.byCategory("유통")
 
     # API 타입별 조회
     results = search.byType("워크플로우")  # 또는 "API 모듈"
 
-    # 전체 목록 출력
-    search.listAll()
+    # 결과 레코드 지연 생성 (출력 없음)
+    for hit in search.iterFind("예약"):
+        print(hit.apiId, hit.titleKo)
+    for ep in search.iterByMethod("GET"):
+        print(ep.uri, ep.operationId)
+
+    # 구조화 질의 (모듈 + endpoint)
+    result = search.query('method:POST category:distribution -deprecated op:post*')
+
+    # 오타 교정 후보 (did you mean)
+    for s in search.didYouMean("getReservaton"):
+        print(s.text, s.kind, s.distance)
 
     # 특정 API 상세 조회
-    search.detail(1)
+    api = search.detail(1)
+
+    # 콘솔 출력 (CLI 표시 계층)
+    printer = ConsolePrinter()
+    printer.modules(search.iterFind("정산"), "정산")
+    printer.detail(api, 1)
+    search.listAll()
 """
 
+import fnmatch
+import functools
+import gc
+import hashlib
+import heapq
+import importlib.util
 import json
+import marshal
+import math
+import mmap
 import os
+import re
+import shlex
+import struct
+import sys
+import threading
+import unicodedata
+from array import array
+from collections import Counter
 from pathlib import Path
-from typing import Optional
+from typing import Callable, Iterable, Iterator, NamedTuple, Optional, TextIO
+from urllib.parse import unquote, urlsplit
+
+
+# 단어 토큰 (한글/영문/숫자) 및 camelCase 분리 패턴
+_WORD_PATTERN = re.compile(r"\w+")
+_CAMEL_PATTERN = re.compile(r"[A-Z]+(?![a-z])|[A-Z]?[a-z]+|\d+")
+
+# 키워드 검색 대상 필드 (keywords/operations 배열은 별도 처리)
+_TEXT_FIELDS = ("title", "titleKo", "description", "descriptionKo", "category", "categoryKo")
+
+# 한글 부분 검색 대상 필드 (keywords 배열은 별도 처리)
+_KOREAN_FIELDS = ("titleKo", "descriptionKo")
+
+# BM25 랭킹 필드: (이름, 원본 키, 가중치) - title > keywords > operations > description
+_RANK_FIELDS = (
+    ("title", ("title", "titleKo"), 3.0),
+    ("keywords", ("keywords",), 2.0),
+    ("operations", ("operations",), 1.5),
+    ("description", ("description", "descriptionKo"), 1.0),
+)
+_BM25_K1 = 1.2
+_BM25_B = 0.75
+# 검색어로 시작하는 term(예: "reserv" → "reservation"), 중간에 포함하는 term
+# (예: "rate" → "generate")의 가중치. 정확 일치는 1.0
+_PREFIX_TERM_WEIGHT = 0.5
+_INFIX_TERM_WEIGHT = 0.1
+
+# 색인 스냅샷 파일 헤더: 매직, 포맷 버전, 파이썬 바이트코드 매직(marshal 호환),
+# 원본 크기, 원본 mtime(ns), 원본 SHA-1, 본문 전체 길이, payload 길이
+# 본문 = payload + 구역(section)들. 구역은 필요할 때 따로 읽는다
+_SNAPSHOT_MAGIC = b"OHIPIDX\0"
+_SNAPSHOT_VERSION = 6
+_SNAPSHOT_HEADER = struct.Struct("<8sH4sQq20sQQ")
+_SNAPSHOT_SUFFIX = ".snapshot"
+
+# term 부분 문자열 조회 결과 캐시 상한
+_TERM_CACHE_LIMIT = 4096
+
+# 타입 검색어 별칭 (한글/약칭 → 영문 타입)
+_TYPE_ALIASES = {
+    "api 모듈": "operation", "모듈": "operation", "api": "operation",
+    "워크플로우": "step", "workflow": "step", "플로우": "step"
+}
+
+# 구조화 질의 필드 이름(별칭 포함) → 조건 종류. method/op/uri는 endpoint 조건
+_QUERY_FIELDS = {
+    "method": "method", "op": "op", "operation": "op", "operationid": "op",
+    "uri": "uri", "path": "uri", "category": "category", "cat": "category",
+    "type": "type", "id": "id",
+}
+_ENDPOINT_FIELDS = frozenset(("method", "op", "uri"))
+_QUERY_TOKEN_PATTERN = re.compile(r'(-?)(?:(\w+):)?(?:"([^"]*)"|(\S+))')
+
+# 한글 음절/자모 (유니코드 한글 음절 = 초성 19 x 중성 21 x 종성 28)
+_HANGUL_BASE = 0xAC00
+_HANGUL_LAST = 0xD7A3
+_CHOSEONG = "ㄱㄲㄴㄷㄸㄹㅁㅂㅃㅅㅆㅇㅈㅉㅊㅋㅌㅍㅎ"
+_JUNGSEONG = "ㅏㅐㅑㅒㅓㅔㅕㅖㅗㅘㅙㅚㅛㅜㅝㅞㅟㅠㅡㅢㅣ"
+_JONGSEONG = ("", "ㄱ", "ㄲ", "ㄳ", "ㄴ", "ㄵ", "ㄶ", "ㄷ", "ㄹ", "ㄺ", "ㄻ", "ㄼ", "ㄽ", "ㄾ",
+              "ㄿ", "ㅀ", "ㅁ", "ㅂ", "ㅄ", "ㅅ", "ㅆ", "ㅇ", "ㅈ", "ㅊ", "ㅋ", "ㅌ", "ㅍ", "ㅎ")
+
+# NFKC는 호환 자모(ㅊ)를 조합형 자모(U+110E)로 바꾸므로 다시 호환 자모로 되돌린다
+_JAMO_TO_COMPAT = {
+    ord(unicodedata.normalize("NFKC", chr(c))): chr(c)
+    for c in range(0x3131, 0x3164)
+    if unicodedata.normalize("NFKC", chr(c)) != chr(c)
+}
+
+
+def _nfkc(text: str) -> str:
+    return unicodedata.normalize("NFKC", text or "").translate(_JAMO_TO_COMPAT)
+
+
+def normalizeText(text: str) -> str:
+    """검색용 정규화 (NFKC + 소문자, 한글 자모는 호환 자모로 유지)"""
+    return _nfkc(text).lower()
+
+
+def hasHangul(text: str) -> bool:
+    """한글 음절 또는 자모 포함 여부"""
+    return any(_HANGUL_BASE <= ord(ch) <= _HANGUL_LAST or "ㄱ" <= ch <= "ㅣ" for ch in text)
+
+
+def isChoseongQuery(text: str) -> bool:
+    """초성(자음)만으로 이루어진 검색어인지 여부 (예: "ㅊㅋㅇ")"""
+    text = text.replace(" ", "")
+    return bool(text) and all(ch in _CHOSEONG for ch in text)
+
+
+def choseongOf(text: str) -> str:
+    """한글 음절을 초성으로 변환 ("체크인" → "ㅊㅋㅇ"). 그 외 문자는 유지"""
+    out = []
+    for ch in text:
+        code = ord(ch) - _HANGUL_BASE
+        if 0 <= code <= _HANGUL_LAST - _HANGUL_BASE:
+            out.append(_CHOSEONG[code // 588])
+        else:
+            out.append(ch)
+    return "".join(out)
+
+
+def decomposeJamo(text: str) -> str:
+    """한글 음절을 초/중/종성 자모열로 분해 ("인" → "ㅇㅣㄴ"). 그 외 문자는 유지"""
+    out = []
+    for ch in text:
+        code = ord(ch) - _HANGUL_BASE
+        if 0 <= code <= _HANGUL_LAST - _HANGUL_BASE:
+            out.append(_CHOSEONG[code // 588])
+            out.append(_JUNGSEONG[(code % 588) // 28])
+            out.append(_JONGSEONG[code % 28])
+        else:
+            out.append(ch)
+    return "".join(out)
+
+
+def tokenize(text: str) -> list:
+    """정규화된 단어 토큰 목록. camelCase 단어는 전체 + 구성 단어를 함께 반환"""
+    tokens = []
+    for word in _WORD_PATTERN.findall(_nfkc(text)):
+        tokens.append(word.lower())
+        parts = _CAMEL_PATTERN.findall(word)
+        if len(parts) > 1:
+            tokens.extend(part.lower() for part in parts)
+    return tokens
+
+
+def _trigrams(term: str) -> set:
+    return {term[i:i + 3] for i in range(len(term) - 2)}
+
+
+def _pack(ids: Iterable[int]) -> bytes:
+    """정수 posting list → 정렬된 uint32 바이트열 (스냅샷 저장용)"""
+    return array("I", sorted(ids)).tobytes()
+
+
+def _unpack(data: bytes) -> array:
+    ids = array("I")
+    ids.frombytes(data)
+    return ids
+
+
+class _TermIndex:
+    """정규화된 term → 모듈 위치 posting list
+
+    정확 일치는 dict 조회 한 번, 부분 문자열 조회는 term trigram으로
+    후보 term을 좁힌 뒤 검증한다 (2글자 이하는 어휘 목록에서 검증).
+    스냅샷에서 복원하면 posting list는 packed 바이트로 두고 처음 조회할 때 푼다.
+    """
+
+    def __init__(self):
+        self.postings = {}
+        self._trigramTerms = {}
+        self._cache = {}
+
+    def add(self, term: str, pos: int):
+        if term:
+            self.postings.setdefault(term, set()).add(pos)
+
+    def freeze(self):
+        """빌드 완료 후 posting list 고정 및 trigram 색인 생성"""
+        self.postings = {term: frozenset(ids) for term, ids in self.postings.items()}
+        trigramTerms = {}
+        for term in self.postings:
+            for gram in _trigrams(term):
+                trigramTerms.setdefault(gram, []).append(term)
+        self._trigramTerms = trigramTerms
+        self._cache = {}
+
+    def toState(self) -> tuple:
+        vocab = list(self.postings)
+        termIds = {term: i for i, term in enumerate(vocab)}
+        return (
+            vocab,
+            [_pack(self.get(term)) for term in vocab],
+            {gram: _pack(termIds[t] for t in self._gramTerms(gram)) for gram in self._trigramTerms},
+        )
+
+    @classmethod
+    def fromState(cls, state: tuple) -> "_TermIndex":
+        index = cls()
+        index._vocab, packed, index._trigramTerms = state
+        index.postings = dict(zip(index._vocab, packed))
+        return index
+
+    def get(self, term: str) -> frozenset:
+        """정확히 일치하는 term의 posting list"""
+        posting = self.postings.get(term, frozenset())
+        if isinstance(posting, bytes):
+            posting = self.postings[term] = frozenset(_unpack(posting))
+        return posting
+
+    def _gramTerms(self, gram: str) -> list:
+        terms = self._trigramTerms.get(gram, ())
+        if isinstance(terms, bytes):
+            terms = self._trigramTerms[gram] = [self._vocab[i] for i in _unpack(terms)]
+        return terms
+
+    def termsContaining(self, sub: str) -> list:
+        """sub를 부분 문자열로 포함하는 term 목록"""
+        if len(sub) < 3:
+            return [term for term in self.postings if sub in term]
+
+        grams = sorted(_trigrams(sub), key=lambda g: len(self._gramTerms(g)))
+        return [term for term in self._gramTerms(grams[0]) if sub in term]
+
+    def containing(self, sub: str) -> frozenset:
+        """sub를 포함하는 모든 term의 posting list 합집합"""
+        cached = self._cache.get(sub)
+        if cached is not None:
+            return cached
+
+        result = frozenset().union(*(self.get(term) for term in self.termsContaining(sub)))
+        if len(self._cache) >= _TERM_CACHE_LIMIT:
+            self._cache.clear()
+        self._cache[sub] = result
+        return result
+
+
+class _NgramIndex:
+    """문자 unigram/bigram → 모듈 위치 posting list
+
+    bigram 교집합으로 후보를 구한 뒤 모듈별 원문에서 부분 문자열을 검증한다.
+    원문은 단어 단위로 줄바꿈 연결해 단어 경계를 넘는 매칭을 막는다.
+    """
+
+    def __init__(self):
+        self.grams = {}
+        self.texts = {}
+
+    def add(self, pos: int, words: Iterable[str]):
+        words = [w for w in words if w]
+        if not words:
+            return
+        previous = self.texts.get(pos)
+        self.texts[pos] = "\n".join([previous, *words] if previous else words)
+        for word in words:
+            for i, ch in enumerate(word):
+                self.grams.setdefault(ch, set()).add(pos)
+                if i + 1 < len(word):
+                    self.grams.setdefault(word[i:i + 2], set()).add(pos)
+
+    def freeze(self):
+        self.grams = {gram: frozenset(ids) for gram, ids in self.grams.items()}
+
+    def toState(self) -> tuple:
+        return ({gram: _pack(self._gram(gram)) for gram in self.grams}, self.texts)
+
+    @classmethod
+    def fromState(cls, state: tuple) -> "_NgramIndex":
+        index = cls()
+        index.grams, index.texts = state
+        return index
+
+    def _gram(self, gram: str) -> frozenset:
+        posting = self.grams.get(gram, frozenset())
+        if isinstance(posting, bytes):
+            posting = self.grams[gram] = frozenset(_unpack(posting))
+        return posting
+
+    def match(self, query: str) -> frozenset:
+        """query를 부분 문자열로 포함하는 모듈 위치 집합"""
+        if len(query) <= 2:
+            return self._gram(query)
+
+        postings = sorted((self._gram(query[i:i + 2]) for i in range(len(query) - 1)), key=len)
+        candidates = postings[0]
+        for posting in postings[1:]:
+            if not candidates:
+                return frozenset()
+            candidates = candidates & posting
+        return frozenset(pos for pos in candidates if query in self.texts[pos])
+
+
+class KoreanIndex:
+    """한글 부분 검색 색인
+
+    - syllables: 음절 bigram (예: "체크" → 체크인/체크아웃)
+    - jamo: 자모 분해 bigram, 입력 중인 음절 매칭 (예: "체크이" → 체크인)
+    - choseong: 초성 bigram (예: "ㅊㅋㅇ" → 체크인)
+
+    records는 titleKo/descriptionKo/keywords 키를 가진 dict 목록이며,
+    결과는 records 내 위치(0부터)의 집합이다. categoryKo는 넣지 않는다 (카테고리는
+    카테고리 필터로 고르고, 흔한 카테고리 이름이 검색어면 카테고리 전체가 걸림).
+    """
+
+    def __init__(self, records: Iterable[dict]):
+        self.syllables = _NgramIndex()
+        self.jamo = _NgramIndex()
+        self.choseong = _NgramIndex()
+
+        for pos, record in enumerate(records):
+            values = [record.get(field) or "" for field in _KOREAN_FIELDS]
+            values.extend(record.get("keywords") or [])
+            words = [w for value in values for w in _WORD_PATTERN.findall(normalizeText(value))]
+            self.syllables.add(pos, words)
+            self.jamo.add(pos, [decomposeJamo(w) for w in words])
+            self.choseong.add(pos, [choseongOf(w) for w in words if hasHangul(w)])
+
+        for index in (self.syllables, self.jamo, self.choseong):
+            index.freeze()
+
+    def toState(self) -> tuple:
+        return (self.syllables.toState(), self.jamo.toState(), self.choseong.toState())
+
+    @classmethod
+    def fromState(cls, state: tuple) -> "KoreanIndex":
+        index = cls.__new__(cls)
+        index.syllables, index.jamo, index.choseong = (_NgramIndex.fromState(part) for part in state)
+        return index
+
+    def matchToken(self, token: str) -> frozenset:
+        """단어 하나의 부분 매칭. 초성 검색어는 초성 색인, 음절 매칭이 없으면 자모 색인"""
+        token = normalizeText(token)
+        if isChoseongQuery(token):
+            return self.choseong.match(token)
+        result = self.syllables.match(token)
+        if not result:
+            result = self.jamo.match(decomposeJamo(token))
+        return result
+
+    def match(self, query: str) -> frozenset:
+        """검색어의 모든 단어를 부분 매칭하는 위치 집합 (단어별 교집합)"""
+        words = _WORD_PATTERN.findall(normalizeText(query))
+        if not words:
+            return frozenset()
+        result = None
+        for word in words:
+            posting = self.matchToken(word)
+            result = posting if result is None else result & posting
+            if not result:
+                break
+        return result
+
+
+class Bm25Index:
+    """필드 가중 BM25 (BM25F) 랭킹 색인
+
+    생성 시 필드별 term frequency, 필드 길이 정규화 계수를 미리 계산한다.
+    검색어 토큰은 어휘에서 그 토큰을 포함하는 term으로 확장되며
+    (정확 일치 1.0, 접두 일치/중간 일치는 낮은 가중치), 토큰 단위로 idf를 매긴다.
+    records는 title/titleKo/description/descriptionKo/keywords/operations 키를 가진
+    dict 목록이며 결과 위치는 records 내 위치다.
+    """
+
+    def __init__(self, records: Iterable[dict]):
+        self.terms = _TermIndex()
+        self._tf = [{} for _ in _RANK_FIELDS]
+        lengths = [[] for _ in _RANK_FIELDS]
+
+        self.size = 0
+        for pos, record in enumerate(records):
+            self.size += 1
+            for f, (_, keys, _) in enumerate(_RANK_FIELDS):
+                tokens = []
+                for key in keys:
+                    value = record.get(key) or ""
+                    for text in (value if isinstance(value, list) else [value]):
+                        tokens.extend(tokenize(text))
+                lengths[f].append(len(tokens))
+                for term, count in Counter(tokens).items():
+                    self._tf[f].setdefault(term, {})[pos] = count
+                    self.terms.add(term, pos)
+        self.terms.freeze()
+
+        # 필드 가중치 / (1 - b + b * 길이 / 평균 길이)
+        self._norms = []
+        for f, (_, _, weight) in enumerate(_RANK_FIELDS):
+            avg = (sum(lengths[f]) / len(lengths[f]) if lengths[f] else 0) or 1.0
+            self._norms.append(array("d", (
+                weight / (1 - _BM25_B + _BM25_B * length / avg) for length in lengths[f]
+            )))
+
+    def toState(self) -> tuple:
+        # term frequency는 (위치, tf) 쌍을 이어 붙인 uint32 바이트열로 저장
+        tf = [
+            {term: array("I", [n for item in sorted(freqs.items()) for n in item]).tobytes()
+             for term, freqs in ((term, self._termFreqs(f, term)) for term in fieldTf)}
+            for f, fieldTf in enumerate(self._tf)
+        ]
+        return (self.size, self.terms.toState(), tf, [norms.tobytes() for norms in self._norms])
+
+    @classmethod
+    def fromState(cls, state: tuple) -> "Bm25Index":
+        index = cls.__new__(cls)
+        index.size, terms, index._tf, norms = state
+        index.terms = _TermIndex.fromState(terms)
+        index._norms = []
+        for data in norms:
+            fieldNorms = array("d")
+            fieldNorms.frombytes(data)
+            index._norms.append(fieldNorms)
+        return index
+
+    def _termFreqs(self, f: int, term: str) -> dict:
+        """필드 f에서 term의 위치 → tf"""
+        freqs = self._tf[f].get(term)
+        if freqs is None:
+            return {}
+        if isinstance(freqs, bytes):
+            pairs = _unpack(freqs)
+            freqs = self._tf[f][term] = dict(zip(pairs[::2], pairs[1::2]))
+        return freqs
+
+    def _expand(self, token: str) -> list:
+        """검색어 토큰 → (어휘 term, 가중치) 목록"""
+        expanded = []
+        for term in self.terms.termsContaining(token):
+            if term == token:
+                expanded.append((term, 1.0))
+            elif term.startswith(token):
+                expanded.append((term, _PREFIX_TERM_WEIGHT))
+            else:
+                expanded.append((term, _INFIX_TERM_WEIGHT))
+        return expanded
+
+    def scores(self, query: str, candidates: Optional[frozenset] = None) -> dict:
+        """위치 → BM25 점수. candidates가 있으면 그 위치만 계산"""
+        result = {}
+        for token in set(tokenize(query)):
+            df = len(self.terms.containing(token))
+            if not df:
+                continue
+            idf = math.log(1 + (self.size - df + 0.5) / (df + 0.5))
+
+            weighted = {}
+            for term, termWeight in self._expand(token):
+                for f, norms in enumerate(self._norms):
+                    for pos, tf in self._termFreqs(f, term).items():
+                        if candidates is None or pos in candidates:
+                            weighted[pos] = weighted.get(pos, 0.0) + termWeight * tf * norms[pos]
+
+            for pos, tf in weighted.items():
+                result[pos] = result.get(pos, 0.0) + idf * tf * (_BM25_K1 + 1) / (_BM25_K1 + tf)
+        return result
+
+    def topK(self, query: str, k: int = 10, candidates: Optional[frozenset] = None) -> list:
+        """상위 k개 (점수, 위치) 목록. 동점은 위치 순"""
+        scores = self.scores(query, candidates)
+        pool = candidates if candidates is not None else scores.keys()
+        return heapq.nsmallest(k, ((scores.get(pos, 0.0), pos) for pos in pool),
+                               key=lambda item: (-item[0], item[1]))
+
+
+class RouteTrie:
+    """HTTP 메서드별 URI 세그먼트 trie
+
+    "/ars/v1/profiles/{profileId}/aging" 같은 템플릿을 세그먼트 단위로 저장하고,
+    실제 경로("/ars/v1/profiles/12345/aging")를 경로 깊이에 비례하는 시간에 매칭한다.
+    정적 세그먼트를 {param} 와일드카드보다 먼저 시도하고, 막히면 되돌아간다.
+    노드는 번호로 관리하며 (정적 자식 dict, {param} 자식, 종단 route) 를 평면 목록에 둔다.
+    """
+
+    def __init__(self):
+        self._roots = {}
+        self._static = []
+        self._param = []
+        self._routes = {}
+
+    def _newNode(self) -> int:
+        self._static.append({})
+        self._param.append(-1)
+        return len(self._static) - 1
+
+    @staticmethod
+    def _segments(path: str) -> list:
+        if "://" in path:
+            path = urlsplit(path).path
+        path = path.split("?", 1)[0].split("#", 1)[0]
+        return [seg for seg in path.split("/") if seg]
+
+    def add(self, method: str, template: str, value):
+        """템플릿 등록. 같은 메서드+템플릿은 value를 누적"""
+        method = method.upper()
+        node = self._roots.get(method)
+        if node is None:
+            node = self._roots[method] = self._newNode()
+
+        paramNames = []
+        for seg in self._segments(template):
+            if seg.startswith("{") and seg.endswith("}"):
+                paramNames.append(seg[1:-1])
+                child = self._param[node]
+                if child < 0:
+                    child = self._param[node] = self._newNode()
+            else:
+                child = self._static[node].get(seg)
+                if child is None:
+                    child = self._static[node][seg] = self._newNode()
+            node = child
+
+        routes = self._routes.setdefault(node, [])
+        for route in routes:
+            if route[0] == template:
+                route[2].append(value)
+                return
+        routes.append((template, paramNames, [value]))
+
+    def toState(self) -> tuple:
+        return (self._roots, self._static, array("i", self._param).tobytes(), self._routes)
+
+    @classmethod
+    def fromState(cls, state: tuple) -> "RouteTrie":
+        trie = cls()
+        trie._roots, trie._static, param, trie._routes = state
+        trie._param = array("i")
+        trie._param.frombytes(param)
+        return trie
+
+    def match(self, method: str, path: str) -> Optional[tuple]:
+        """(템플릿, path params dict, 등록된 value 목록) 또는 None"""
+        root = self._roots.get(method.upper())
+        if root is None:
+            return None
+        segments = self._segments(path)
+        found = self._walk(root, segments, 0, [])
+        if found is None:
+            return None
+        (template, paramNames, values), paramValues = found
+        params = {name: unquote(value) for name, value in zip(paramNames, paramValues)}
+        return template, params, values
+
+    def _walk(self, node: int, segments: list, depth: int, paramValues: list):
+        if depth == len(segments):
+            routes = self._routes.get(node)
+            return (routes[0], paramValues) if routes else None
+
+        seg = segments[depth]
+        child = self._static[node].get(seg)
+        if child is not None:
+            found = self._walk(child, segments, depth + 1, paramValues)
+            if found is not None:
+                return found
+        child = self._param[node]
+        if child >= 0:
+            return self._walk(child, segments, depth + 1, paramValues + [seg])
+        return None
+
+
+def boundedLevenshtein(a: str, b: str, limit: int) -> int:
+    """편집 거리 (limit을 넘으면 limit + 1)
+
+    대각선에서 limit 이내 칸만 계산하고, 한 행의 최솟값이 limit을 넘으면 바로 끝낸다.
+    """
+    if abs(len(a) - len(b)) > limit:
+        return limit + 1
+    if len(a) > len(b):
+        a, b = b, a
+    over = limit + 1
+    prev = [i if i <= limit else over for i in range(len(a) + 1)]
+    for j, cb in enumerate(b, 1):
+        cur = [over] * (len(a) + 1)
+        cur[0] = rowMin = j if j <= limit else over
+        for i in range(max(1, j - limit), min(len(a), j + limit) + 1):
+            cost = min(prev[i] + 1, cur[i - 1] + 1, prev[i - 1] + (a[i - 1] != cb))
+            cur[i] = cost if cost < over else over
+            if cost < rowMin:
+                rowMin = cost
+        if rowMin > limit:
+            return over
+        prev = cur
+    return prev[-1]
+
+
+class Suggestion(NamedTuple):
+    """오타 교정 후보 (did you mean)"""
+
+    text: str
+    kind: str
+    distance: int
+
+
+class FuzzyIndex:
+    """오타 허용 문자열 색인 (operationId/제목/키워드의 "did you mean" 후보)
+
+    문자열 양끝을 공백으로 채운 trigram을 (trigram, 문자열 길이)별 posting으로 색인한다.
+    편집 한 번은 trigram을 최대 3개 바꾸므로 거리 d 이내 문자열은 길이 차이가 d 이하이고
+    검색어 trigram 중 (개수 - 3d)개 이상을 공유한다. 길이 범위 안의 posting만 세어 후보를
+    거른 뒤 거리 상한을 둔 Levenshtein으로 확인한다 (전체 문자열을 편집 거리로 훑지 않음).
+    """
+
+    def __init__(self, entries: Iterable[tuple] = ()):
+        """
+        Args:
+            entries: (문자열, 종류) 목록. 정규화 결과가 같은 문자열은 처음 것만 색인
+        """
+        self.texts = []
+        self.kinds = []
+        self.keys = []
+        self._grams = {}
+        seen = set()
+        for text, kind in entries:
+            key = normalizeText(text)
+            if not key or key in seen:
+                continue
+            seen.add(key)
+            textId = len(self.texts)
+            self.texts.append(text)
+            self.kinds.append(kind)
+            self.keys.append(key)
+            for gram in self._paddedGrams(key):
+                self._grams.setdefault((gram, len(key)), []).append(textId)
+
+    @staticmethod
+    def _paddedGrams(key: str) -> set:
+        return _trigrams(f"  {key} ")
+
+    @staticmethod
+    def defaultDistance(length: int) -> int:
+        """검색어 길이별 허용 거리 (6자 이하 1, 그 이상 2)"""
+        return 1 if length <= 6 else 2
+
+    def toState(self) -> tuple:
+        return (self.texts, self.kinds, self.keys,
+                {slot: _pack(ids) for slot, ids in self._grams.items()})
+
+    @classmethod
+    def fromState(cls, state: tuple) -> "FuzzyIndex":
+        index = cls()
+        index.texts, index.kinds, index.keys, index._grams = state
+        return index
+
+    def _posting(self, slot: tuple) -> Iterable[int]:
+        posting = self._grams.get(slot, ())
+        if isinstance(posting, bytes):
+            posting = self._grams[slot] = _unpack(posting)
+        return posting
+
+    def suggest(self, query: str, limit: int = 5, maxDistance: Optional[int] = None) -> list:
+        """query와 편집 거리가 가까운 문자열 (거리, 문자열 순 Suggestion 목록)
+
+        3자 미만 검색어는 trigram으로 후보를 좁힐 수 없어 빈 목록을 반환한다.
+        """
+        key = normalizeText(query).strip()
+        if len(key) < 3:
+            return []
+        grams = self._paddedGrams(key)
+        maxDistance = self.defaultDistance(len(key)) if maxDistance is None else maxDistance
+        # 반복 문자 등으로 trigram이 적으면 필터가 성립하는 거리까지 낮춘다
+        while maxDistance and len(grams) < 3 * maxDistance + 1:
+            maxDistance -= 1
+
+        shared = Counter()
+        for length in range(len(key) - maxDistance, len(key) + maxDistance + 1):
+            for gram in grams:
+                shared.update(self._posting((gram, length)))
+        minShared = len(grams) - 3 * maxDistance
+
+        found = []
+        for textId, count in shared.items():
+            if count < minShared:
+                continue
+            candKey = self.keys[textId]
+            distance = boundedLevenshtein(key, candKey, maxDistance)
+            if distance <= maxDistance:
+                found.append((distance, candKey, textId))
+
+        found.sort()
+        return [Suggestion(self.texts[i], self.kinds[i], d) for d, _, i in found[:limit]]
+
+
+class Completion(NamedTuple):
+    """자동완성 후보 (typeahead)"""
+
+    text: str
+    kind: str
+
+
+class PrefixTrie:
+    """자동완성용 접두어 trie (제목/키워드/operationId)
+
+    문자열 전체와 단어(공백/camelCase) 시작 위치부터의 접미어를 정규화 후 한글 자모로
+    분해해 넣으므로 "reserv", "예야"(입력 중 음절), "관리"(둘째 단어)도 이어진다.
+    노드는 RouteTrie처럼 번호로 관리하고, 각 노드에 상위 limit개 후보 id를 미리 담아 두어
+    조회는 접두어 길이만큼 내려가는 것으로 끝난다. 후보는 (단어 중간 여부, priority,
+    길이, 문자열) 순으로 정렬한 뒤 차례로 넣어 노드별 목록이 자연히 순위순이 된다.
+    키는 앞 depth 글자(자모)까지만 넣고, 더 긴 접두어는 그 깊이 노드의 후보를 걸러 쓴다.
+    """
+
+    def __init__(self, entries: Iterable[tuple] = (), limit: int = 10, depth: int = 10):
+        """
+        Args:
+            entries: (문자열, 종류, priority) 목록. priority가 작을수록 앞. 정규화 결과가
+                같은 문자열은 처음 것만 사용
+            limit: 노드별로 보관하는 최대 후보 수 (complete()의 limit 상한)
+            depth: trie에 넣는 키 최대 길이
+        """
+        self.limit = limit
+        self.depth = depth
+        self.texts = []
+        self.kinds = []
+        # 자모 분해 키와 단어 시작 위치 (depth보다 긴 접두어 확인용)
+        self.keys = []
+        self.starts = []
+        self._children = [{}]
+        self._top = [[]]
+        keyed = []
+        seen = set()
+        for text, kind, priority in entries:
+            key, starts = self._keyStarts(text)
+            if not key or key in seen:
+                continue
+            seen.add(key)
+            textId = len(self.texts)
+            self.texts.append(text)
+            self.kinds.append(kind)
+            self.keys.append(key)
+            self.starts.append(starts)
+            for start in starts:
+                keyed.append((start > 0, priority, len(key) - start, key[start:start + depth], textId))
+        keyed.sort()
+        for _, _, _, suffix, textId in keyed:
+            self._insert(suffix, textId)
+
+    @staticmethod
+    def _keyStarts(text: str) -> tuple:
+        """(자모 분해 키, 공백/camelCase 단어 시작 위치 목록 - 키 기준, 0 포함)"""
+        text = _nfkc(text).strip()
+        wordStarts = {0}
+        for word in _WORD_PATTERN.finditer(text):
+            for part in _CAMEL_PATTERN.finditer(word.group()):
+                wordStarts.add(word.start() + part.start())
+            wordStarts.add(word.start())
+        parts = []
+        starts = []
+        offset = 0
+        for i, ch in enumerate(text):
+            if i in wordStarts:
+                starts.append(offset)
+            jamo = decomposeJamo(ch.lower())
+            parts.append(jamo)
+            offset += len(jamo)
+        return "".join(parts), starts
+
+    def _insert(self, key: str, textId: int):
+        node = 0
+        for ch in key:
+            child = self._children[node].get(ch)
+            if child is None:
+                child = self._children[node][ch] = len(self._children)
+                self._children.append({})
+                self._top.append([])
+            node = child
+            top = self._top[node]
+            if len(top) < self.limit and textId not in top:
+                top.append(textId)
+
+    def toState(self) -> tuple:
+        return (self.limit, self.depth, self.texts, self.kinds, self.keys, self.starts,
+                self._children, [array("I", top).tobytes() for top in self._top])
+
+    @classmethod
+    def fromState(cls, state: tuple) -> "PrefixTrie":
+        trie = cls()
+        (trie.limit, trie.depth, trie.texts, trie.kinds, trie.keys, trie.starts,
+         trie._children, top) = state
+        trie._top = [_unpack(ids) for ids in top]
+        return trie
+
+    def complete(self, prefix: str, limit: int = 8) -> list:
+        """prefix로 시작하는 (단어 포함) 상위 후보 Completion 목록"""
+        key = decomposeJamo(normalizeText(prefix).lstrip())
+        if not key:
+            return []
+        node = 0
+        for ch in key[:self.depth]:
+            node = self._children[node].get(ch)
+            if node is None:
+                return []
+        ids = self._top[node]
+        if len(key) > self.depth:
+            ids = [i for i in ids if any(self.keys[i].startswith(key, start) for start in self.starts[i])]
+        return [Completion(self.texts[i], self.kinds[i]) for i in ids[:limit]]
+
+
+def _iterBits(mask: int) -> Iterator[int]:
+    """비트마스크에서 켜진 비트 위치 (오름차순, 바이트열로 한 번 변환 후 64비트 단위로 순회)"""
+    data = mask.to_bytes((mask.bit_length() + 7) >> 3, "little")
+    for start in range(0, len(data), 8):
+        word = int.from_bytes(data[start:start + 8], "little")
+        base = start << 3
+        while word:
+            low = word & -word
+            yield base + low.bit_length() - 1
+            word ^= low
+
+
+def _bitmap(positions: Iterable[int], size: int) -> int:
+    """위치 목록 → int 비트맵 (bytearray에 모아 한 번에 변환, 비트 i = 위치 i)"""
+    packed = bytearray((size + 7) >> 3)
+    for i in positions:
+        packed[i >> 3] |= 1 << (i & 7)
+    return int.from_bytes(packed, "little")
+
+
+class EndpointStore:
+    """endpoint 열(column) 저장소
+
+    endpoint마다 dict를 두지 않고 속성별 배열에 보관한다 (endpoint 번호 i 공통).
+    - methodCodes: array('B') 메서드 코드 (methods 테이블 색인)
+    - uriIds/opIds: array('I') 중복 제거한 uris/operationIds 문자열 테이블 색인
+    - moduleOf: array('I') endpoint i가 속한 모듈 pos
+    - deprecated, methodMasks: 비트 i = endpoint i 인 int 비트맵
+    - offsets: 모듈 pos의 endpoint 범위 [offsets[pos], offsets[pos + 1])
+    메서드/deprecated/모듈 필터는 비트맵 연산으로 처리하고,
+    전체/모듈별 통계는 생성 시 한 번 계산해 둔다.
+    """
+
+    def __init__(self, apis: Iterable[dict] = ()):
+        self.methods = []
+        self.methodCodes = array("B")
+        self.uris = []
+        self.uriIds = array("I")
+        self.operationIds = []
+        self.opIds = array("I")
+        self.offsets = array("I", [0])
+        self.moduleOf = array("I")
+        self.deprecated = 0
+
+        deprecated = []
+        methodCode = {}
+        uriId = {}
+        opId = {}
+        for pos, api in enumerate(apis):
+            for ep in api.get("endpoints", []):
+                i = len(self.methodCodes)
+                method = ep.get("method", "")
+                code = methodCode.get(method)
+                if code is None:
+                    code = methodCode[method] = len(self.methods)
+                    self.methods.append(sys.intern(method))
+                self.methodCodes.append(code)
+                self.uriIds.append(self._intern(uriId, self.uris, ep.get("uri", "")))
+                self.opIds.append(self._intern(opId, self.operationIds, ep.get("operationId", "")))
+                self.moduleOf.append(pos)
+                if ep.get("deprecated", False):
+                    deprecated.append(i)
+            self.offsets.append(len(self.methodCodes))
+        self.deprecated = _bitmap(deprecated, len(self))
+        self._computeStats()
+
+    @staticmethod
+    def _intern(ids: dict, table: list, value: str) -> int:
+        stringId = ids.get(value)
+        if stringId is None:
+            stringId = ids[value] = len(table)
+            table.append(value)
+        return stringId
+
+    def _computeStats(self):
+        """메서드 비트맵과 전체/모듈별 통계 (생성/복원 시 1회)"""
+        packed = [bytearray((len(self) + 7) >> 3) for _ in self.methods]
+        for i, code in enumerate(self.methodCodes):
+            packed[code][i >> 3] |= 1 << (i & 7)
+        self.methodMasks = [int.from_bytes(bits, "little") for bits in packed]
+
+        self.methodCounts = {m: mask.bit_count() for m, mask in zip(self.methods, self.methodMasks)}
+        self.deprecatedCount = self.deprecated.bit_count()
+
+        # 모듈별 통계는 모듈 범위의 열을 직접 세어 endpoint 수에 비례하는 시간으로 계산
+        deprecatedBits = self.deprecated.to_bytes((len(self) + 7) >> 3, "little")
+        self.moduleStats = []
+        for pos in range(len(self.offsets) - 1):
+            start, end = self.offsets[pos], self.offsets[pos + 1]
+            codes = Counter(self.methodCodes[start:end])
+            self.moduleStats.append({
+                "endpoints": end - start,
+                "methodCounts": {self.methods[code]: codes[code] for code in sorted(codes)},
+                "deprecated": sum(deprecatedBits[i >> 3] >> (i & 7) & 1 for i in range(start, end)),
+            })
+
+    def __len__(self) -> int:
+        return len(self.methodCodes)
+
+    def moduleMask(self, pos: int) -> int:
+        """모듈 pos에 속한 endpoint 비트마스크"""
+        start, end = self.offsets[pos], self.offsets[pos + 1]
+        return ((1 << (end - start)) - 1) << start
+
+    def methodMask(self, method: str) -> int:
+        """HTTP 메서드(대소문자 무시)의 endpoint 비트마스크"""
+        method = method.upper()
+        mask = 0
+        for m, methodBits in zip(self.methods, self.methodMasks):
+            if m.upper() == method:
+                mask |= methodBits
+        return mask
+
+    def select(self, method: Optional[str] = None, deprecated: Optional[bool] = None,
+               pos: Optional[int] = None) -> Iterator[int]:
+        """조건을 모두 만족하는 endpoint 번호 (None인 조건은 무시)"""
+        mask = (1 << len(self)) - 1
+        if method is not None:
+            mask &= self.methodMask(method)
+        if deprecated is not None:
+            mask &= self.deprecated if deprecated else ~self.deprecated
+        if pos is not None:
+            mask &= self.moduleMask(pos)
+        return _iterBits(mask)
+
+    def search(self, keyword: str) -> Iterator[int]:
+        """URI 또는 operationId에 keyword(소문자 비교)를 포함하는 endpoint 번호
+
+        중복 제거한 문자열 테이블에서 먼저 찾고, 해당 문자열을 쓰는 endpoint만 고른다.
+        """
+        keyword = keyword.lower()
+        uriHits = {j for j, uri in enumerate(self.uris) if keyword in uri.lower()}
+        opHits = {j for j, op in enumerate(self.operationIds) if keyword in op.lower()}
+        for i in range(len(self)):
+            if self.uriIds[i] in uriHits or self.opIds[i] in opHits:
+                yield i
+
+    def method(self, i: int) -> str:
+        return self.methods[self.methodCodes[i]]
+
+    def uri(self, i: int) -> str:
+        return self.uris[self.uriIds[i]]
+
+    def operationId(self, i: int) -> str:
+        return self.operationIds[self.opIds[i]]
+
+    def isDeprecated(self, i: int) -> bool:
+        return bool(self.deprecated >> i & 1)
+
+    def endpoint(self, i: int) -> dict:
+        """endpoint i를 원본 JSON과 같은 dict로"""
+        return {
+            "method": self.method(i),
+            "uri": self.uri(i),
+            "operationId": self.operationId(i),
+            "deprecated": self.isDeprecated(i),
+        }
+
+    def moduleEndpoints(self, pos: int) -> list:
+        """모듈 pos의 endpoint dict 목록 (원본 순서)"""
+        return [self.endpoint(i) for i in range(self.offsets[pos], self.offsets[pos + 1])]
+
+    def toState(self) -> tuple:
+        return (
+            self.methods, self.methodCodes.tobytes(),
+            self.uris, self.uriIds.tobytes(),
+            self.operationIds, self.opIds.tobytes(),
+            self.offsets.tobytes(), self.moduleOf.tobytes(), self.deprecated,
+        )
+
+    @classmethod
+    def fromState(cls, state: tuple) -> "EndpointStore":
+        store = cls()
+        (store.methods, methodCodes, store.uris, uriIds,
+         store.operationIds, opIds, offsets, moduleOf, store.deprecated) = state
+        store.methodCodes = array("B", methodCodes)
+        store.uriIds = array("I")
+        store.uriIds.frombytes(uriIds)
+        store.opIds = array("I")
+        store.opIds.frombytes(opIds)
+        store.offsets = array("I")
+        store.offsets.frombytes(offsets)
+        store.moduleOf = array("I")
+        store.moduleOf.frombytes(moduleOf)
+        store._computeStats()
+        return store
+
+
+class QueryTerm(NamedTuple):
+    """구조화 질의 조건 하나"""
+
+    field: str  # "text", "deprecated" 또는 _QUERY_FIELDS 값
+    values: tuple
+    negated: bool
+
+
+@functools.lru_cache(maxsize=256)
+def parseQuery(text: str) -> tuple:
+    """구조화 질의 → 실행 계획 (OR로 묶인 AND 그룹 튜플, 그룹은 QueryTerm 튜플)
+
+    문법 (예: method:POST category:distribution -deprecated "체크인" op:post*):
+    - field:value - method, category(cat), type, op(operation), uri(path), id
+    - 값 목록은 쉼표로 나열(OR), '*'는 와일드카드 (없으면 부분 일치, method/id는 정확 일치)
+    - deprecated - deprecated 포함 여부 플래그, 앞에 '-'를 붙이면 부정
+    - 그 외 단어/"따옴표 구"는 키워드 검색, 대문자 OR은 AND 그룹 구분
+
+    Raises:
+        ValueError: 알 수 없는 필드, 값 없는 필드, 빈 질의
+    """
+    groups = [[]]
+    for m in _QUERY_TOKEN_PATTERN.finditer(text):
+        neg, field, quoted, bare = m.groups()
+        if bare == "OR" and not neg and field is None:
+            groups.append([])
+            continue
+        negated = bool(neg)
+        if field is not None:
+            name = _QUERY_FIELDS.get(field.lower())
+            if name is None:
+                raise ValueError(f"알 수 없는 필드: {field}")
+            values = (quoted,) if quoted is not None else tuple(v for v in bare.split(",") if v)
+            if not values or not all(values):
+                raise ValueError(f"{field}: 값이 없습니다")
+            groups[-1].append(QueryTerm(name, values, negated))
+        elif bare is not None and bare.lower() == "deprecated":
+            groups[-1].append(QueryTerm("deprecated", (), negated))
+        elif quoted or bare:
+            groups[-1].append(QueryTerm("text", (quoted if quoted is not None else bare,), negated))
+
+    plan = tuple(tuple(group) for group in groups if group)
+    if not plan:
+        raise ValueError("빈 질의입니다")
+    return plan
+
+
+def _matchPattern(pattern: str, value: str) -> bool:
+    """'*' 와일드카드가 있으면 전체 일치, 없으면 부분 일치 (소문자 비교)"""
+    if "*" in pattern:
+        return fnmatch.fnmatchcase(value, pattern)
+    return pattern in value
+
+
+class QueryResult(NamedTuple):
+    """구조화 질의 결과"""
+
+    modules: list
+    endpoints: list
+
+    def asRecord(self) -> dict:
+        return {
+            "modules": [hit._asdict() for hit in self.modules],
+            "endpoints": [hit._asdict() for hit in self.endpoints],
+        }
+
+
+class QueryIndex:
+    """구조화 질의 실행용 속성별 비트맵 (모듈 비트 = 위치 pos, endpoint 비트 = 번호 i)
+
+    모듈 속성(category/type/id/deprecated)은 값별 모듈 비트맵, endpoint 속성은
+    EndpointStore의 메서드/deprecated 비트맵과 문자열 테이블을 쓴다. 조건 하나는
+    (모듈 비트맵, endpoint 비트맵) 쌍으로 계산해 캐시하고, 질의 실행은 그 쌍의 AND/OR뿐이다.
+    모듈 조건은 해당 모듈의 endpoint 범위로 펼치고, endpoint 조건(method/op/uri)이 있는
+    그룹의 모듈 결과는 조건을 모두 만족하는 endpoint를 가진 모듈로 좁힌다.
+    endpoint 결과는 항상 모듈 결과에 속한 endpoint만 남긴다.
+    """
+
+    def __init__(self, modules: list, store: EndpointStore, matchText: Callable[[str], Iterable[int]]):
+        """
+        Args:
+            modules: category/categoryKo/type/typeKo/id/deprecatedCount 키를 가진 모듈 dict 목록
+            store: modules와 같은 순서로 만든 EndpointStore
+            matchText: 키워드 → 매칭 모듈 위치 목록
+        """
+        self.store = store
+        self._matchText = matchText
+        self.moduleAll = (1 << len(modules)) - 1
+        self.endpointAll = (1 << len(store)) - 1
+        self._ranges = [store.moduleMask(pos) for pos in range(len(modules))]
+
+        self._values = {"category": {}, "type": {}, "id": {}}
+        self._deprecated = 0
+        for pos, api in enumerate(modules):
+            bit = 1 << pos
+            for field, keys in (("category", ("category", "categoryKo")), ("type", ("type", "typeKo"))):
+                for key in keys:
+                    value = normalizeText(api.get(key, ""))
+                    if value:
+                        self._values[field][value] = self._values[field].get(value, 0) | bit
+            apiId = str(api.get("id", ""))
+            self._values["id"][apiId] = self._values["id"].get(apiId, 0) | bit
+            if api.get("deprecatedCount", 0) > 0:
+                self._deprecated |= bit
+
+        self._strings = {}
+        self._cache = {}
+
+    def _expand(self, moduleMask: int) -> int:
+        """모듈 비트맵 → 소속 endpoint 비트맵"""
+        mask = 0
+        for pos in _iterBits(moduleMask):
+            mask |= self._ranges[pos]
+        return mask
+
+    def _project(self, endpointMask: int) -> int:
+        """endpoint 비트맵 → endpoint를 하나라도 가진 모듈 비트맵"""
+        mask = 0
+        for pos, span in enumerate(self._ranges):
+            if endpointMask & span:
+                mask |= 1 << pos
+        return mask
+
+    def _stringColumn(self, field: str) -> tuple:
+        """(소문자 문자열 테이블, 문자열 번호 → endpoint 번호 목록) - 처음 쓸 때 생성"""
+        column = self._strings.get(field)
+        if column is None:
+            store = self.store
+            table, ids = (store.operationIds, store.opIds) if field == "op" else (store.uris, store.uriIds)
+            owners = [[] for _ in table]
+            for i, stringId in enumerate(ids):
+                owners[stringId].append(i)
+            column = self._strings[field] = ([s.lower() for s in table], owners)
+        return column
+
+    def _moduleValues(self, field: str, patterns: Iterable[str]) -> int:
+        values = self._values[field]
+        mask = 0
+        for pattern in patterns:
+            if field == "id" and "*" not in pattern:
+                mask |= values.get(pattern, 0)
+                continue
+            if field == "type":
+                pattern = _TYPE_ALIASES.get(pattern, pattern)
+            for value, bits in values.items():
+                if _matchPattern(pattern, value):
+                    mask |= bits
+        return mask
+
+    def _endpointValues(self, field: str, patterns: Iterable[str]) -> int:
+        if field == "method":
+            mask = 0
+            for method in patterns:
+                mask |= self.store.methodMask(method)
+            return mask
+
+        table, owners = self._stringColumn(field)
+        matched = (
+            i
+            for stringId, value in enumerate(table)
+            if any(_matchPattern(pattern, value) for pattern in patterns)
+            for i in owners[stringId]
+        )
+        return _bitmap(matched, len(self.store))
+
+    def termMasks(self, term: QueryTerm) -> tuple:
+        """조건 하나의 (모듈 비트맵, endpoint 비트맵). 부정 포함, 결과 캐시"""
+        cached = self._cache.get(term)
+        if cached is not None:
+            return cached
+
+        patterns = [normalizeText(value) for value in term.values]
+        if term.field in _ENDPOINT_FIELDS:
+            endpoints = self._endpointValues(term.field, patterns)
+            if term.negated:
+                endpoints = self.endpointAll & ~endpoints
+            masks = (self.moduleAll, endpoints)
+        elif term.field == "deprecated":
+            modules, endpoints = self._deprecated, self.store.deprecated
+            if term.negated:
+                modules, endpoints = self.moduleAll & ~modules, self.endpointAll & ~endpoints
+            masks = (modules, endpoints)
+        else:
+            if term.field == "text":
+                modules = _bitmap(self._matchText(term.values[0]), self.moduleAll.bit_length())
+            else:
+                modules = self._moduleValues(term.field, patterns)
+            if term.negated:
+                modules = self.moduleAll & ~modules
+            masks = (modules, self._expand(modules))
+
+        if len(self._cache) >= _TERM_CACHE_LIMIT:
+            self._cache.clear()
+        self._cache[term] = masks
+        return masks
+
+    def execute(self, plan: tuple) -> tuple:
+        """실행 계획 → (모듈 비트맵, endpoint 비트맵)"""
+        modules = endpoints = 0
+        for group in plan:
+            groupModules, groupEndpoints = self.moduleAll, self.endpointAll
+            for term in group:
+                termModules, termEndpoints = self.termMasks(term)
+                groupModules &= termModules
+                groupEndpoints &= termEndpoints
+            if any(term.field in _ENDPOINT_FIELDS for term in group):
+                groupModules &= self._project(groupEndpoints)
+            groupEndpoints &= self._expand(groupModules)
+            modules |= groupModules
+            endpoints |= groupEndpoints
+        return modules, endpoints
+
+
+def snapshotPath(dataPath: str) -> str:
+    """데이터 파일 옆 스냅샷 경로 (ohip-apis-ko.json → ohip-apis-ko.snapshot)"""
+    return os.path.splitext(dataPath)[0] + _SNAPSHOT_SUFFIX
+
+
+def _fileDigest(path: str) -> bytes:
+    with open(path, "rb") as f:
+        return hashlib.sha1(f.read()).digest()
+
+
+def _unmarshal(data) -> object:
+    # 컨테이너 객체를 대량 생성하므로 역직렬화 동안 GC를 멈춘다
+    gcEnabled = gc.isenabled()
+    gc.disable()
+    try:
+        return marshal.loads(data)
+    finally:
+        if gcEnabled:
+            gc.enable()
+
+
+class SnapshotReader:
+    """검증된 스냅샷 파일
+
+    payload는 열 때 읽고, 뒤쪽 구역(section)은 section()을 호출할 때 읽는다.
+    파일을 열어 둔 채 읽으므로 그 사이 스냅샷이 교체(os.replace)되어도 처음 검증한 내용을 읽는다.
+    """
+
+    def __init__(self, f, payload: dict, base: int, offsets: array):
+        self._file = f
+        self.payload = payload
+        self._base = base
+        self._offsets = offsets
+
+    def __len__(self) -> int:
+        return len(self._offsets) - 1
+
+    def section(self, index: int) -> object:
+        start, end = self._offsets[index], self._offsets[index + 1]
+        return _unmarshal(os.pread(self._file.fileno(), end - start, self._base + start))
+
+    def close(self):
+        self._file.close()
+
+
+def openSnapshot(dataPath: str) -> Optional[SnapshotReader]:
+    """유효한 스냅샷. 없거나 원본과 다르면 None
+
+    원본 크기/mtime이 헤더와 같으면 바로 사용하고, 다르면 원본 SHA-1로 재확인한다.
+    """
+    path = snapshotPath(dataPath)
+    try:
+        f = open(path, "rb")
+    except OSError:
+        return None
+    try:
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            if len(mm) < _SNAPSHOT_HEADER.size:
+                raise ValueError("short header")
+            magic, version, pyMagic, size, mtimeNs, digest, length, payloadLength = _SNAPSHOT_HEADER.unpack_from(mm)
+            if (magic, version, pyMagic) != (_SNAPSHOT_MAGIC, _SNAPSHOT_VERSION, importlib.util.MAGIC_NUMBER):
+                raise ValueError("version mismatch")
+            if len(mm) != _SNAPSHOT_HEADER.size + length:
+                raise ValueError("truncated")
+
+            st = os.stat(dataPath)
+            if (st.st_size, st.st_mtime_ns) != (size, mtimeNs):
+                if _fileDigest(dataPath) != digest:
+                    raise ValueError("stale")
+                # 내용은 같고 mtime만 바뀜: 헤더를 고쳐 다음부터 원본을 다시 해시하지 않음
+                _touchSnapshotHeader(f, path, mm[:_SNAPSHOT_HEADER.size], st)
+
+            base = _SNAPSHOT_HEADER.size + payloadLength
+            with memoryview(mm) as view:
+                payload = _unmarshal(view[_SNAPSHOT_HEADER.size:base])
+        offsets = _unpackOffsets(payload.pop("sections"))
+        if offsets[-1] != length - payloadLength:
+            raise ValueError("bad section table")
+        return SnapshotReader(f, payload, base, offsets)
+    except (OSError, ValueError, EOFError, TypeError, KeyError):
+        f.close()
+        return None
+
+
+def _touchSnapshotHeader(f, path: str, header: bytes, st: os.stat_result):
+    """열어 둔 스냅샷(f)의 헤더에 원본의 현재 크기/mtime 기록 (실패해도 무시)"""
+    fields = list(_SNAPSHOT_HEADER.unpack(header))
+    fields[3:5] = st.st_size, st.st_mtime_ns
+    try:
+        with open(path, "r+b") as w:
+            # 그 사이 다른 프로세스가 스냅샷을 교체했으면 새 파일은 건드리지 않음
+            if os.path.sameopenfile(w.fileno(), f.fileno()):
+                os.pwrite(w.fileno(), _SNAPSHOT_HEADER.pack(*fields), 0)
+    except OSError:
+        pass
+
+
+def _unpackOffsets(data: bytes) -> array:
+    offsets = array("Q")
+    offsets.frombytes(data)
+    return offsets
+
+
+def writeSnapshot(dataPath: str, payload: dict, sections: Iterable = ()) -> bool:
+    """스냅샷 저장 (임시 파일 후 교체). 저장할 수 없으면 False
+
+    Args:
+        payload: 열 때 바로 읽는 본문
+        sections: payload 뒤에 따로 저장해 SnapshotReader.section(i)로 읽는 객체들
+    """
+    path = snapshotPath(dataPath)
+    tmpPath = f"{path}.{os.getpid()}.tmp"
+    try:
+        st = os.stat(dataPath)
+        blobs = [marshal.dumps(section) for section in sections]
+        offsets = array("Q", [0])
+        for blob in blobs:
+            offsets.append(offsets[-1] + len(blob))
+        body = marshal.dumps(dict(payload, sections=offsets.tobytes()))
+        header = _SNAPSHOT_HEADER.pack(
+            _SNAPSHOT_MAGIC, _SNAPSHOT_VERSION, importlib.util.MAGIC_NUMBER,
+            st.st_size, st.st_mtime_ns, _fileDigest(dataPath), len(body) + offsets[-1], len(body),
+        )
+        with open(tmpPath, "wb") as f:
+            f.write(header)
+            f.write(body)
+            for blob in blobs:
+                f.write(blob)
+        os.replace(tmpPath, path)
+        return True
+    except (OSError, ValueError):
+        try:
+            os.remove(tmpPath)
+        except OSError:
+            pass
+        return False
+
+
+def _internStrings(apis: list):
+    """반복되는 키/짧은 값 문자열을 intern (메모리 절약, 스냅샷에서 참조로 저장)"""
+    for api in apis:
+        for key in list(api):
+            value = api.pop(key)
+            if isinstance(value, str) and len(value) <= 32:
+                value = sys.intern(value)
+            api[sys.intern(key)] = value
+
+
+class ModuleHit(NamedTuple):
+    """모듈 단위 검색 결과 (불변, __slots__ 기반)"""
+
+    apiId: int
+    title: str
+    titleKo: str
+    description: str
+    descriptionKo: str
+    category: str
+    categoryKo: str
+    type: str
+    typeKo: str
+    operationsCount: int
+    deprecatedCount: int
+    score: float = 0.0
+
+    @classmethod
+    def fromApi(cls, api: dict, score: float = 0.0) -> "ModuleHit":
+        return cls(
+            api.get("id", ""), api.get("title", ""), api.get("titleKo", ""),
+            api.get("description", ""), api.get("descriptionKo", ""),
+            api.get("category", ""), api.get("categoryKo", ""),
+            api.get("type", ""), api.get("typeKo", ""),
+            api.get("operationsCount", 0), api.get("deprecatedCount", 0), score,
+        )
+
+
+class EndpointHit(NamedTuple):
+    """endpoint 단위 검색 결과 (불변, __slots__ 기반)"""
+
+    apiId: int
+    apiTitle: str
+    apiTitleKo: str
+    method: str
+    uri: str
+    operationId: str
+    deprecated: bool
 
 
 class OhipApiSearch:
-    """OHIP API 한글 검색 클래스"""
+    """OHIP API 한글 검색 클래스
+
+    조회 메서드는 출력하지 않는다. iter* 메서드는 결과 레코드(ModuleHit/EndpointHit)를
+    지연 생성하고, find/findEndpoint 등은 기존과 같은 list를 반환한다.
+    화면 출력은 ConsolePrinter가 담당한다.
+
+    endpoint는 모듈 dict에서 분리해 EndpointStore(열 저장소)에 보관한다.
+    find/byCategory 등은 저장소에서 "endpoints"를 다시 붙인 복사본을 반환하므로 결과 형태는
+    기존과 같고, detail()은 여기에 "endpointStats"(미리 계산한 통계)를 더 붙인다.
+    iter* 레코드는 endpoint를 만들지 않는다.
+
+    lazyEndpoints=True면 스냅샷에서 모듈 메타데이터와 모듈 색인만 읽는다.
+    detail()은 해당 모듈의 endpoint 구역만, endpoint 검색/경로 해석/오타 교정은
+    처음 호출할 때 endpoint 색인 구역 전체를 읽는다 (결과는 같음).
+    """
 
-    def __init__(self, dataDir: Optional[str] = None):
+    def __init__(self, dataDir: Optional[str] = None, useSnapshot: bool = True,
+                 lazyEndpoints: bool = False):
+        """
+        Args:
+            dataDir: 데이터 디렉터리 (기본: 저장소의 data/)
+            useSnapshot: 데이터 파일 옆 색인 스냅샷을 읽고, 없거나 오래되면 다시 저장
+            lazyEndpoints: 스냅샷에서 endpoint를 처음 필요할 때 모듈 단위로 읽음.
+                스냅샷이 없으면 JSON 전체로 색인을 만들어 스냅샷을 저장한 뒤 다시 열어
+                endpoint 색인을 내려놓는다. useSnapshot=False면 지연 로딩 없이 전체를 색인
+                (원본 JSON은 모듈 단위로 나눠 읽을 수 없음)
+        """
         if dataDir is None:
             dataDir = str(Path(__file__).parent.parent / "data")
 
@@ -43,177 +1470,373 @@ class OhipApiSearch:
 
         # 한글 데이터가 있으면 사용, 없으면 원본 사용
         if os.path.exists(koPath):
-            with open(koPath, "r", encoding="utf-8") as f:
-                self.apis = json.load(f)
+            self.dataPath = koPath
         elif os.path.exists(rawPath):
-            with open(rawPath, "r", encoding="utf-8") as f:
-                self.apis = json.load(f)
+            self.dataPath = rawPath
         else:
             raise FileNotFoundError(f"데이터 파일을 찾을 수 없습니다: {koPath} 또는 {rawPath}")
 
-    def find(self, keyword: str) -> list:
-        """한글/영문 키워드로 API 검색"""
-        keyword = keyword.lower()
-        results = []
+        self._snapshot = None
+        self._endpointStore = self._routes = self._fuzzyIndex = None
+        self._moduleBlocks = {}
+        self._queryIndex = None
+        self._texts = None
+
+        reader = openSnapshot(self.dataPath) if useSnapshot else None
+        self.fromSnapshot = reader is not None
+        if reader is not None:
+            self._restoreIndex(reader.payload)
+            self._snapshot = reader
+            if not lazyEndpoints:
+                self._loadEndpointIndex()
+                self.close()
+            return
 
+        with open(self.dataPath, "r", encoding="utf-8") as f:
+            self.apis = json.load(f)
+        _internStrings(self.apis)
+        self._endpointStore = EndpointStore(self.apis)
         for api in self.apis:
-            searchFields = [
-                api.get("title", "").lower(),
-                api.get("titleKo", "").lower(),
-                api.get("description", "").lower(),
-                api.get("descriptionKo", "").lower(),
-                api.get("category", "").lower(),
-                api.get("categoryKo", "").lower(),
-            ]
-            # keywords 배열 검색
-            keywords = api.get("keywords", [])
-            searchFields.extend([k.lower() for k in keywords])
+            api.pop("endpoints", None)
+        self._buildIndex()
+        if useSnapshot and writeSnapshot(self.dataPath, self._indexState(), self._indexSections()) and lazyEndpoints:
+            # 방금 저장한 스냅샷으로 전환해 endpoint 색인은 필요할 때 다시 읽음
+            reader = openSnapshot(self.dataPath)
+            if reader is not None:
+                self._snapshot = reader
+                self._endpointStore = self._routes = self._fuzzyIndex = None
 
-            # operations 검색
-            operations = api.get("operations", [])
-            searchFields.extend([op.lower() for op in operations])
+    def close(self):
+        """lazyEndpoints 모드에서 열어 둔 스냅샷 파일 닫기"""
+        if self._snapshot is not None:
+            self._snapshot.close()
+            self._snapshot = None
 
-            if any(keyword in field for field in searchFields):
-                results.append(api)
+    def _indexState(self) -> dict:
+        """스냅샷 payload: 모듈 메타데이터와 모듈 색인 (marshal 가능한 기본 타입만)"""
+        return {
+            "apis": self.apis,
+            "textIndex": self.textIndex.toState(),
+            "categoryIndex": self.categoryIndex.toState(),
+            "typeIndex": self.typeIndex.toState(),
+            "typeKoIndex": self.typeKoIndex.toState(),
+            "operationIndex": self.operationIndex.toState(),
+            "koreanIndex": self.koreanIndex.toState(),
+            "rankIndex": self.rankIndex.toState(),
+            "stats": self._stats,
+        }
 
-        self._printResults(results, keyword)
-        return results
+    def _indexSections(self) -> Iterator:
+        """스냅샷 구역: 0 = endpoint 색인 전체, 1 + pos = 모듈 pos의 (endpoint 목록, 통계)"""
+        store = self._endpointStore
+        yield {
+            "endpointStore": store.toState(),
+            "routes": self._routes.toState(),
+            "fuzzyIndex": self._fuzzyIndex.toState(),
+        }
+        for pos in range(len(self.apis)):
+            yield store.moduleEndpoints(pos), store.moduleStats[pos]
 
-    def byCategory(self, category: str) -> list:
-        """카테고리별 API 조회 (property/distribution/nor1 또는 한글)"""
-        category = category.lower()
-        results = [
-            api for api in self.apis
-            if category in api.get("category", "").lower()
-            or category in api.get("categoryKo", "").lower()
-        ]
-        self._printResults(results, f"카테고리: {category}")
-        return results
+    def _restoreIndex(self, payload: dict):
+        """스냅샷 payload에서 모듈 데이터/색인 복원"""
+        self.apis = payload["apis"]
+        for name in ("textIndex", "categoryIndex", "typeIndex", "typeKoIndex", "operationIndex"):
+            setattr(self, name, _TermIndex.fromState(payload[name]))
+        self.koreanIndex = KoreanIndex.fromState(payload["koreanIndex"])
+        self.rankIndex = Bm25Index.fromState(payload["rankIndex"])
+        self._stats = payload["stats"]
+        self._indexIds()
 
-    def byType(self, apiType: str) -> list:
-        """타입별 API 조회 (Operation/Step 또는 API 모듈/워크플로우)"""
-        apiType = apiType.lower()
-        typeMap = {
-            "api 모듈": "operation", "모듈": "operation", "api": "operation",
-            "워크플로우": "step", "workflow": "step", "플로우": "step"
-        }
-        searchType = typeMap.get(apiType, apiType)
+    def _loadEndpointIndex(self):
+        """스냅샷의 endpoint 색인 구역 복원 (한 번만)"""
+        if self._endpointStore is not None:
+            return
+        state = self._snapshot.section(0)
+        self._routes = RouteTrie.fromState(state["routes"])
+        self._fuzzyIndex = FuzzyIndex.fromState(state["fuzzyIndex"])
+        self._endpointStore = EndpointStore.fromState(state["endpointStore"])
+        self._moduleBlocks = {}
 
-        results = [
-            api for api in self.apis
-            if searchType in api.get("type", "").lower()
-            or apiType in api.get("typeKo", "").lower()
-        ]
-        self._printResults(results, f"타입: {apiType}")
-        return results
+    @property
+    def endpointStore(self) -> EndpointStore:
+        self._loadEndpointIndex()
+        return self._endpointStore
 
-    def detail(self, apiId: int) -> Optional[dict]:
-        """특정 API 상세 정보 출력"""
-        for api in self.apis:
-            if api.get("id") == apiId:
-                self._printDetail(api)
-                return api
-        print(f"  ID {apiId}에 해당하는 API를 찾을 수 없습니다.")
-        return None
+    @property
+    def routes(self) -> RouteTrie:
+        self._loadEndpointIndex()
+        return self._routes
 
-    def listAll(self):
-        """전체 API 목록 출력"""
-        print(f"\n{'='*80}")
-        print(f"  OHIP API 전체 목록 ({len(self.apis)}개)")
-        print(f"{'='*80}")
+    @property
+    def fuzzyIndex(self) -> FuzzyIndex:
+        self._loadEndpointIndex()
+        return self._fuzzyIndex
 
-        # 카테고리별 그룹핑
-        categories = {}
-        for api in self.apis:
-            cat = api.get("categoryKo", api.get("category", "기타"))
-            if cat not in categories:
-                categories[cat] = []
-            categories[cat].append(api)
+    @property
+    def queryIndex(self) -> QueryIndex:
+        """구조화 질의 비트맵 (처음 질의할 때 생성)"""
+        if self._queryIndex is None:
+            self._queryIndex = QueryIndex(self.apis, self.endpointStore, self.matchKeyword)
+        return self._queryIndex
 
-        for cat, apis in categories.items():
-            print(f"\n  [{cat}] ({len(apis)}개)")
-            print(f"  {'-'*60}")
-            for api in apis:
-                titleKo = api.get("titleKo", "")
-                titleEn = api.get("title", "")
-                opsCount = api.get("operationsCount", 0)
-                deprecated = api.get("deprecatedCount", 0)
-                apiType = api.get("typeKo", api.get("type", ""))
+    def _moduleEndpoints(self, pos: int) -> tuple:
+        """모듈 pos의 (endpoint dict 목록, 통계). 색인이 아직 없으면 해당 모듈 구역만 읽음"""
+        if self._endpointStore is not None:
+            return self._endpointStore.moduleEndpoints(pos), self._endpointStore.moduleStats[pos]
+        block = self._moduleBlocks.get(pos)
+        if block is None:
+            block = self._moduleBlocks[pos] = self._snapshot.section(1 + pos)
+        endpoints, stats = block
+        return [dict(ep) for ep in endpoints], stats
 
-                deprecatedStr = f" (deprecated: {deprecated})" if deprecated > 0 else ""
-                title = f"{titleKo} ({titleEn})" if titleKo else titleEn
+    def _buildIndex(self):
+        """검색 색인 생성 (생성 시 1회)
 
-                print(f"  {api.get('id', ''):>3}. [{apiType}] {title} - {opsCount}개{deprecatedStr}")
+        - textIndex: 제목/설명/카테고리/키워드/operation 단어 토큰
+        - categoryIndex, typeIndex, typeKoIndex: 필드 값 전체
+        - operationIndex: operation 이름 전체
+        - fuzzyIndex: operationId/operation/제목/키워드 오타 교정 후보
+        """
+        self.textIndex = _TermIndex()
+        self.categoryIndex = _TermIndex()
+        self.typeIndex = _TermIndex()
+        self.typeKoIndex = _TermIndex()
+        self.operationIndex = _TermIndex()
 
-    def summary(self):
-        """전체 요약 통계 출력"""
-        totalOps = sum(api.get("operationsCount", 0) for api in self.apis)
-        totalDeprecated = sum(api.get("deprecatedCount", 0) for api in self.apis)
+        for pos, api in enumerate(self.apis):
+            values = [api.get(field, "") for field in _TEXT_FIELDS]
+            values.extend(api.get("keywords", []))
+            values.extend(api.get("operations", []))
+            for value in values:
+                for term in tokenize(value):
+                    self.textIndex.add(term, pos)
+
+            self.categoryIndex.add(normalizeText(api.get("category", "")), pos)
+            self.categoryIndex.add(normalizeText(api.get("categoryKo", "")), pos)
+            self.typeIndex.add(normalizeText(api.get("type", "")), pos)
+            self.typeKoIndex.add(normalizeText(api.get("typeKo", "")), pos)
+            for op in api.get("operations", []):
+                self.operationIndex.add(normalizeText(op), pos)
+
+        for index in (self.textIndex, self.categoryIndex, self.typeIndex,
+                      self.typeKoIndex, self.operationIndex):
+            index.freeze()
+
+        self.koreanIndex = KoreanIndex(self.apis)
+        self.rankIndex = Bm25Index(self.apis)
+
+        store = self._endpointStore
+        self._routes = RouteTrie()
+        for i in range(len(store)):
+            self._routes.add(store.method(i), store.uri(i), i)
+        self._fuzzyIndex = FuzzyIndex(self._fuzzyEntries())
+        self._computeStats()
+
+    def _fuzzyEntries(self) -> Iterator[tuple]:
+        for opId in self.endpointStore.operationIds:
+            yield opId, "operationId"
+        for api in self.apis:
+            for op in api.get("operations", []):
+                yield op, "operation"
+        for api in self.apis:
+            yield api.get("title", ""), "title"
+            yield api.get("titleKo", ""), "title"
+        for api in self.apis:
+            for keyword in api.get("keywords", []):
+                yield keyword, "keyword"
 
-        modules = [a for a in self.apis if a.get("type", "").lower() == "operation"]
-        workflows = [a for a in self.apis if a.get("type", "").lower() == "step"]
+    def _indexIds(self):
+        self._posById = {}
+        for pos, api in enumerate(self.apis):
+            self._posById.setdefault(api.get("id"), pos)
 
+    def _computeStats(self):
+        """전체 통계와 apiId → 위치 (색인 생성 시 1회, 스냅샷에 함께 저장)"""
+        self._indexIds()
         categories = {}
         for api in self.apis:
             cat = api.get("categoryKo", api.get("category", "기타"))
             categories[cat] = categories.get(cat, 0) + 1
 
-        # HTTP 메서드별 통계 집계
-        methodCounts = {}
-        totalEndpoints = 0
-        totalDeprecatedEndpoints = 0
-        for api in self.apis:
-            endpoints = api.get("endpoints", [])
-            totalEndpoints += len(endpoints)
-            for ep in endpoints:
-                m = ep.get("method", "UNKNOWN")
-                methodCounts[m] = methodCounts.get(m, 0) + 1
-                if ep.get("deprecated", False):
-                    totalDeprecatedEndpoints += 1
-
-        print(f"\n{'='*60}")
-        print(f"  OHIP API 요약")
-        print(f"{'='*60}")
-        print(f"  전체 API 모듈/워크플로우: {len(self.apis)}개")
-        print(f"  - API 모듈: {len(modules)}개")
-        print(f"  - 워크플로우: {len(workflows)}개")
-        print(f"  전체 Operations: {totalOps}개")
-        print(f"  Deprecated: {totalDeprecated}개")
-        print(f"\n  전체 Endpoints: {totalEndpoints}개")
-        if totalDeprecatedEndpoints > 0:
-            print(f"  Deprecated Endpoints: {totalDeprecatedEndpoints}개")
-        print(f"\n  HTTP 메서드별 통계:")
-        for m in ["GET", "POST", "PUT", "DELETE", "PATCH", "HEAD", "OPTIONS"]:
-            if m in methodCounts:
-                print(f"    - {m}: {methodCounts[m]}개")
-        # 기타 메서드 출력
-        for m, c in sorted(methodCounts.items()):
-            if m not in ["GET", "POST", "PUT", "DELETE", "PATCH", "HEAD", "OPTIONS"]:
-                print(f"    - {m}: {c}개")
-        print(f"\n  카테고리별:")
-        for cat, count in categories.items():
-            print(f"    - {cat}: {count}개")
-        print(f"{'='*60}")
+        store = self._endpointStore
+        self._stats = {
+            "apis": len(self.apis),
+            "modules": sum(1 for a in self.apis if a.get("type", "").lower() == "operation"),
+            "workflows": sum(1 for a in self.apis if a.get("type", "").lower() == "step"),
+            "operations": sum(api.get("operationsCount", 0) for api in self.apis),
+            "deprecated": sum(api.get("deprecatedCount", 0) for api in self.apis),
+            "endpoints": len(store),
+            "deprecatedEndpoints": store.deprecatedCount,
+            "methodCounts": store.methodCounts,
+            "categories": categories,
+        }
+
+    def _matchTerm(self, term: str) -> frozenset:
+        """단어 하나에 매칭되는 모듈 위치 집합 (한글은 n-gram/초성 색인 사용)"""
+        if hasHangul(term):
+            return self.koreanIndex.matchToken(term)
+        return self.textIndex.containing(term)
+
+    def _moduleDict(self, pos: int) -> dict:
+        """모듈 pos의 원본 형태 dict (열 저장소의 "endpoints"를 다시 붙인 복사본)"""
+        return dict(self.apis[pos], endpoints=self._moduleEndpoints(pos)[0])
+
+    def _modulesAt(self, positions: Iterable[int]) -> list:
+        """모듈 위치 집합 → 원본 순서의 API 목록"""
+        return [self._moduleDict(pos) for pos in sorted(positions)]
+
+    def _hitsAt(self, positions: Iterable[int]) -> Iterator[ModuleHit]:
+        for pos in sorted(positions):
+            yield ModuleHit.fromApi(self.apis[pos])
+
+    def matchKeyword(self, keyword: str) -> frozenset:
+        """키워드를 부분 문자열로 포함하는 모듈 위치 집합 (기존 find와 같은 의미)
+
+        단어 색인으로 후보를 좁힌 뒤 원문 필드(소문자)에 키워드 전체가 들어 있는지 확인한다.
+        단어가 없는 검색어("/" 등)나 NFKC 정규화로 바뀌는 검색어는 전체 모듈을 확인한다.
+        한글 검색어가 부분 문자열로 하나도 매칭되지 않을 때만 단어별 n-gram/초성 색인의
+        교집합을 쓴다 ("약 관", "ㅋㅅ", "정사").
+        """
+        needle = keyword.lower()
+        terms = set(tokenize(keyword))
+        if terms and normalizeText(keyword) == needle:
+            candidates = self._intersect(self.textIndex.containing(term) for term in terms)
+        else:
+            candidates = range(len(self.apis))
+        texts = self._searchTexts()
+        result = frozenset(pos for pos in candidates if needle in texts[pos])
+        if not result and terms and hasHangul(keyword):
+            result = self._intersect(self._matchTerm(term) for term in terms)
+        return result
+
+    @staticmethod
+    def _intersect(postings: Iterable[frozenset]) -> frozenset:
+        """posting list 교집합 (짧은 것부터)"""
+        postings = sorted(postings, key=len)
+        result = postings[0]
+        for posting in postings[1:]:
+            if not result:
+                break
+            result = result & posting
+        return result
+
+    def _searchTexts(self) -> list:
+        """모듈별 기존 find 검색 대상 필드를 소문자로 이은 문자열 (처음 쓸 때 생성)
+
+        필드 경계를 넘는 매칭이 없도록 \\0으로 잇는다.
+        """
+        if self._texts is None:
+            self._texts = [
+                "\0".join(
+                    [(api.get(field) or "").lower() for field in _TEXT_FIELDS]
+                    + [k.lower() for k in api.get("keywords", [])]
+                    + [op.lower() for op in api.get("operations", [])]
+                )
+                for api in self.apis
+            ]
+        return self._texts
+
+    def _matchCategory(self, category: str) -> frozenset:
+        return self.categoryIndex.containing(normalizeText(category))
+
+    def _matchType(self, apiType: str) -> frozenset:
+        apiType = normalizeText(apiType)
+        searchType = _TYPE_ALIASES.get(apiType, apiType)
+        return self.typeIndex.containing(searchType) | self.typeKoIndex.containing(apiType)
+
+    def _matchOperation(self, opName: str) -> frozenset:
+        return self.operationIndex.containing(normalizeText(opName))
+
+    # --- 레코드 생성기 (출력 없음) ---
+
+    def iterFind(self, keyword: str) -> Iterator[ModuleHit]:
+        """한글/영문 키워드 검색 결과를 원본 순서로 생성"""
+        return self._hitsAt(self.matchKeyword(keyword))
+
+    def iterRank(self, keyword: str, k: int = 10) -> Iterator[ModuleHit]:
+        """키워드 검색 결과를 BM25 관련도순으로 상위 k개 생성 (score 포함)"""
+        top = self.rankIndex.topK(keyword, k, self.matchKeyword(keyword))
+        for score, pos in top:
+            yield ModuleHit.fromApi(self.apis[pos], score)
+
+    def iterByCategory(self, category: str) -> Iterator[ModuleHit]:
+        """카테고리별 API (property/distribution/nor1 또는 한글)"""
+        return self._hitsAt(self._matchCategory(category))
+
+    def iterByType(self, apiType: str) -> Iterator[ModuleHit]:
+        """타입별 API (Operation/Step 또는 API 모듈/워크플로우)"""
+        return self._hitsAt(self._matchType(apiType))
+
+    def iterFindOperation(self, opName: str) -> Iterator[ModuleHit]:
+        """operation 이름(부분 일치)을 포함하는 API"""
+        return self._hitsAt(self._matchOperation(opName))
+
+    def query(self, text: str) -> QueryResult:
+        """구조화 질의 (예: 'method:POST category:distribution -deprecated "체크인" op:post*')
+
+        질의는 한 번 파싱해 캐시하고, 속성별 비트맵의 AND/OR로 실행한다. 문법은 parseQuery 참고.
+
+        Returns:
+            조건에 맞는 모듈(ModuleHit)과 endpoint(EndpointHit) 목록 (원본 순서)
+
+        Raises:
+            ValueError: 질의 문법 오류
+        """
+        modules, endpoints = self.queryIndex.execute(parseQuery(text))
+        return QueryResult(
+            [ModuleHit.fromApi(self.apis[pos]) for pos in _iterBits(modules)],
+            [self._endpointHit(i) for i in _iterBits(endpoints)],
+        )
+
+    def iterEndpoints(self, keyword: str) -> Iterator[EndpointHit]:
+        """URI 경로 또는 operationId(부분 일치)로 endpoint 검색"""
+        return map(self._endpointHit, self.endpointStore.search(keyword))
+
+    def iterByMethod(self, method: str) -> Iterator[EndpointHit]:
+        """HTTP 메서드별 endpoint"""
+        return map(self._endpointHit, self.endpointStore.select(method=method))
+
+    def _endpointHit(self, i: int) -> EndpointHit:
+        store = self.endpointStore
+        api = self.apis[store.moduleOf[i]]
+        return EndpointHit(
+            api.get("id", ""), api.get("title", ""), api.get("titleKo", ""),
+            store.method(i), store.uri(i), store.operationId(i), store.isDeprecated(i),
+        )
+
+    # --- list 반환 API (출력 없음) ---
+
+    def find(self, keyword: str) -> list:
+        """한글/영문 키워드로 API 검색"""
+        return self._modulesAt(self.matchKeyword(keyword))
+
+    def rank(self, keyword: str, k: int = 10) -> list:
+        """키워드 검색 결과를 BM25 관련도순으로 상위 k개 (점수, API) 반환"""
+        top = self.rankIndex.topK(keyword, k, self.matchKeyword(keyword))
+        return [(score, self._moduleDict(pos)) for score, pos in top]
+
+    def byCategory(self, category: str) -> list:
+        """카테고리별 API 조회 (property/distribution/nor1 또는 한글)"""
+        return self._modulesAt(self._matchCategory(category))
+
+    def byType(self, apiType: str) -> list:
+        """타입별 API 조회 (Operation/Step 또는 API 모듈/워크플로우)"""
+        return self._modulesAt(self._matchType(apiType))
 
     def findOperation(self, opName: str) -> list:
         """특정 operation 이름으로 소속 API 검색"""
-        opName = opName.lower()
-        results = []
-        for api in self.apis:
-            ops = api.get("operations", [])
-            if any(opName in op.lower() for op in ops):
-                results.append(api)
-
-        if results:
-            print(f"\n  '{opName}' operation이 포함된 API:")
-            for api in results:
-                titleKo = api.get("titleKo", "")
-                title = f"{titleKo} ({api['title']})" if titleKo else api["title"]
-                print(f"    - [{api.get('id', '')}] {title}")
-        else:
-            print(f"  '{opName}' operation을 찾을 수 없습니다.")
+        return self._modulesAt(self._matchOperation(opName))
+
+    def detail(self, apiId: int) -> Optional[dict]:
+        """특정 API 상세 정보 (없으면 None)
 
-        return results
+        모듈 dict에 "endpoints" 목록과 "endpointStats"(미리 계산한 메서드별/deprecated 수)를 붙여 반환
+        """
+        pos = self._posById.get(apiId)
+        if pos is None:
+            return None
+        endpoints, endpointStats = self._moduleEndpoints(pos)
+        return dict(self.apis[pos], endpoints=endpoints, endpointStats=endpointStats)
 
     def findEndpoint(self, keyword: str) -> list:
         """URI 경로 또는 operationId로 endpoint 검색
@@ -222,45 +1845,9 @@ class OhipApiSearch:
             keyword: 검색할 URI 경로 일부 또는 operationId
 
         Returns:
-            매칭된 endpoint와 소속 API 정보를 포함한 리스트
+            매칭된 endpoint와 소속 API 정보를 포함한 dict 리스트
         """
-        keyword = keyword.lower()
-        results = []
-
-        for api in self.apis:
-            endpoints = api.get("endpoints", [])
-            for ep in endpoints:
-                uri = ep.get("uri", "").lower()
-                opId = ep.get("operationId", "").lower()
-
-                if keyword in uri or keyword in opId:
-                    # 소속 API 이름과 한글명 추가
-                    result = {
-                        "apiTitle": api.get("title", ""),
-                        "apiTitleKo": api.get("titleKo", ""),
-                        "apiId": api.get("id", ""),
-                        "method": ep.get("method", ""),
-                        "uri": ep.get("uri", ""),
-                        "operationId": ep.get("operationId", ""),
-                        "deprecated": ep.get("deprecated", False),
-                    }
-                    results.append(result)
-
-        # 결과 출력
-        if results:
-            print(f"\n  '{keyword}' endpoint 검색 결과: {len(results)}건")
-            print(f"  {'-'*70}")
-            for r in results:
-                deprecatedTag = " [DEPRECATED]" if r["deprecated"] else ""
-                apiName = f"{r['apiTitleKo']} ({r['apiTitle']})" if r["apiTitleKo"] else r["apiTitle"]
-                print(f"  {r['method']:>6} {r['uri']}{deprecatedTag}")
-                print(f"         operationId: {r['operationId']}")
-                print(f"         소속 API: [{r['apiId']}] {apiName}")
-                print()
-        else:
-            print(f"  '{keyword}'에 해당하는 endpoint를 찾을 수 없습니다.")
-
-        return results
+        return [hit._asdict() for hit in self.iterEndpoints(keyword)]
 
     def findByMethod(self, method: str) -> list:
         """HTTP 메서드별 endpoint 검색
@@ -269,135 +1856,636 @@ class OhipApiSearch:
             method: HTTP 메서드 (GET, POST, PUT, DELETE)
 
         Returns:
-            해당 메서드의 endpoint 리스트
+            해당 메서드의 endpoint dict 리스트
         """
-        method = method.upper()
-        results = []
+        return [hit._asdict() for hit in self.iterByMethod(method)]
 
-        for api in self.apis:
-            endpoints = api.get("endpoints", [])
-            for ep in endpoints:
-                if ep.get("method", "").upper() == method:
-                    result = {
-                        "apiTitle": api.get("title", ""),
-                        "apiTitleKo": api.get("titleKo", ""),
-                        "apiId": api.get("id", ""),
-                        "method": ep.get("method", ""),
-                        "uri": ep.get("uri", ""),
-                        "operationId": ep.get("operationId", ""),
-                        "deprecated": ep.get("deprecated", False),
-                    }
-                    results.append(result)
-
-        # 결과 출력
-        print(f"\n  {method} 메서드 endpoint: {len(results)}건")
-        print(f"  {'-'*70}")
-        for r in results:
-            deprecatedTag = " [DEPRECATED]" if r["deprecated"] else ""
-            apiName = f"{r['apiTitleKo']}" if r["apiTitleKo"] else r["apiTitle"]
-            print(f"  {r['uri']}{deprecatedTag}")
-            print(f"    operationId: {r['operationId']} | 소속: {apiName}")
-
-        return results
-
-    def _printResults(self, results: list, keyword: str):
-        """검색 결과 출력"""
-        print(f"\n  '{keyword}' 검색 결과: {len(results)}건")
-        print(f"  {'-'*60}")
-        for api in results:
-            titleKo = api.get("titleKo", "")
-            titleEn = api.get("title", "")
-            title = f"{titleKo} ({titleEn})" if titleKo else titleEn
-            descKo = api.get("descriptionKo", api.get("description", ""))[:80]
-
-            print(f"  [{api.get('id', ''):>3}] {title}")
-            print(f"        {descKo}")
-            print()
-
-    def _printDetail(self, api: dict):
+    def resolve(self, method: str, path: str) -> Optional[dict]:
+        """실제 요청 경로를 endpoint 템플릿으로 해석
+
+        Args:
+            method: HTTP 메서드
+            path: 실제 요청 경로 (예: /ars/v1/profiles/12345/aging, 전체 URL/쿼리스트링 허용)
+
+        Returns:
+            operationId, 소속 API, 추출된 path params를 포함한 dict. 매칭 없으면 None
+        """
+        matched = self.routes.match(method, path)
+        if matched is None:
+            return None
+
+        template, params, owners = matched
+        # 워크플로우와 공유하는 endpoint는 API 모듈(Operation)을 소속으로 우선
+        store = self.endpointStore
+        i = min(owners, key=lambda owner: self.apis[store.moduleOf[owner]].get("type") != "Operation")
+        api = self.apis[store.moduleOf[i]]
+        return {
+            "apiTitle": api.get("title", ""),
+            "apiTitleKo": api.get("titleKo", ""),
+            "apiId": api.get("id", ""),
+            "apiIds": [self.apis[store.moduleOf[owner]].get("id", "") for owner in owners],
+            "method": store.method(i),
+            "uri": template,
+            "operationId": store.operationId(i),
+            "deprecated": store.isDeprecated(i),
+            "params": params,
+        }
+
+    def didYouMean(self, term: str, limit: int = 5) -> list:
+        """오타 교정 후보 (operationId/operation/제목/키워드, Suggestion 목록)
+
+        예: "getReservaton" → getReservation, "postChargeToAR" → postChargesToAR
+        """
+        return self.fuzzyIndex.suggest(term, limit)
+
+    def stats(self) -> dict:
+        """전체 요약 통계 (로드 시 계산해 둔 값)"""
+        return dict(self._stats, methodCounts=dict(self._stats["methodCounts"]),
+                    categories=dict(self._stats["categories"]))
+
+    # --- 출력 편의 메서드 (ConsolePrinter 위임) ---
+
+    def listAll(self):
+        """전체 API 목록 출력"""
+        ConsolePrinter().listAll(ModuleHit.fromApi(api) for api in self.apis)
+
+    def summary(self):
+        """전체 요약 통계 출력"""
+        ConsolePrinter().summary(self.stats())
+
+
+class ReloadingSearch:
+    """데이터 파일이 바뀌면 OhipApiSearch를 다시 만들어 교체하는 래퍼 (상주 프로세스용)
+
+    조회는 현재 인스턴스(current)에 위임한다. 새 인스턴스는 감시 스레드에서 완성한 뒤
+    참조 하나만 바꾸므로 진행 중인 조회는 이전 인스턴스로 끝나고, 조회 경로에는 잠금이 없다.
+    교체된 인스턴스는 다음 확인 때(또는 stop()에서) 닫아 스냅샷 파일을 놓는다.
+    새 데이터를 읽지 못하면(쓰는 중인 파일 등) 이전 인스턴스를 유지하고 다음 확인 때 다시 시도한다.
+    """
+
+    def __init__(self, dataDir: Optional[str] = None, interval: float = 2.0, **options):
+        """
+        Args:
+            dataDir: 데이터 디렉터리 (OhipApiSearch와 같음)
+            interval: start() 후 데이터 파일 변경 확인 주기 (초)
+            options: OhipApiSearch 생성 옵션 (useSnapshot, lazyEndpoints)
+        """
+        self._dataDir = dataDir
+        self._options = options
+        self.interval = interval
+        self.current = OhipApiSearch(dataDir, **options)
+        self._retired = None
+        self._signature = self._fileSignature()
+        self._stopEvent = threading.Event()
+        self._thread = None
+
+    def __getattr__(self, name: str):
+        return getattr(self.current, name)
+
+    def _fileSignature(self) -> Optional[tuple]:
+        try:
+            st = os.stat(self.current.dataPath)
+        except OSError:
+            return None
+        return st.st_size, st.st_mtime_ns
+
+    def reload(self) -> bool:
+        """데이터 파일이 바뀌었으면 새 인스턴스로 교체. 교체했으면 True"""
+        self._closeRetired()
+        signature = self._fileSignature()
+        if signature is None or signature == self._signature:
+            return False
+        try:
+            fresh = OhipApiSearch(self._dataDir, **self._options)
+        except (OSError, ValueError):
+            return False
+        self._retired, self.current = self.current, fresh
+        self._signature = signature
+        return True
+
+    def _closeRetired(self):
+        """이전 확인 때 교체된 인스턴스 닫기 (그 사이 진행 중이던 조회는 끝남)"""
+        retired, self._retired = self._retired, None
+        if retired is not None:
+            retired.close()
+
+    def _watch(self):
+        while not self._stopEvent.wait(self.interval):
+            self.reload()
+
+    def start(self):
+        """백그라운드 감시 스레드 시작"""
+        if self._thread is None:
+            self._stopEvent.clear()
+            self._thread = threading.Thread(target=self._watch, name="ohip-search-reload", daemon=True)
+            self._thread.start()
+
+    def stop(self):
+        """감시 스레드 종료"""
+        if self._thread is not None:
+            self._stopEvent.set()
+            self._thread.join()
+            self._thread = None
+        self._closeRetired()
+
+
+class ConsolePrinter:
+    """검색 결과 콘솔 출력 (CLI 표시 계층)"""
+
+    _METHOD_ORDER = ["GET", "POST", "PUT", "DELETE", "PATCH", "HEAD", "OPTIONS"]
+
+    def __init__(self, out: Optional[TextIO] = None):
+        self.out = out if out is not None else sys.stdout
+
+    def _print(self, text: str = ""):
+        print(text, file=self.out)
+
+    def modules(self, hits: Iterable[ModuleHit], keyword: str):
+        """모듈 검색 결과 출력"""
+        hits = list(hits)
+        self._print(f"\n  '{keyword}' 검색 결과: {len(hits)}건")
+        self._print(f"  {'-'*60}")
+        for hit in hits:
+            title = f"{hit.titleKo} ({hit.title})" if hit.titleKo else hit.title
+            descKo = (hit.descriptionKo or hit.description)[:80]
+            scoreStr = f" ({hit.score:.2f})" if hit.score else ""
+
+            self._print(f"  [{hit.apiId:>3}] {title}{scoreStr}")
+            self._print(f"        {descKo}")
+            self._print()
+
+    def operationOwners(self, hits: Iterable[ModuleHit], opName: str, suggestions: Iterable[Suggestion] = ()):
+        """operation 소속 API 출력 (없으면 오타 교정 후보)"""
+        hits = list(hits)
+        if hits:
+            self._print(f"\n  '{opName}' operation이 포함된 API:")
+            for hit in hits:
+                title = f"{hit.titleKo} ({hit.title})" if hit.titleKo else hit.title
+                self._print(f"    - [{hit.apiId}] {title}")
+        else:
+            self._print(f"  '{opName}' operation을 찾을 수 없습니다.")
+            self._didYouMean(suggestions)
+
+    def endpoints(self, hits: Iterable[EndpointHit], keyword: str, suggestions: Iterable[Suggestion] = ()):
+        """endpoint 검색 결과 출력 (없으면 오타 교정 후보)"""
+        hits = list(hits)
+        if hits:
+            self._print(f"\n  '{keyword}' endpoint 검색 결과: {len(hits)}건")
+            self._print(f"  {'-'*70}")
+            for r in hits:
+                deprecatedTag = " [DEPRECATED]" if r.deprecated else ""
+                apiName = f"{r.apiTitleKo} ({r.apiTitle})" if r.apiTitleKo else r.apiTitle
+                self._print(f"  {r.method:>6} {r.uri}{deprecatedTag}")
+                self._print(f"         operationId: {r.operationId}")
+                self._print(f"         소속 API: [{r.apiId}] {apiName}")
+                self._print()
+        else:
+            self._print(f"  '{keyword}'에 해당하는 endpoint를 찾을 수 없습니다.")
+            self._didYouMean(suggestions)
+
+    def _didYouMean(self, suggestions: Iterable[Suggestion]):
+        texts = [s.text for s in suggestions]
+        if texts:
+            self._print(f"  혹시 찾으시는 항목: {', '.join(texts)}")
+
+    def suggestions(self, suggestions: Iterable[Suggestion], term: str):
+        """오타 교정 후보 출력"""
+        suggestions = list(suggestions)
+        if not suggestions:
+            self._print(f"  '{term}'와 비슷한 항목을 찾을 수 없습니다.")
+            return
+        self._print(f"\n  '{term}' 교정 후보:")
+        for s in suggestions:
+            self._print(f"    - {s.text} ({s.kind}, 거리 {s.distance})")
+
+    def methodEndpoints(self, hits: Iterable[EndpointHit], method: str):
+        """HTTP 메서드별 endpoint 출력"""
+        hits = list(hits)
+        self._print(f"\n  {method.upper()} 메서드 endpoint: {len(hits)}건")
+        self._print(f"  {'-'*70}")
+        for r in hits:
+            deprecatedTag = " [DEPRECATED]" if r.deprecated else ""
+            apiName = r.apiTitleKo or r.apiTitle
+            self._print(f"  {r.uri}{deprecatedTag}")
+            self._print(f"    operationId: {r.operationId} | 소속: {apiName}")
+
+    def queryResult(self, result: QueryResult, text: str):
+        """구조화 질의 결과 출력 (모듈 목록 + endpoint 목록)"""
+        self._print(f"\n  '{text}' 질의 결과: 모듈 {len(result.modules)}건, endpoint {len(result.endpoints)}건")
+        self._print(f"  {'-'*70}")
+        for hit in result.modules:
+            title = f"{hit.titleKo} ({hit.title})" if hit.titleKo else hit.title
+            self._print(f"  [{hit.apiId:>3}] {title}")
+        if result.endpoints:
+            self._print()
+        for r in result.endpoints:
+            deprecatedTag = " [DEPRECATED]" if r.deprecated else ""
+            self._print(f"  {r.method:>6} {r.uri}{deprecatedTag}")
+            self._print(f"         operationId: {r.operationId} | 소속: {r.apiTitleKo or r.apiTitle}")
+
+    def resolved(self, r: Optional[dict], method: str, path: str):
+        """경로 해석 결과 출력"""
+        if r is None:
+            self._print(f"  '{method.upper()} {path}'에 해당하는 endpoint를 찾을 수 없습니다.")
+            return
+        apiName = f"{r['apiTitleKo']} ({r['apiTitle']})" if r["apiTitleKo"] else r["apiTitle"]
+        self._print(f"  {r['method']:>6} {r['uri']}{' [DEPRECATED]' if r['deprecated'] else ''}")
+        self._print(f"         operationId: {r['operationId']}")
+        self._print(f"         소속 API: [{r['apiId']}] {apiName}")
+        for name, value in r["params"].items():
+            self._print(f"         {name} = {value}")
+
+    def listAll(self, hits: Iterable[ModuleHit]):
+        """전체 API 목록 출력 (카테고리별 그룹)"""
+        hits = list(hits)
+        self._print(f"\n{'='*80}")
+        self._print(f"  OHIP API 전체 목록 ({len(hits)}개)")
+        self._print(f"{'='*80}")
+
+        # 카테고리별 그룹핑
+        categories = {}
+        for hit in hits:
+            cat = hit.categoryKo or hit.category or "기타"
+            categories.setdefault(cat, []).append(hit)
+
+        for cat, catHits in categories.items():
+            self._print(f"\n  [{cat}] ({len(catHits)}개)")
+            self._print(f"  {'-'*60}")
+            for hit in catHits:
+                apiType = hit.typeKo or hit.type
+                deprecatedStr = f" (deprecated: {hit.deprecatedCount})" if hit.deprecatedCount > 0 else ""
+                title = f"{hit.titleKo} ({hit.title})" if hit.titleKo else hit.title
+
+                self._print(f"  {hit.apiId:>3}. [{apiType}] {title} - {hit.operationsCount}개{deprecatedStr}")
+
+    def summary(self, stats: dict):
+        """전체 요약 통계 출력"""
+        methodCounts = stats["methodCounts"]
+
+        self._print(f"\n{'='*60}")
+        self._print(f"  OHIP API 요약")
+        self._print(f"{'='*60}")
+        self._print(f"  전체 API 모듈/워크플로우: {stats['apis']}개")
+        self._print(f"  - API 모듈: {stats['modules']}개")
+        self._print(f"  - 워크플로우: {stats['workflows']}개")
+        self._print(f"  전체 Operations: {stats['operations']}개")
+        self._print(f"  Deprecated: {stats['deprecated']}개")
+        self._print(f"\n  전체 Endpoints: {stats['endpoints']}개")
+        if stats["deprecatedEndpoints"] > 0:
+            self._print(f"  Deprecated Endpoints: {stats['deprecatedEndpoints']}개")
+        self._print(f"\n  HTTP 메서드별 통계:")
+        for m in self._METHOD_ORDER:
+            if m in methodCounts:
+                self._print(f"    - {m}: {methodCounts[m]}개")
+        # 기타 메서드 출력
+        for m, c in sorted(methodCounts.items()):
+            if m not in self._METHOD_ORDER:
+                self._print(f"    - {m}: {c}개")
+        self._print(f"\n  카테고리별:")
+        for cat, count in stats["categories"].items():
+            self._print(f"    - {cat}: {count}개")
+        self._print(f"{'='*60}")
+
+    def detail(self, api: Optional[dict], apiId: int):
         """API 상세 정보 출력"""
+        if api is None:
+            self._print(f"  ID {apiId}에 해당하는 API를 찾을 수 없습니다.")
+            return
+
         titleKo = api.get("titleKo", "")
 
-        print(f"\n{'='*70}")
-        print(f"  [{api.get('id', '')}] {api.get('title', '')}")
+        self._print(f"\n{'='*70}")
+        self._print(f"  [{api.get('id', '')}] {api.get('title', '')}")
         if titleKo:
-            print(f"  한글: {titleKo}")
-        print(f"{'='*70}")
-        print(f"  카테고리: {api.get('categoryKo', api.get('category', ''))}")
-        print(f"  타입: {api.get('typeKo', api.get('type', ''))}")
-        print(f"  Operations: {api.get('operationsCount', 0)}개")
+            self._print(f"  한글: {titleKo}")
+        self._print(f"{'='*70}")
+        self._print(f"  카테고리: {api.get('categoryKo', api.get('category', ''))}")
+        self._print(f"  타입: {api.get('typeKo', api.get('type', ''))}")
+        self._print(f"  Operations: {api.get('operationsCount', 0)}개")
         if api.get("deprecatedCount", 0) > 0:
-            print(f"  Deprecated: {api.get('deprecatedCount', 0)}개")
-        print(f"\n  설명:")
+            self._print(f"  Deprecated: {api.get('deprecatedCount', 0)}개")
+        self._print(f"\n  설명:")
         descKo = api.get("descriptionKo", "")
         descEn = api.get("description", "")
         if descKo:
-            print(f"  [한글] {descKo}")
-        print(f"  [원문] {descEn}")
+            self._print(f"  [한글] {descKo}")
+        self._print(f"  [원문] {descEn}")
 
         # endpoints 상세 정보 출력
         endpoints = api.get("endpoints", [])
         if endpoints:
-            # HTTP 메서드별 통계
-            methodCounts = {}
-            deprecatedCount = 0
-            for ep in endpoints:
-                m = ep.get("method", "UNKNOWN")
-                methodCounts[m] = methodCounts.get(m, 0) + 1
-                if ep.get("deprecated", False):
-                    deprecatedCount += 1
+            # HTTP 메서드별 통계 (detail()이 붙인 endpointStats가 없으면 직접 집계)
+            epStats = api.get("endpointStats")
+            if epStats is not None:
+                methodCounts = epStats["methodCounts"]
+                deprecatedCount = epStats["deprecated"]
+            else:
+                methodCounts = {}
+                deprecatedCount = 0
+                for ep in endpoints:
+                    m = ep.get("method", "UNKNOWN")
+                    methodCounts[m] = methodCounts.get(m, 0) + 1
+                    if ep.get("deprecated", False):
+                        deprecatedCount += 1
 
             methodSummary = ", ".join(f"{m}: {c}개" for m, c in sorted(methodCounts.items()))
-            print(f"\n  Endpoints ({len(endpoints)}개) [{methodSummary}]")
+            self._print(f"\n  Endpoints ({len(endpoints)}개) [{methodSummary}]")
             if deprecatedCount > 0:
-                print(f"  (deprecated: {deprecatedCount}개)")
-            print(f"  {'-'*66}")
+                self._print(f"  (deprecated: {deprecatedCount}개)")
+            self._print(f"  {'-'*66}")
             for ep in endpoints:
                 deprecatedTag = " [DEPRECATED]" if ep.get("deprecated", False) else ""
-                print(f"    {ep.get('method', ''):>6} {ep.get('uri', '')}{deprecatedTag}")
-                print(f"           operationId: {ep.get('operationId', '')}")
+                self._print(f"    {ep.get('method', ''):>6} {ep.get('uri', '')}{deprecatedTag}")
+                self._print(f"           operationId: {ep.get('operationId', '')}")
         else:
-            print(f"\n  Endpoints: 없음")
+            self._print(f"\n  Endpoints: 없음")
 
         keywords = api.get("keywords", [])
         if keywords:
-            print(f"\n  검색 키워드: {', '.join(keywords)}")
-        print(f"{'='*70}")
+            self._print(f"\n  검색 키워드: {', '.join(keywords)}")
+        self._print(f"{'='*70}")
 
 
-# CLI 모드 지원
-if __name__ == "__main__":
-    import sys
+# --- CLI / 배치 / 상주 서버 공통 명령 ---
 
-    search = OhipApiSearch()
+# 옵션 → (명령 이름, 최소 인자 수). 옵션이 아니면 키워드 검색
+_COMMANDS = {
+    "--list": ("list", 0),
+    "--summary": ("summary", 0),
+    "--rank": ("rank", 1),
+    "--detail": ("detail", 1),
+    "--category": ("category", 1),
+    "--type": ("type", 1),
+    "--op": ("op", 1),
+    "--endpoint": ("endpoint", 1),
+    "--method": ("method", 1),
+    "--resolve": ("resolve", 2),
+    "--suggest": ("suggest", 1),
+    "--query": ("query", 1),
+}
+
+# 결과가 없을 때 오타 교정 후보를 붙이는 명령
+_SUGGEST_ON_EMPTY = ("op", "endpoint")
+
+# 배치 모드 기본 청크 크기 (프로세스 풀 작업 단위)
+_BATCH_CHUNK_SIZE = 64
+
+
+def parseCommand(argv: list) -> tuple:
+    """CLI 인자 목록 → (명령 이름, 인자 목록)"""
+    if not argv:
+        raise ValueError("검색어가 없습니다")
+    if argv[0] in _COMMANDS:
+        name, minArgs = _COMMANDS[argv[0]]
+        if len(argv) - 1 < minArgs:
+            raise ValueError(f"{argv[0]} 인자가 부족합니다")
+        return name, argv[1:]
+    return "find", argv[:1]
+
+
+def runCommand(search: OhipApiSearch, name: str, args: list):
+    """명령 실행 결과 (레코드 목록, dict 또는 None). 출력하지 않음"""
+    if name == "find":
+        return list(search.iterFind(args[0]))
+    if name == "rank":
+        return list(search.iterRank(args[0], int(args[1]) if len(args) > 1 else 10))
+    if name == "list":
+        return [ModuleHit.fromApi(api) for api in search.apis]
+    if name == "summary":
+        return search.stats()
+    if name == "detail":
+        return search.detail(int(args[0]))
+    if name == "category":
+        return list(search.iterByCategory(args[0]))
+    if name == "type":
+        return list(search.iterByType(args[0]))
+    if name == "op":
+        return list(search.iterFindOperation(args[0]))
+    if name == "endpoint":
+        return list(search.iterEndpoints(args[0]))
+    if name == "method":
+        return list(search.iterByMethod(args[0]))
+    if name == "resolve":
+        return search.resolve(args[0], args[1])
+    if name == "suggest":
+        return search.didYouMean(args[0])
+    if name == "query":
+        return search.query(" ".join(args))
+    raise ValueError(f"알 수 없는 명령: {name}")
+
+
+def queryRecord(search: OhipApiSearch, line: str) -> dict:
+    """질의 한 줄 (CLI 인자 형식, 예: "--endpoint aging") → JSON 응답 dict"""
+    try:
+        name, args = parseCommand(shlex.split(line))
+        result = runCommand(search, name, args)
+    except ValueError as e:
+        return {"query": line, "error": str(e)}
+
+    if isinstance(result, QueryResult):
+        return {"query": line, "command": name, "result": result.asRecord()}
+    if isinstance(result, list):
+        results = [hit._asdict() for hit in result]
+        record = {"query": line, "command": name, "count": len(results), "results": results}
+        if not results and name in _SUGGEST_ON_EMPTY:
+            record["suggestions"] = [s.text for s in search.didYouMean(args[0])]
+        return record
+    return {"query": line, "command": name, "result": result}
+
+
+def _batchLines(path: str) -> Iterator[str]:
+    """배치 파일의 질의 줄 (빈 줄, # 주석 제외)"""
+    stream = sys.stdin if path == "-" else open(path, "r", encoding="utf-8")
+    try:
+        for line in stream:
+            line = line.strip()
+            if line and not line.startswith("#"):
+                yield line
+    finally:
+        if stream is not sys.stdin:
+            stream.close()
+
+
+_workerSearch = None
+
+
+def _initBatchWorker(dataDir: Optional[str]):
+    global _workerSearch
+    _workerSearch = OhipApiSearch(dataDir)
 
-    if len(sys.argv) < 2:
+
+def _batchWorkerQuery(line: str) -> str:
+    return json.dumps(queryRecord(_workerSearch, line), ensure_ascii=False)
+
+
+def runBatch(path: str, out: TextIO, workers: int = 1, dataDir: Optional[str] = None,
+             search: Optional[OhipApiSearch] = None) -> int:
+    """파일의 질의를 한 줄씩 실행해 NDJSON으로 출력 (workers > 1이면 프로세스 풀). 처리 건수 반환"""
+    count = 0
+    if workers > 1:
+        import multiprocessing
+
+        with multiprocessing.Pool(workers, _initBatchWorker, (dataDir,)) as pool:
+            for record in pool.imap(_batchWorkerQuery, _batchLines(path), _BATCH_CHUNK_SIZE):
+                out.write(record + "\n")
+                count += 1
+        return count
+
+    search = search or OhipApiSearch(dataDir)
+    for line in _batchLines(path):
+        out.write(json.dumps(queryRecord(search, line), ensure_ascii=False) + "\n")
+        count += 1
+    return count
+
+
+def serveStream(search: OhipApiSearch, inStream: TextIO, outStream: TextIO):
+    """줄 단위 질의/NDJSON 응답 루프 (입력이 끝날 때까지)"""
+    for line in inStream:
+        line = line.strip()
+        if not line:
+            continue
+        outStream.write(json.dumps(queryRecord(search, line), ensure_ascii=False) + "\n")
+        outStream.flush()
+
+
+def serveSocket(search: OhipApiSearch, socketPath: str):
+    """Unix 소켓 상주 서버. 연결마다 줄 단위 질의를 받아 NDJSON으로 응답"""
+    import io
+    import signal
+    import socketserver
+
+    class Handler(socketserver.StreamRequestHandler):
+        def handle(self):
+            reader = io.TextIOWrapper(self.rfile, encoding="utf-8")
+            writer = io.TextIOWrapper(self.wfile, encoding="utf-8", write_through=True)
+            serveStream(search, reader, writer)
+
+    if os.path.exists(socketPath):
+        os.remove(socketPath)
+    # SIGTERM에도 소켓 파일을 정리하고 종료
+    signal.signal(signal.SIGTERM, lambda *_: sys.exit(0))
+    with socketserver.ThreadingUnixStreamServer(socketPath, Handler) as server:
+        server.daemon_threads = True
+        try:
+            server.serve_forever()
+        finally:
+            os.remove(socketPath)
+
+
+def _optionValue(argv: list, name: str, default=None):
+    if name in argv:
+        i = argv.index(name)
+        if i + 1 < len(argv):
+            return argv[i + 1]
+    return default
+
+
+def _printCommand(printer: ConsolePrinter, search: OhipApiSearch, name: str, args: list, result):
+    suggestions = search.didYouMean(args[0]) if not result and name in _SUGGEST_ON_EMPTY else ()
+    if name == "find":
+        printer.modules(result, args[0])
+    elif name == "rank":
+        printer.modules(result, f"{args[0]} (관련도순)")
+    elif name == "list":
+        printer.listAll(result)
+    elif name == "summary":
+        printer.summary(result)
+    elif name == "detail":
+        printer.detail(result, int(args[0]))
+    elif name == "category":
+        printer.modules(result, f"카테고리: {args[0]}")
+    elif name == "type":
+        printer.modules(result, f"타입: {args[0]}")
+    elif name == "op":
+        printer.operationOwners(result, args[0], suggestions)
+    elif name == "endpoint":
+        printer.endpoints(result, args[0], suggestions)
+    elif name == "method":
+        printer.methodEndpoints(result, args[0])
+    elif name == "resolve":
+        printer.resolved(result, args[0], args[1])
+    elif name == "suggest":
+        printer.suggestions(result, args[0])
+    elif name == "query":
+        printer.queryResult(result, " ".join(args))
+
+
+def main(argv: Optional[list] = None) -> int:
+    argv = sys.argv[1:] if argv is None else argv
+
+    if argv and argv[0] == "--batch":
+        if len(argv) < 2:
+            print("  --batch <파일> 인자가 부족합니다", file=sys.stderr)
+            return 2
+        outPath = _optionValue(argv, "--output")
+        try:
+            workers = int(_optionValue(argv, "--workers", 1))
+        except ValueError:
+            workers = 0
+        if workers < 1:
+            print("  --workers 값은 1 이상의 정수여야 합니다", file=sys.stderr)
+            return 2
+        out = open(outPath, "w", encoding="utf-8") if outPath else sys.stdout
+        try:
+            runBatch(argv[1], out, workers)
+        finally:
+            if outPath:
+                out.close()
+        return 0
+
+    if argv and argv[0] == "--serve":
+        # 데이터 파일이 바뀌면 재시작 없이 색인을 교체
+        search = ReloadingSearch()
+        search.start()
+        socketPath = _optionValue(argv, "--socket")
+        if socketPath:
+            serveSocket(search, socketPath)
+        else:
+            serveStream(search, sys.stdin, sys.stdout)
+        return 0
+
+    # 한 번 실행하고 끝나므로 endpoint 색인은 필요한 명령에서만 읽음 (결과는 같음)
+    search = OhipApiSearch(lazyEndpoints=True)
+    try:
+        return _runCli(search, argv)
+    finally:
+        search.close()
+
+
+def _runCli(search: OhipApiSearch, argv: list) -> int:
+    if not argv:
         search.summary()
         print("\n  사용법:")
-        print("    python ohip_search.py <검색어>          # 키워드 검색")
-        print("    python ohip_search.py --list            # 전체 목록")
-        print("    python ohip_search.py --detail <id>     # 상세 조회")
-        print("    python ohip_search.py --category <cat>  # 카테고리별")
-        print("    python ohip_search.py --op <name>       # operation 검색")
-        print("    python ohip_search.py --endpoint <kw>   # endpoint URI/operationId 검색")
-        print("    python ohip_search.py --method <method> # HTTP 메서드별 검색")
-        sys.exit(0)
-
-    cmd = sys.argv[1]
-
-    if cmd == "--list":
-        search.listAll()
-    elif cmd == "--detail" and len(sys.argv) > 2:
-        search.detail(int(sys.argv[2]))
-    elif cmd == "--category" and len(sys.argv) > 2:
-        search.byCategory(sys.argv[2])
-    elif cmd == "--op" and len(sys.argv) > 2:
-        search.findOperation(sys.argv[2])
-    elif cmd == "--endpoint" and len(sys.argv) > 2:
-        search.findEndpoint(sys.argv[2])
-    elif cmd == "--method" and len(sys.argv) > 2:
-        search.findByMethod(sys.argv[2])
-    elif cmd == "--summary":
-        search.summary()
-    else:
-        search.find(cmd)
+        print("    python ohip_search_cli.py <검색어>          # 키워드 검색 (초성 가능: ㅊㅋㅇ)")
+        print("    python ohip_search_cli.py --rank <검색어> [k] # 관련도순 상위 k개")
+        print("    python ohip_search_cli.py --list            # 전체 목록")
+        print("    python ohip_search_cli.py --detail <id>     # 상세 조회")
+        print("    python ohip_search_cli.py --category <cat>  # 카테고리별")
+        print("    python ohip_search_cli.py --type <type>     # 타입별 (API 모듈/워크플로우)")
+        print("    python ohip_search_cli.py --op <name>       # operation 검색")
+        print("    python ohip_search_cli.py --endpoint <kw>   # endpoint URI/operationId 검색")
+        print("    python ohip_search_cli.py --method <method> # HTTP 메서드별 검색")
+        print("    python ohip_search_cli.py --resolve <method> <path>  # 실제 경로 → endpoint 해석")
+        print("    python ohip_search_cli.py --suggest <검색어>  # 오타 교정 후보 (did you mean)")
+        print("    python ohip_search_cli.py --query '<질의>'   # 구조화 질의 (예: method:POST category:distribution -deprecated op:post*)")
+        print("    python ohip_search_cli.py --batch <파일|-> [--workers N] [--output <파일>]  # 질의 일괄 실행 (NDJSON)")
+        print("    python ohip_search_cli.py --serve [--socket <경로>]  # 상주 모드 (stdin 또는 Unix 소켓, NDJSON, 데이터 변경 시 자동 재로드)")
+        return 0
+
+    try:
+        name, args = parseCommand(argv)
+    except ValueError:
+        # 인자가 부족한 옵션은 기존처럼 검색어로 취급
+        name, args = "find", argv[:1]
+    try:
+        result = runCommand(search, name, args)
+    except ValueError as e:
+        print(f"  {e}", file=sys.stderr)
+        return 2
+    _printCommand(ConsolePrinter(), search, name, args, result)
+    return 0
+
+
+# CLI 모드 지원 (반복 실행은 캐시된 .pyc를 쓰는 ohip_search_cli.py가 빠름)
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,16 @@
+"""
+OHIP API 한글 검색 CLI 진입점
+
+사용법:
+    python lib/ohip_search_cli.py 예약
+    python lib/ohip_search_cli.py --detail 1
+
+ohip_search를 모듈로 import해 캐시된 .pyc를 쓴다 (ohip_search.py를 직접 실행하면
+매번 전체 소스를 컴파일). 인자와 동작은 python lib/ohip_search.py와 같다.
+"""
+import sys
+
+from ohip_search import main
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,84 @@
+/* API 상세: 섹션 행 지연 로드 + 메서드 필터 (전체 목록 페이지에서는 새 요청 없이) */
+(function () {
+  "use strict";
+
+  var container = document.getElementById("endpointGroups");
+  if (!container) {
+    return;
+  }
+  var current = "all";
+
+  function matches(row, filter) {
+    if (filter === "all") {
+      return true;
+    }
+    if (filter === "deprecated") {
+      return row.getAttribute("data-deprecated") === "1";
+    }
+    return row.getAttribute("data-method") === filter;
+  }
+
+  function applyRows(scope) {
+    scope.querySelectorAll("tr[data-method]").forEach(function (row) {
+      row.classList.toggle("d-none", !matches(row, current));
+    });
+  }
+
+  // 섹션을 처음 펼칠 때 data-src 조각을 한 번만 가져옴
+  container.addEventListener("show.bs.collapse", function (event) {
+    var body = event.target;
+    var src = body.getAttribute("data-src");
+    if (!src) {
+      return;
+    }
+    body.removeAttribute("data-src");
+    fetch(src, { headers: { "X-Requested-With": "fetch" } })
+      .then(function (response) {
+        if (!response.ok) {
+          throw new Error(response.status);
+        }
+        return response.text();
+      })
+      .then(function (html) {
+        var tbody = body.querySelector("tbody");
+        tbody.innerHTML = html;
+        applyRows(tbody);
+      })
+      .catch(function () {
+        body.setAttribute("data-src", src);
+        body.querySelector("tbody").innerHTML =
+          '<tr><td colspan="4" class="text-center text-danger py-2">불러오지 못했습니다</td></tr>';
+      });
+  });
+
+  var filters = document.getElementById("endpointFilters");
+  if (!filters || !filters.hasAttribute("data-client-filter")) {
+    return;
+  }
+
+  function setActive(link) {
+    filters.querySelectorAll("a[data-filter]").forEach(function (other) {
+      var warning = other.getAttribute("data-filter") === "deprecated";
+      var on = other === link;
+      other.classList.toggle(warning ? "btn-warning" : "btn-dark", on);
+      other.classList.toggle(warning ? "btn-outline-warning" : "btn-outline-dark", !on);
+    });
+  }
+
+  filters.addEventListener("click", function (event) {
+    var link = event.target.closest("a[data-filter]");
+    if (!link) {
+      return;
+    }
+    event.preventDefault();
+    current = link.getAttribute("data-filter");
+    setActive(link);
+    container.querySelectorAll(".endpoint-group").forEach(function (group) {
+      var counts = JSON.parse(group.getAttribute("data-counts"));
+      var count = counts[current] || 0;
+      group.classList.toggle("d-none", count === 0);
+      group.querySelector(".group-count").textContent = count;
+      applyRows(group);
+    });
+  });
+})();
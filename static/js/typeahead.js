@@ -0,0 +1,133 @@
+/* 검색창 자동완성 (/suggest): 입력 debounce + 이전 요청 취소 */
+(function () {
+  "use strict";
+
+  var DEBOUNCE_MS = 150;
+  var KIND_LABELS = { title: "API", keyword: "키워드", operationId: "Operation" };
+
+  var input = document.querySelector("input[data-suggest-url]");
+  if (!input) {
+    return;
+  }
+  var menu = document.getElementById(input.getAttribute("data-suggest-menu"));
+  var suggestUrl = input.getAttribute("data-suggest-url");
+  var timer = null;
+  var controller = null;
+  var items = [];
+  var active = -1;
+
+  function hide() {
+    menu.classList.remove("show");
+    menu.innerHTML = "";
+    items = [];
+    active = -1;
+  }
+
+  function cancelPending() {
+    clearTimeout(timer);
+    if (controller) {
+      controller.abort();
+      controller = null;
+    }
+  }
+
+  function choose(text) {
+    cancelPending();
+    input.value = text;
+    hide();
+    input.form.submit();
+  }
+
+  function highlight(index) {
+    items.forEach(function (item, i) {
+      item.classList.toggle("active", i === index);
+    });
+    active = index;
+  }
+
+  function render(suggestions) {
+    menu.innerHTML = "";
+    items = suggestions.map(function (s) {
+      var item = document.createElement("button");
+      item.type = "button";
+      item.className = "dropdown-item d-flex justify-content-between align-items-center";
+      var text = document.createElement("span");
+      text.textContent = s.text;
+      var kind = document.createElement("span");
+      kind.className = "badge bg-light text-muted border ms-2 suggest-kind";
+      kind.textContent = KIND_LABELS[s.kind] || s.kind;
+      item.appendChild(text);
+      item.appendChild(kind);
+      item.addEventListener("click", function () {
+        choose(s.text);
+      });
+      menu.appendChild(item);
+      return item;
+    });
+    active = -1;
+    menu.classList.toggle("show", items.length > 0);
+  }
+
+  function request(query) {
+    // 응답이 늦게 온 이전 입력은 버림 (새 요청 전에 취소)
+    if (controller) {
+      controller.abort();
+    }
+    controller = new AbortController();
+    fetch(suggestUrl + "?q=" + encodeURIComponent(query), {
+      signal: controller.signal,
+      headers: { Accept: "application/json" },
+      credentials: "same-origin",
+    })
+      .then(function (resp) {
+        return resp.ok ? resp.json() : { suggestions: [] };
+      })
+      .then(function (data) {
+        if (input.value.trim() === query) {
+          render(data.suggestions || []);
+        }
+      })
+      .catch(function (err) {
+        if (err.name !== "AbortError") {
+          hide();
+        }
+      });
+  }
+
+  input.addEventListener("input", function () {
+    var query = input.value.trim();
+    cancelPending();
+    if (!query) {
+      hide();
+      return;
+    }
+    timer = setTimeout(function () {
+      request(query);
+    }, DEBOUNCE_MS);
+  });
+
+  input.addEventListener("keydown", function (e) {
+    if (!items.length) {
+      return;
+    }
+    if (e.key === "ArrowDown") {
+      e.preventDefault();
+      highlight((active + 1) % items.length);
+    } else if (e.key === "ArrowUp") {
+      e.preventDefault();
+      highlight(active <= 0 ? items.length - 1 : active - 1);
+    } else if (e.key === "Enter" && active >= 0) {
+      e.preventDefault();
+      items[active].click();
+    } else if (e.key === "Escape") {
+      hide();
+    }
+  });
+
+  // 항목 클릭 전에 입력창 blur로 메뉴가 닫히지 않도록
+  menu.addEventListener("mousedown", function (e) {
+    e.preventDefault();
+  });
+  input.addEventListener("blur", hide);
+  input.form.addEventListener("submit", cancelPending);
+})();